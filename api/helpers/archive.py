@@ -0,0 +1,170 @@
+import fcntl
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from helpers.columnar import write_missing_partitions, write_partition
+from helpers.common import STATS_PROXY
+from helpers.daily import DailyTable, team_boxscore
+from helpers.logger import log_exceptions
+from helpers.metrics import DOUBLE_DIGIT_CATEGORIES
+from helpers.store import (
+    GAME_STATUS_FINAL,
+    STATS_DB_FILE,
+    get_archived_dates,
+    get_rows_between,
+    ingest_game,
+    is_ingested,
+    mark_date_archived,
+)
+from nba_api.stats.endpoints import scoreboardv3
+from nba_api.stats.library.parameters import Season
+
+SEASON_START = date(int(Season.default[:4]), 10, 1)
+MAX_RANGE_DAYS = 31
+BACKFILL_WORKERS = 4  # dates archived in parallel, bounding concurrent upstream calls
+BACKFILL_INTERVAL = 3600  # seconds between backfill passes (picks up each finished day)
+BACKFILL_LOCK_FILE = os.path.join(os.path.dirname(os.path.abspath(STATS_DB_FILE)), "backfill.lock")
+
+
+def parse_date_range(value: str, max_days: int = MAX_RANGE_DAYS):
+    """Parse 'YYYY-MM-DD' or 'YYYY-MM-DD..YYYY-MM-DD' into a (start, end) pair of past season dates.
+
+    `max_days` limits the range length (None for no limit).
+    """
+    try:
+        parts = [date.fromisoformat(p.strip()) for p in value.split("..")]
+    except ValueError:
+        raise ValueError("Dates must be YYYY-MM-DD or YYYY-MM-DD..YYYY-MM-DD")
+    if len(parts) not in (1, 2):
+        raise ValueError("Dates must be YYYY-MM-DD or YYYY-MM-DD..YYYY-MM-DD")
+    start, end = parts[0], parts[-1]
+    if start > end:
+        raise ValueError("Range start is after its end")
+    if max_days is not None and (end - start).days >= max_days:
+        raise ValueError(f"Ranges are limited to {max_days} days")
+    if start < SEASON_START or end >= date.today():
+        raise ValueError(f"Only past dates of this season ({SEASON_START.isoformat()} onwards) are archived")
+    return start, end
+
+
+def date_range(start: date, end: date):
+    """Yield every date from start to end, inclusive"""
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+
+def display_range(start: date, end: date) -> str:
+    label = start.strftime("%B %d, %Y")
+    return label if start == end else f"{label} - {end.strftime('%B %d, %Y')}"
+
+
+def get_coverage(start: date, end: date):
+    """Return (archived dates, missing dates) of a range as ISO strings"""
+    archived = get_archived_dates(start.isoformat(), end.isoformat())
+    known = set(archived)
+    missing = [d.isoformat() for d in date_range(start, end) if d.isoformat() not in known]
+    return archived, missing
+
+
+def get_archived_boxscores(start: date, end: date):
+    """Team box scores with each team's top scorer, in the /api/boxscores format"""
+    teams = get_rows_between("team_games", start.isoformat(), end.isoformat())
+    leaders = {}
+    for line in get_rows_between("player_games", start.isoformat(), end.isoformat()):
+        key = (line["game_id"], line["team_id"])
+        if key not in leaders or line["pts"] > leaders[key]["pts"]:
+            leaders[key] = line
+
+    games = {}
+    for team in sorted(teams, key=lambda t: (t["game_date"], t["game_id"], not t["is_home"])):
+        game = games.setdefault(team["game_id"], {"gameId": team["game_id"], "date": team["game_date"], "teams": []})
+        leader = leaders.get((team["game_id"], team["team_id"]))
+        game["teams"].append(team_boxscore(team["name"], team["score"], team, leader))
+    return list(games.values())
+
+
+def get_archived_table(start: date, end: date) -> DailyTable:
+    """Every stored player line of the range as a DailyTable"""
+    return DailyTable.from_rows(get_rows_between("player_games", start.isoformat(), end.isoformat()))
+
+
+def get_archived_double_doubles(start: date, end: date):
+    """(triple-doubles, double-doubles) of the range, in the /api/doubledoubles format"""
+    triple_doubles, double_doubles = [], []
+    for line in get_rows_between("player_games", start.isoformat(), end.isoformat()):
+        categories = [name for name, _ in DOUBLE_DIGIT_CATEGORIES if (line[name] or 0) >= 10]
+        if len(categories) < 2:
+            continue
+        player_data = {
+            "name": line["name"],
+            "team": line["tricode"],
+            "date": line["game_date"],
+            "points": line["pts"],
+            "rebounds": line["reb"],
+            "assists": line["ast"],
+            "steals": line["stl"],
+            "blocks": line["blk"],
+            "categories": categories,
+        }
+        (triple_doubles if len(categories) >= 3 else double_doubles).append(player_data)
+    return triple_doubles, double_doubles
+
+
+def fetch_games_on(day: date):
+    """Return (game ids, whether every game is final) for a date; raises on upstream errors"""
+    games = scoreboardv3.ScoreboardV3(game_date=day.isoformat(), proxy=STATS_PROXY).game_header.get_dict()
+    h = {name: i for i, name in enumerate(games["headers"])}
+    rows = games["data"]
+    return [g[h["gameId"]] for g in rows], all(g[h["gameStatus"]] == GAME_STATUS_FINAL for g in rows)
+
+
+def archive_date(day: date) -> bool:
+    """Store every game of a date; the date is marked archived only once all of them are stored"""
+    try:
+        game_ids, all_final = fetch_games_on(day)
+        for game_id in game_ids:
+            ingest_game(game_id)
+        if all_final and all(is_ingested(gid) for gid in game_ids):
+            mark_date_archived(day.isoformat(), len(game_ids))
+            write_partition(day.isoformat())
+            return True
+    except Exception as ex:
+        log_exceptions(ex)
+    return False
+
+
+def backfill(start: date, end: date, max_workers: int = BACKFILL_WORKERS) -> int:
+    """Archive every not yet archived date of a range; returns how many were archived"""
+    archived, missing = get_coverage(start, end)
+    if not missing:
+        return 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return sum(pool.map(archive_date, [date.fromisoformat(d) for d in missing]))
+
+
+def _backfill_loop(lock):
+    while True:
+        try:
+            yesterday = date.today() - timedelta(days=1)
+            backfill(SEASON_START, yesterday)
+            write_missing_partitions(get_archived_dates(SEASON_START.isoformat(), yesterday.isoformat()))
+        except Exception as ex:
+            log_exceptions(ex)
+        time.sleep(BACKFILL_INTERVAL)
+
+
+def start_backfill() -> bool:
+    """Start the background backfill thread, in one uvicorn worker only (file lock)"""
+    os.makedirs(os.path.dirname(BACKFILL_LOCK_FILE), exist_ok=True)
+    lock = open(BACKFILL_LOCK_FILE, "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return False
+    # The thread holds the lock file open for the life of the process
+    threading.Thread(target=_backfill_loop, args=(lock,), daemon=True, name="archive-backfill").start()
+    return True
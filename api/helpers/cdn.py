@@ -0,0 +1,120 @@
+import json
+import threading
+from collections import OrderedDict
+
+import requests
+from nba_api.library import http
+from nba_api.live.nba.library.http import NBALiveHTTP
+
+# Live files are hundreds of KB (full boxscores, play-by-play), so the caches
+# are bounded by total body size rather than by entry count
+MAX_BODY_BYTES = 32 * 1024 * 1024  # raw bodies kept for revalidation
+MAX_PARSED_BYTES = 8 * 1024 * 1024  # bodies whose parsed dicts are kept; a dict takes several times its body
+
+
+class SizedLRU:
+    """Least recently used mapping evicted oldest-first once its entries' sizes exceed max_bytes.
+
+    Not thread-safe; callers hold their own lock.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()  # key -> (size, value)
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is None:
+            return None
+        self._items.move_to_end(key)
+        return item[1]
+
+    def put(self, key, value, size):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.size -= old[0]
+        if size > self.max_bytes:
+            return
+        self._items[key] = (size, value)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (evicted, _) = self._items.popitem(last=False)
+            self.size -= evicted
+
+    def clear(self):
+        self._items.clear()
+        self.size = 0
+
+
+class ConditionalSession(requests.Session):
+    """requests session that revalidates cdn.nba.com files with ETag / Last-Modified.
+
+    A 304 answer is turned back into a 200 carrying the body downloaded earlier,
+    so nba_api's live endpoints work unchanged.
+    """
+
+    def __init__(self, max_bytes=MAX_BODY_BYTES):
+        super().__init__()
+        self._entries = SizedLRU(max_bytes)  # url -> (etag, last_modified, content, encoding)
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        key = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        with self._lock:
+            entry = self._entries.get(key)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry:
+            etag, last_modified, _, _ = entry
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = super().get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            response.status_code = 200
+            response._content = entry[2]
+            response.encoding = entry[3]
+        elif response.status_code == 200:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                entry = (etag, last_modified, response.content, response.encoding)
+                with self._lock:
+                    self._entries.put(key, entry, len(response.content))
+        return response
+
+
+class CachedNBAResponse(http.NBAResponse):
+    """NBAResponse that parses each distinct body of a URL only once.
+
+    Live endpoints call get_dict() more than once per fetch, and unchanged (304)
+    bodies are identical, so the parsed dict is shared - callers must treat it
+    as read-only.
+    """
+
+    _parsed = SizedLRU(MAX_PARSED_BYTES)  # url -> (body, parsed dict), sized by body length
+    _lock = threading.Lock()
+
+    def get_dict(self):
+        with self._lock:
+            entry = self._parsed.get(self._url)
+        if entry and (entry[0] is self._response or entry[0] == self._response):
+            return entry[1]
+
+        data = json.loads(self._response)
+        with self._lock:
+            self._parsed.put(self._url, (self._response, data), len(self._response))
+        return data
+
+
+def install():
+    """Route nba_api live endpoints (ScoreBoard, BoxScore, PlayByPlay) through the conditional layer"""
+    NBALiveHTTP.set_session(ConditionalSession())
+    NBALiveHTTP.nba_response = CachedNBAResponse
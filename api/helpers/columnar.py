@@ -0,0 +1,221 @@
+import os
+import shutil
+from datetime import date
+
+import numpy as np
+from helpers.daily import CATEGORIES
+from helpers.store import METRIC_COLUMNS, PLAYER_COLUMNS, STATS_DB_FILE, get_player_lines_on
+
+COLUMNAR_DIR = os.environ.get(
+    "COLUMNAR_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(STATS_DB_FILE)), "columnar"),
+)
+
+# player_games columns written to the archive and their on-disk types
+TEXT_COLUMNS = ("game_id", "game_date", "tricode", "name")
+FLOAT_COLUMNS = ("plus_minus",) + tuple(METRIC_COLUMNS)
+ID_COLUMNS = ("player_id", "team_id")
+COUNT_COLUMNS = tuple(c for c in PLAYER_COLUMNS if c not in TEXT_COLUMNS + FLOAT_COLUMNS + ID_COLUMNS)
+
+# Per-game metrics stored with every line, by their metrics.py names
+LINE_METRICS = {name: column for column, name in METRIC_COLUMNS.items()}
+
+# Rates recomputed from summed components over a range (never averaged per game)
+RATES = {
+    "tsPct": (("pts", "fga", "fta"), lambda s: _ratio(s["pts"], 2 * (s["fga"] + 0.44 * s["fta"])), 3),
+    "efgPct": (("fgm", "fg3m", "fga"), lambda s: _ratio(s["fgm"] + 0.5 * s["fg3m"], s["fga"]), 3),
+    "fgPct": (("fgm", "fga"), lambda s: _ratio(s["fgm"], s["fga"]), 3),
+    "fg3Pct": (("fg3m", "fg3a"), lambda s: _ratio(s["fg3m"], s["fg3a"]), 3),
+    "ftPct": (("ftm", "fta"), lambda s: _ratio(s["ftm"], s["fta"]), 3),
+    "astTov": (("ast", "tov"), lambda s: np.where(s["tov"] > 0, _ratio(s["ast"], s["tov"]), s["ast"]), 2),
+}
+
+AGGREGATIONS = ("sum", "avg", "max", "count")
+
+
+def _ratio(num, den):
+    return np.divide(num, den, out=np.zeros(len(num)), where=den > 0)
+
+
+def partition_path(game_date: str) -> str:
+    """Directory of a date's partition: <COLUMNAR_DIR>/<YYYY-MM>/<YYYY-MM-DD>"""
+    return os.path.join(COLUMNAR_DIR, game_date[:7], game_date)
+
+
+def has_partition(game_date: str) -> bool:
+    return os.path.isdir(partition_path(game_date))
+
+
+def write_partition(game_date: str, rows=None) -> int:
+    """Write a date's stored player lines as one .npy file per column; returns the line count.
+
+    The partition is built in a temporary directory and renamed into place, so
+    readers never see a half written date.
+    """
+    if rows is None:
+        rows = get_player_lines_on(game_date)
+    columns = {}
+    for c in TEXT_COLUMNS:
+        columns[c] = np.array([r[c] for r in rows], dtype=str)
+    for c in ID_COLUMNS:
+        columns[c] = np.array([r[c] for r in rows], dtype=np.int64)
+    for c in COUNT_COLUMNS:
+        columns[c] = np.array([r[c] or 0 for r in rows], dtype=np.int32)
+    for c in FLOAT_COLUMNS:
+        columns[c] = np.array([np.nan if r.get(c) is None else r[c] for r in rows], dtype=np.float64)
+
+    path = partition_path(game_date)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for name, values in columns.items():
+        np.save(os.path.join(tmp, f"{name}.npy"), values)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return len(rows)
+
+
+def write_missing_partitions(game_dates) -> int:
+    """Write partitions for archived dates that do not have one yet"""
+    missing = [d for d in game_dates if not has_partition(d)]
+    for game_date in missing:
+        write_partition(game_date)
+    return len(missing)
+
+
+def partition_dates(start: date, end: date):
+    """ISO dates between start and end (inclusive) that have a partition"""
+    if not os.path.isdir(COLUMNAR_DIR):
+        return []
+    first, last = start.isoformat(), end.isoformat()
+    found = []
+    for month in os.listdir(COLUMNAR_DIR):
+        if not first[:7] <= month <= last[:7]:
+            continue
+        found.extend(d for d in os.listdir(os.path.join(COLUMNAR_DIR, month)) if len(d) == 10 and first <= d <= last)
+    return sorted(found)
+
+
+def load_columns(game_dates, columns):
+    """Memory-map the given columns of each date's partition and join them"""
+    loaded = {}
+    for c in columns:
+        parts = [np.load(os.path.join(partition_path(d), f"{c}.npy"), mmap_mode="r") for d in game_dates]
+        if not parts:
+            loaded[c] = np.empty(0)
+        elif len(parts) == 1:
+            loaded[c] = parts[0]
+        else:
+            loaded[c] = np.concatenate(parts)
+    return loaded
+
+
+def _line_columns(stat: str):
+    """Columns needed to compute a stat's per-line value"""
+    if stat in CATEGORIES:
+        return CATEGORIES[stat][1]
+    if stat in LINE_METRICS:
+        return (LINE_METRICS[stat],)
+    if stat in COUNT_COLUMNS or stat == "plus_minus":
+        return (stat,)
+    raise ValueError(f"Unknown stat {stat}")
+
+
+def query_leaders(
+    game_dates,
+    stat: str,
+    agg: str = "avg",
+    min_value: float = None,
+    min_games: int = 1,
+    group: str = "player",
+    team: str = None,
+    top: int = 10,
+):
+    """Rank players (or teams) by an aggregate of one stat over archived dates.
+
+    `agg` is sum, avg, max or count (games meeting `min_value`, e.g. 30-point
+    games). `min_value` otherwise filters games before aggregating and
+    `min_games` drops groups with fewer games. Team groups aggregate each
+    team-game's summed lines. Rates (tsPct, efgPct, ...) are recomputed from
+    the summed makes and attempts of the range and only take agg=avg.
+    """
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"agg must be one of {', '.join(AGGREGATIONS)}")
+    if group not in ("player", "team"):
+        raise ValueError("group must be player or team")
+    if stat in RATES:
+        if agg != "avg":
+            raise ValueError("a rate stat only supports agg=avg")
+        if min_value is not None:
+            raise ValueError("min cannot be combined with a rate stat")
+        needed = RATES[stat][0]
+    else:
+        needed = _line_columns(stat)
+        if agg == "count" and min_value is None:
+            raise ValueError("agg=count needs a min value")
+
+    cols = load_columns(game_dates, set(needed) | {"game_id", "player_id", "team_id", "tricode", "name"})
+    if stat not in RATES:
+        values = np.sum([cols[c] for c in needed], axis=0, dtype=np.float64) if len(cols["player_id"]) else np.empty(0)
+
+    mask = np.ones(len(cols["player_id"]), dtype=bool)
+    if team:
+        mask &= cols["tricode"] == team.upper()
+    if stat not in RATES:
+        mask &= ~np.isnan(values)
+    rows = np.flatnonzero(mask)
+    if len(rows) == 0:
+        return []
+
+    # Vectorized group-by: one bincount per aggregate over the group index
+    keys = cols["player_id" if group == "player" else "team_id"][rows]
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    # A group's games: player lines, or a team's distinct game ids with its lines summed
+    unit_group = inverse
+    if group == "team":
+        game_ids, game_index = np.unique(cols["game_id"][rows], return_inverse=True)
+        pairs, pair_inverse = np.unique(inverse * len(game_ids) + game_index, return_inverse=True)
+        unit_group = pairs // len(game_ids)
+    if stat in RATES:
+        games = np.bincount(unit_group, minlength=len(uniq))
+        sums = {c: np.bincount(inverse, weights=cols[c][rows], minlength=len(uniq)) for c in needed}
+        result = RATES[stat][1](sums)
+        digits = RATES[stat][2]
+    else:
+        unit_values = values[rows]
+        if group == "team":
+            unit_values = np.bincount(pair_inverse, weights=unit_values, minlength=len(pairs))
+        if min_value is not None:
+            kept = unit_values >= min_value
+            unit_group, unit_values = unit_group[kept], unit_values[kept]
+        games = np.bincount(unit_group, minlength=len(uniq))
+        if agg == "count":
+            result, digits = games.astype(float), 0
+        elif agg == "max":
+            result = np.full(len(uniq), -np.inf)
+            np.maximum.at(result, unit_group, unit_values)
+            digits = 1 if stat in LINE_METRICS or stat == "plus_minus" else 0
+        else:
+            result = np.bincount(unit_group, weights=unit_values, minlength=len(uniq))
+            digits = 0
+            if agg == "avg":
+                result, digits = result / np.maximum(games, 1), 1
+
+    # Latest line of each group names it (players traded mid-range show their current team)
+    latest = np.full(len(uniq), -1)
+    np.maximum.at(latest, inverse, rows)
+
+    eligible = np.flatnonzero(games >= max(min_games, 1))
+    order = eligible[np.argsort(-result[eligible], kind="stable")][:top]
+    ranking = []
+    for pos, g in enumerate(order):
+        value = round(float(result[g]), digits) if digits else int(round(result[g]))
+        rank = pos + 1 if pos == 0 or value != ranking[-1]["value"] else ranking[-1]["rank"]
+        line = latest[g]
+        entry = {"rank": rank, "id": int(uniq[g]), "value": value, "games": int(games[g])}
+        if group == "player":
+            entry.update(name=str(cols["name"][line]), team=str(cols["tricode"][line]))
+        else:
+            entry.update(team=str(cols["tricode"][line]))
+        ranking.append(entry)
+    return ranking
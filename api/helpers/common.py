@@ -1,5 +1,8 @@
 # Cache TTLs (in seconds)
+import hashlib
+import json
 import os
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
@@ -10,29 +13,89 @@ CACHE_TTL = {
     "boxscores": 60,  # 1 minute
     "leaders": 300,  # 5 minutes
     "standings": 3600,  # 1 hour - doesn't change often
+    "standings_reconcile": 10800,  # 3 hours - live standings are patched from finals in between
     "player_stats": 30,  # 30 seconds
+    "league_stats": 3600,  # 1 hour - season totals only move once a slate goes final
+    "game_log": 900,  # 15 minutes - a player's game log only grows after a final
     "historical": 86400,  # 24 hours - days_offset >= 2 never changes
     "injuries": 7200,  # 2 hours - injury reports don't change often, avoid rate limits
+    "schedule": 604800,  # 1 week - the season schedule, reloaded for postponements and playoff games
+    "trades": 3600,  # 1 hour - transactions cluster around the deadline and free agency
 }
 
-# Simple in-memory cache
+# Bounds of the TTLs learned by SimpleCache.set_adaptive; each starts at its CACHE_TTL
+CACHE_TTL_BOUNDS = {
+    "trades": (600, 43200),  # 10 minutes at the deadline - 12 hours in quiet weeks
+    "standings_reconcile": (3600, 43200),  # 1 hour on busy slates - 12 hours without games
+}
+ADAPTIVE_SHRINK = 0.5  # a refresh that found new content halves the TTL
+ADAPTIVE_GROW = 1.5  # a refresh that found the same content stretches it
+
+
+def content_hash(data: Any) -> str:
+    """Stable hash of JSON-like data, to tell whether a refresh changed anything"""
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# Simple in-memory cache, shared by the event loop, the executor and background pollers
 class SimpleCache:
     def __init__(self):
         self._cache: Dict[str, Dict[str, Any]] = {}
+        self._learned: Dict[str, Dict[str, Any]] = {}  # key -> content hash and TTL of its last refresh
+        self._lock = threading.Lock()
 
     def get(self, key: str) -> Optional[Any]:
-        if key in self._cache:
-            entry = self._cache[key]
-            if time.time() < entry["expires"]:
-                return entry["data"]
-            del self._cache[key]
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if time.time() < entry["expires"]:
+            return entry["data"]
+        with self._lock:
+            if self._cache.get(key) is entry:
+                del self._cache[key]
         return None
 
     def set(self, key: str, data: Any, ttl_seconds: int):
-        self._cache[key] = {"data": data, "expires": time.time() + ttl_seconds}
+        with self._lock:
+            self._cache[key] = {"data": data, "expires": time.time() + ttl_seconds}
+
+    def adaptive_ttl(self, key: str, content: Any, ttl_key: str) -> int:
+        """Learn a key's TTL from whether its content changed since the previous refresh.
+
+        Content that keeps changing is refreshed more and more often, content
+        that stays the same less and less, within CACHE_TTL_BOUNDS[ttl_key].
+        """
+        low, high = CACHE_TTL_BOUNDS[ttl_key]
+        digest = content_hash(content)
+        with self._lock:
+            learned = self._learned.get(key)
+            if learned is None:
+                learned = self._learned[key] = {"hash": digest, "ttl": CACHE_TTL[ttl_key]}
+            else:
+                learned["ttl"] *= ADAPTIVE_SHRINK if digest != learned["hash"] else ADAPTIVE_GROW
+                learned["hash"] = digest
+            learned["ttl"] = min(high, max(low, learned["ttl"]))
+            return int(learned["ttl"])
+
+    def set_adaptive(self, key: str, data: Any, ttl_key: str, content: Any = None) -> int:
+        """Set with a learned TTL; `content` is what to compare when data holds more than the upstream payload"""
+        ttl = self.adaptive_ttl(key, data if content is None else content, ttl_key)
+        self.set(key, data, ttl)
+        return ttl
+
+    def delete(self, key: str):
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def delete_prefix(self, prefix: str):
+        with self._lock:
+            for key in [k for k in self._cache if k.startswith(prefix)]:
+                del self._cache[key]
 
     def clear(self):
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._learned.clear()
 
 # Shared singleton instances
 cache = SimpleCache()
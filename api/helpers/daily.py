@@ -0,0 +1,247 @@
+import numpy as np
+from helpers.metrics import get_game_metrics
+from helpers.stats import fix_encoding
+from isodate import parse_duration
+
+# Columns of the daily stat table, one row per player line
+COLUMNS = ("pts", "reb", "ast", "stl", "blk", "fg3m", "tov", "fgm", "fga", "ftm", "fta", "seconds")
+_COL = {c: i for i, c in enumerate(COLUMNS)}
+
+BOXSCORE_FIELDS = {
+    "pts": "points",
+    "reb": "reboundsTotal",
+    "ast": "assists",
+    "stl": "steals",
+    "blk": "blocks",
+    "fg3m": "threePointersMade",
+    "tov": "turnovers",
+    "fgm": "fieldGoalsMade",
+    "fga": "fieldGoalsAttempted",
+    "ftm": "freeThrowsMade",
+    "fta": "freeThrowsAttempted",
+}
+
+# Team box score totals (store column names) and their live BoxScore statistics
+TEAM_FIELDS = {
+    "fgm": "fieldGoalsMade",
+    "fga": "fieldGoalsAttempted",
+    "fg3m": "threePointersMade",
+    "fg3a": "threePointersAttempted",
+    "ftm": "freeThrowsMade",
+    "fta": "freeThrowsAttempted",
+    "reb": "reboundsTotal",
+    "oreb": "reboundsOffensive",
+    "ast": "assists",
+    "stl": "steals",
+    "blk": "blocks",
+    "tov": "turnovers",
+    "pf": "foulsPersonal",
+}
+
+# category key -> (label, columns summed into it)
+CATEGORIES = {
+    "points": ("Points", ("pts",)),
+    "rebounds": ("Rebounds", ("reb",)),
+    "assists": ("Assists", ("ast",)),
+    "blocks": ("Blocks", ("blk",)),
+    "steals": ("Steals", ("stl",)),
+    "threePointers": ("3-Pointers", ("fg3m",)),
+    "pra": ("Pts+Reb+Ast", ("pts", "reb", "ast")),
+    "stocks": ("Stocks (Stl+Blk)", ("stl", "blk")),
+}
+
+EXTRA_TIES = 5  # lines tied at a ranking's cut-off listed beyond its top N; the rest are only counted
+
+# Category x column weights, so every category is computed with one matrix product
+WEIGHTS = np.zeros((len(CATEGORIES), len(COLUMNS)), dtype=np.int32)
+for _row, (_label, _cols) in enumerate(CATEGORIES.values()):
+    for _col in _cols:
+        WEIGHTS[_row, _COL[_col]] = 1
+
+
+def _seconds(minutes) -> int:
+    try:
+        return int(parse_duration(minutes).total_seconds())
+    except Exception:
+        return 0
+
+
+class DailyTable:
+    """One day's player lines as a columnar table (ids, names, teams, stat matrix)"""
+
+    def __init__(self, ids, names, teams, values):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.names = list(names)
+        self.teams = np.asarray(teams, dtype=str)
+        self.values = np.asarray(values, dtype=np.int32).reshape(-1, len(COLUMNS))
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_boxscores(cls, boxscores):
+        """Build the table from live BoxScore dicts, keeping ACTIVE players"""
+        return DailyDigest(boxscores).table
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build the table from stored player_games rows"""
+        return cls(
+            [r["player_id"] for r in rows],
+            [r["name"] for r in rows],
+            [r["tricode"] for r in rows],
+            [[r[c] or 0 for c in COLUMNS] for r in rows],
+        )
+
+    def totals(self):
+        """Category x player matrix of every category total"""
+        return WEIGHTS @ self.values.T
+
+    def leaders(self, top: int = 1, mask=None):
+        """Rank every category at once.
+
+        Each category reports its best value with the players sharing it, plus a
+        `ranking` of the top `top` lines. Ties at the cut-off are included up to
+        EXTRA_TIES more lines (`tiedOut` counts the rest); zero values never rank.
+        """
+        totals = self.totals()
+        index = np.arange(len(self))
+        if mask is not None:
+            totals, index = totals[:, mask], index[mask]
+        if totals.shape[1] == 0:
+            return {}
+
+        # Descending order per category; stable, so ties keep boxscore order
+        order = np.argsort(-totals, axis=1, kind="stable")
+        ranked = np.take_along_axis(totals, order, axis=1)
+        cutoff = np.maximum(ranked[:, min(top, ranked.shape[1]) - 1], 1)
+
+        leaders = {}
+        for row, (key, (label, _)) in enumerate(CATEGORIES.items()):
+            qualified = int(np.count_nonzero(ranked[row] >= cutoff[row]))
+            count = min(qualified, top + EXTRA_TIES)
+            ranking = []
+            for pos in range(count):
+                value = int(ranked[row, pos])
+                rank = pos + 1 if pos == 0 or value != ranking[-1]["value"] else ranking[-1]["rank"]
+                i = index[order[row, pos]]
+                ranking.append({
+                    "rank": rank,
+                    "id": int(self.ids[i]),
+                    "name": self.names[i],
+                    "team": str(self.teams[i]),
+                    "value": value,
+                })
+            leaders[key] = {
+                "label": label,
+                "value": ranking[0]["value"] if ranking else 0,
+                "players": [{"name": p["name"], "team": p["team"]} for p in ranking if p["rank"] == 1],
+                "ranking": ranking,
+                "tiedOut": qualified - count,
+            }
+        return leaders
+
+    def team_leaders(self, top: int = 1):
+        """Leaders of every category within each team"""
+        return {str(team): self.leaders(top, self.teams == team) for team in np.unique(self.teams)}
+
+
+def _pct(made, attempted):
+    return round(made / attempted, 3) if attempted else 0
+
+
+def team_boxscore(name: str, score: int, totals: dict, leader: dict = None) -> dict:
+    """A team's /api/boxscores entry from store-named totals and its top scorer's line"""
+    t = {k: totals.get(k) or 0 for k in TEAM_FIELDS}
+    return {
+        "name": name,
+        "score": score,
+        "stats": {
+            "fg": f"{t['fgm']}/{t['fga']}",
+            "fgPct": _pct(t["fgm"], t["fga"]),
+            "threePt": f"{t['fg3m']}/{t['fg3a']}",
+            "threePtPct": _pct(t["fg3m"], t["fg3a"]),
+            "ft": f"{t['ftm']}/{t['fta']}",
+            "ftPct": _pct(t["ftm"], t["fta"]),
+            "rebounds": t["reb"],
+            "offRebounds": t["oreb"],
+            "assists": t["ast"],
+            "steals": t["stl"],
+            "blocks": t["blk"],
+            "turnovers": t["tov"],
+            "fouls": t["pf"],
+        },
+        "leader": {
+            "name": leader["name"] if leader else "",
+            "points": leader["pts"] if leader else 0,
+            "rebounds": leader["reb"] if leader else 0,
+            "assists": leader["ast"] if leader else 0,
+        },
+    }
+
+
+class DailyDigest:
+    """Everything the day endpoints serve, built in one pass over the day's ACTIVE players.
+
+    Boxscores, leaders and double-doubles for a date share one fetch and one loop.
+    """
+
+    def __init__(self, boxscores):
+        ids, names, teams, values = [], [], [], []
+        self.boxscores = []
+        self.lines = []
+        self.triple_doubles = []
+        self.double_doubles = []
+
+        for bs in boxscores:
+            if not bs:
+                continue
+            game = bs["game"]
+            game_box = {"gameId": game.get("gameId", ""), "teams": []}
+            # Double-digit categories come from the shared per-game metrics engine
+            metrics = get_game_metrics(bs)
+            for team_key in ["homeTeam", "awayTeam"]:
+                team = game[team_key]
+                tricode = team["teamTricode"]
+                leader = None
+                for player in team["players"]:
+                    if player["status"] != "ACTIVE":
+                        continue
+                    stats = player["statistics"]
+                    row = [stats.get(BOXSCORE_FIELDS[c], 0) or 0 for c in COLUMNS[:-1]] + [_seconds(stats.get("minutes"))]
+                    line = {
+                        "id": player.get("personId", 0),
+                        "name": fix_encoding(player["name"]),
+                        "team": tricode,
+                        "gameId": game_box["gameId"],
+                        **dict(zip(COLUMNS, row)),
+                    }
+                    line["categories"] = metrics.get(player.get("personId"), {}).get("doubleDigitCategories", [])
+                    self.lines.append(line)
+                    ids.append(line["id"])
+                    names.append(line["name"])
+                    teams.append(tricode)
+                    values.append(row)
+
+                    if leader is None or line["pts"] > leader["pts"]:
+                        leader = line
+                    if len(line["categories"]) >= 2:
+                        (self.triple_doubles if len(line["categories"]) >= 3 else self.double_doubles).append({
+                            "name": line["name"],
+                            "team": tricode,
+                            "points": line["pts"],
+                            "rebounds": line["reb"],
+                            "assists": line["ast"],
+                            "steals": line["stl"],
+                            "blocks": line["blk"],
+                            "categories": line["categories"],
+                        })
+
+                ts = team.get("statistics", {})
+                name = f"{team.get('teamCity', '')} {team.get('teamName', '')}".strip()
+                game_box["teams"].append(team_boxscore(
+                    name, team.get("score", 0), {k: ts.get(f) for k, f in TEAM_FIELDS.items()}, leader,
+                ))
+            self.boxscores.append(game_box)
+
+        self.table = DailyTable(ids, names, teams, values)
@@ -0,0 +1,111 @@
+import threading
+from collections import defaultdict
+
+from helpers.common import cache
+from helpers.logger import log_exceptions
+from helpers.store import GAME_STATUS_FINAL
+
+GAME_STATUS_SCHEDULED = 1
+GAME_STATUS_LIVE = 2
+
+# Events emitted from scoreboard snapshots; handlers get the scoreboard game dict
+TIP_OFF = "tipoff"
+PERIOD_END = "period_end"
+FINAL = "final"
+# The scoreboard moved on to a new slate (day offsets now point at other dates); no game
+NEW_SLATE = "new_slate"
+
+GAME_EVENTS = (TIP_OFF, PERIOD_END, FINAL)
+
+
+class EventBus:
+    """In-process publish/subscribe for game-state events.
+
+    A failing handler is logged and does not stop the others.
+    """
+
+    def __init__(self):
+        self._handlers = defaultdict(list)
+
+    def subscribe(self, event, handler):
+        self._handlers[event].append(handler)
+        return handler
+
+    def on(self, *events):
+        """Decorator subscribing a handler to one or more events"""
+        def register(handler):
+            for event in events:
+                self.subscribe(event, handler)
+            return handler
+        return register
+
+    def publish(self, event, game=None):
+        for handler in list(self._handlers[event]):
+            try:
+                handler(game)
+            except Exception as ex:
+                log_exceptions(ex)
+
+
+class GameStateTracker:
+    """Turns consecutive scoreboard snapshots into game events.
+
+    Games seen for the first time are compared against a scheduled state, so
+    a worker that first sees a game live or final still emits its tip-off or
+    final once. A snapshot with none of the previous game ids is a new slate;
+    an empty snapshot is ignored.
+    """
+
+    def __init__(self, bus):
+        self.bus = bus
+        self._states = {}  # game id -> (status, period)
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._states = {}
+
+    def status(self, game_id):
+        """Last seen gameStatus of a game, or None if it was not in the latest snapshot"""
+        state = self._states.get(game_id)
+        return state[0] if state else None
+
+    def has_live_games(self) -> bool:
+        return any(status == GAME_STATUS_LIVE for status, _ in self._states.values())
+
+    def observe(self, games):
+        """Diff a snapshot against the previous one and publish its events; returns them"""
+        events = []
+        with self._lock:
+            new_slate = bool(self._states and games) and not any(g["gameId"] in self._states for g in games)
+            if new_slate:
+                events.append((NEW_SLATE, None))
+            for game in games:
+                status, period = game.get("gameStatus"), game.get("period") or 0
+                old_status, old_period = self._states.get(game["gameId"], (GAME_STATUS_SCHEDULED, 0))
+                if status == GAME_STATUS_LIVE and old_status == GAME_STATUS_SCHEDULED:
+                    events.append((TIP_OFF, game))
+                elif status == GAME_STATUS_LIVE and old_status == GAME_STATUS_LIVE and period > old_period:
+                    events.append((PERIOD_END, game))
+                elif status == GAME_STATUS_FINAL and old_status != GAME_STATUS_FINAL:
+                    events.append((FINAL, game))
+            if games:
+                self._states = {g["gameId"]: (g.get("gameStatus"), g.get("period") or 0) for g in games}
+        # Handlers run outside the lock; they may be slow (standings, store)
+        for event, game in events:
+            self.bus.publish(event, game)
+        return events
+
+
+def invalidate(*keys, prefixes=()):
+    """Handler factory deleting fixed cache keys and every key under some prefixes"""
+    def handler(game):
+        for key in keys:
+            cache.delete(key)
+        for prefix in prefixes:
+            cache.delete_prefix(prefix)
+    return handler
+
+
+bus = EventBus()
+tracker = GameStateTracker(bus)
@@ -0,0 +1,92 @@
+import hashlib
+import json
+
+import numpy as np
+from helpers.daily import COLUMNS, DailyTable
+from helpers.metrics import DOUBLE_DIGIT_CATEGORIES
+
+# Bonus keys scored per line on top of the per-stat weights
+BONUSES = ("dd", "td")
+
+# Built-in scoring profiles: stat -> points per unit
+PROFILES = {
+    # ESPN standard points league scoring
+    "espn": {"pts": 1, "reb": 1, "ast": 2, "stl": 4, "blk": 4, "fg3m": 1, "tov": -2,
+             "fgm": 2, "fga": -1, "ftm": 1, "fta": -1},
+    "draftkings": {"pts": 1, "fg3m": 0.5, "reb": 1.25, "ast": 1.5, "stl": 2, "blk": 2, "tov": -0.5,
+                   "dd": 1.5, "td": 3},
+    "fanduel": {"pts": 1, "reb": 1.2, "ast": 1.5, "stl": 3, "blk": 3, "tov": -1},
+}
+
+_DOUBLE_DIGIT_COLUMNS = [COLUMNS.index(name) for name, _ in DOUBLE_DIGIT_CATEGORIES]
+
+
+def parse_weights(value: str) -> dict:
+    """Parse a custom profile like 'pts:1,reb:1.2,tov:-1,dd:1.5'"""
+    weights = {}
+    for part in value.split(","):
+        stat, sep, weight = part.partition(":")
+        stat = stat.strip()
+        if not sep or (stat not in COLUMNS and stat not in BONUSES) or stat == "seconds":
+            raise ValueError(f"Weights must be stat:number pairs over {', '.join(COLUMNS[:-1] + BONUSES)}")
+        try:
+            weights[stat] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight for {stat}: {weight}")
+    return weights
+
+
+def get_profile(name: str = None, weights: str = None):
+    """Resolve a built-in profile name or custom weights into (name, weights)"""
+    if weights:
+        return "custom", parse_weights(weights)
+    name = name or "espn"
+    if name not in PROFILES:
+        raise ValueError(f"Unknown profile {name}; use one of {', '.join(PROFILES)} or custom weights")
+    return name, PROFILES[name]
+
+
+def profile_hash(weights: dict) -> str:
+    """Stable short hash of a profile's weights, for cache keys"""
+    canonical = json.dumps({k: float(v) for k, v in weights.items() if v}, sort_keys=True)
+    return hashlib.sha1(canonical.encode()).hexdigest()[:12]
+
+
+def score_lines(table: DailyTable, weights: dict):
+    """Fantasy points of every line in the table, in one matrix-vector product"""
+    vector = np.array([weights.get(c, 0) if c != "seconds" else 0 for c in COLUMNS], dtype=np.float64)
+    points = table.values @ vector
+    if weights.get("dd") or weights.get("td"):
+        double_digits = np.count_nonzero(table.values[:, _DOUBLE_DIGIT_COLUMNS] >= 10, axis=1)
+        points += weights.get("dd", 0) * (double_digits >= 2) + weights.get("td", 0) * (double_digits >= 3)
+    return points
+
+
+def fantasy_ranking(table: DailyTable, weights: dict, top: int = 25, mask=None):
+    """Players ranked by fantasy points summed over their lines (one per game)"""
+    points = score_lines(table, weights)
+    rows = np.arange(len(table)) if mask is None else np.flatnonzero(mask)
+    if len(rows) == 0:
+        return []
+
+    uniq, inverse = np.unique(table.ids[rows], return_inverse=True)
+    totals = np.bincount(inverse, weights=points[rows], minlength=len(uniq))
+    games = np.bincount(inverse, minlength=len(uniq))
+    latest = np.full(len(uniq), -1)
+    np.maximum.at(latest, inverse, rows)
+
+    ranking = []
+    for pos, g in enumerate(np.argsort(-totals, kind="stable")[:top]):
+        value = round(float(totals[g]), 2)
+        rank = pos + 1 if pos == 0 or value != ranking[-1]["points"] else ranking[-1]["rank"]
+        line = latest[g]
+        ranking.append({
+            "rank": rank,
+            "id": int(uniq[g]),
+            "name": table.names[line],
+            "team": str(table.teams[line]),
+            "games": int(games[g]),
+            "points": value,
+            "average": round(value / games[g], 2),
+        })
+    return ranking
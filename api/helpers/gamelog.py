@@ -0,0 +1,44 @@
+import time
+from datetime import datetime
+
+from helpers.common import CACHE_TTL, STATS_PROXY, cache
+from nba_api.stats.endpoints import playergamelog
+
+
+def parse_game_date(game_date: str) -> datetime:
+    """Parse a stats.nba.com game log date (e.g. 'APR 13, 2025')"""
+    return datetime.strptime(game_date, "%b %d, %Y")
+
+
+def get_player_game_log(player_id: int):
+    """Get a player's season game log (newest first) as header-keyed dicts.
+
+    The first call downloads the whole season. After that the log is re-checked
+    at most every CACHE_TTL["game_log"] seconds, asking only for games from the
+    newest stored date onwards and merging them in, so every request costs at
+    most one upstream call. Rows come from the player's log rather than a team
+    schedule, so games played for a previous team are included.
+    """
+    cache_key = f"game_log_{player_id}"
+    entry = cache.get(cache_key)
+    now = time.time()
+    if entry is not None and now - entry["checked"] < CACHE_TTL["game_log"]:
+        return entry["rows"]
+
+    rows = entry["rows"] if entry else []
+    date_from = parse_game_date(rows[0]["GAME_DATE"]).strftime("%m/%d/%Y") if rows else ""
+    log = playergamelog.PlayerGameLog(
+        player_id=player_id,
+        date_from_nullable=date_from,
+        proxy=STATS_PROXY,
+    )
+    data = log.player_game_log.get_dict()
+    headers = data["headers"]
+
+    known = {r["Game_ID"] for r in rows}
+    new_rows = [dict(zip(headers, r)) for r in data["data"]]
+    merged = [r for r in new_rows if r["Game_ID"] not in known] + rows
+    merged.sort(key=lambda r: parse_game_date(r["GAME_DATE"]), reverse=True)
+
+    cache.set(cache_key, {"rows": merged, "checked": now}, CACHE_TTL["historical"])
+    return merged
@@ -0,0 +1,127 @@
+import numpy as np
+from helpers.common import CACHE_TTL, STATS_PROXY, cache
+from helpers.stats import fix_encoding
+from nba_api.stats.endpoints import leaguedashplayerstats
+from nba_api.stats.library.parameters import Season
+
+# Players counted in league distributions (percentiles, similarity)
+MIN_GAMES = 5
+MIN_MINUTES = 10.0  # per game
+
+# Stats with a league percentile; for the negative ones a lower value ranks higher
+PERCENTILE_STATS = (
+    "minutes", "points", "rebounds", "assists", "steals", "blocks", "fg3m",
+    "fgPct", "fg3Pct", "ftPct", "turnovers", "fouls",
+)
+LOWER_IS_BETTER = ("turnovers", "fouls")
+
+
+def is_qualified(entry: dict) -> bool:
+    return entry["gp"] >= MIN_GAMES and entry["minutes"] >= MIN_MINUTES
+
+
+def season_averages(row, h, season):
+    """Turn a season totals row (career or league dashboard) into per-game averages"""
+    gp = row[h["GP"]] or 1
+
+    def avg(key):
+        return round((row[h[key]] or 0) / gp, 1)
+
+    def pct(key):
+        val = row[h[key]]
+        return round(val * 100, 1) if val else 0.0
+
+    return {
+        "season": season,
+        "gp": gp,
+        "minutes": avg("MIN"),
+        "points": avg("PTS"),
+        "rebounds": avg("REB"),
+        "assists": avg("AST"),
+        "steals": avg("STL"),
+        "blocks": avg("BLK"),
+        "turnovers": avg("TOV"),
+        "fouls": avg("PF"),
+        "fgm": avg("FGM"),
+        "fga": avg("FGA"),
+        "fgPct": pct("FG_PCT"),
+        "fg3m": avg("FG3M"),
+        "fg3a": avg("FG3A"),
+        "fg3Pct": pct("FG3_PCT"),
+        "ftm": avg("FTM"),
+        "fta": avg("FTA"),
+        "ftPct": pct("FT_PCT"),
+    }
+
+
+def get_league_season_table():
+    """Get {player_id: season averages} for every player from one LeagueDashPlayerStats pull"""
+    cached = cache.get("league_season_table")
+    if cached is not None:
+        return cached
+
+    stats = leaguedashplayerstats.LeagueDashPlayerStats(
+        per_mode_detailed="Totals",
+        proxy=STATS_PROXY,
+    )
+    data = stats.league_dash_player_stats.get_dict()
+    h = {k: i for i, k in enumerate(data["headers"])}
+
+    table = {}
+    for row in data["data"]:
+        player_id = row[h["PLAYER_ID"]]
+        entry = {
+            "id": player_id,
+            "name": fix_encoding(row[h["PLAYER_NAME"]]),
+            "team": row[h["TEAM_ABBREVIATION"]],
+        }
+        entry.update(season_averages(row, h, Season.default))
+        table[player_id] = entry
+
+    cache.set("league_season_table", table, CACHE_TTL["league_stats"])
+    return table
+
+
+class LeaguePercentiles:
+    """Sorted per-stat distributions of qualified players, for percentile lookups.
+
+    Built once per league table refresh; a percentile is then two binary
+    searches: the share of qualified players the value beats or ties.
+    """
+
+    def __init__(self, entries):
+        qualified = [e for e in entries if is_qualified(e)]
+        self.count = len(qualified)
+        self.sorted = {
+            stat: np.sort(np.array([e[stat] for e in qualified], dtype=np.float64))
+            for stat in PERCENTILE_STATS
+        }
+
+    def percentile(self, stat: str, value: float) -> float:
+        if not self.count:
+            return 0.0
+        values = self.sorted[stat]
+        if stat in LOWER_IS_BETTER:
+            at_or_worse = self.count - np.searchsorted(values, value, side="left")
+        else:
+            at_or_worse = np.searchsorted(values, value, side="right")
+        return round(100 * float(at_or_worse) / self.count, 1)
+
+    def percentiles(self, entry: dict) -> dict:
+        return {stat: self.percentile(stat, entry[stat]) for stat in PERCENTILE_STATS}
+
+
+def get_league_percentiles() -> LeaguePercentiles:
+    """Get percentile distributions matching the current league season table"""
+    table = get_league_season_table()
+    cached = cache.get("league_percentiles")
+    if cached is not None and cached[0] is table:
+        return cached[1]
+    percentiles = LeaguePercentiles(table.values())
+    cache.set("league_percentiles", (table, percentiles), CACHE_TTL["league_stats"])
+    return percentiles
+
+
+def with_percentiles(entry: dict, percentiles: LeaguePercentiles) -> dict:
+    """A copy of a league table entry with its percentile for every stat"""
+    return {**entry, "percentiles": percentiles.percentiles(entry)}
@@ -0,0 +1,283 @@
+import asyncio
+import json
+from collections import Counter
+
+from helpers.common import CACHE_TTL, cache, executor
+from helpers.events import tracker
+from helpers.logger import log_exceptions
+from helpers.stats import (
+    format_player_line,
+    format_scoreboard_game,
+    get_display_date,
+    load_players_dict,
+)
+from helpers.pbp import live_engine
+from helpers.scheduler import scheduler
+from helpers.standings import apply_final_games
+from helpers.store import GAME_STATUS_FINAL, schedule_ingest
+from nba_api.live.nba.endpoints import scoreboard
+
+POLL_INTERVAL = 5  # seconds between upstream scoreboard fetches while clients are connected
+PLAYER_POLL_INTERVAL = POLL_INTERVAL  # the play-by-play file is fetched whole, so no faster than the boxscores it replaced
+HEARTBEAT_INTERVAL = 15  # keep idle connections open through proxies
+QUEUE_SIZE = 100
+
+
+def build_scoreboard(games):
+    """Format raw live scoreboard games, publishing their state transitions first.
+
+    Finished games update standings and are queued for the stats store on
+    every build, not just on their FINAL event, so a failed first attempt is
+    retried; both are idempotent. The raw games are kept for the player stats
+    hub, which needs team ids.
+    """
+    finals = [g for g in games if g.get("gameStatus") == GAME_STATUS_FINAL]
+    apply_final_games(finals)
+    schedule_ingest([g["gameId"] for g in finals])
+    tracker.observe(games)
+    cache.set("live_games", games, CACHE_TTL["scoreboard"])
+    return {"games": [format_scoreboard_game(g) for g in games], "date": get_display_date(0)}
+
+
+def game_state(game):
+    """The parts of a game worth pushing a change for: score, clock and status"""
+    return (
+        game["homeTeam"]["score"],
+        game["awayTeam"]["score"],
+        game.get("period"),
+        game.get("gameClock"),
+        game.get("gameStatus"),
+        game["gameStatusText"],
+    )
+
+
+def changed_games(previous_states, games):
+    """Return the games whose state differs from the previous {gameId: state} snapshot"""
+    return [g for g in games if previous_states.get(g["gameId"]) != game_state(g)]
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def fetch_live_games():
+    return scoreboard.ScoreBoard().games.data
+
+
+def get_live_games():
+    """Raw live scoreboard games, shared with the scoreboard route and poller.
+
+    The full scoreboard is refetched at most every CACHE_TTL["scoreboard"];
+    only the per-game feeds are polled at the player hub's interval.
+    """
+    games = cache.get("live_games")
+    if games is None:
+        games = fetch_live_games()
+        cache.set("live_games", games, CACHE_TTL["scoreboard"])
+    return games
+
+
+def fetch_live_boxscore(game_id):
+    return live_engine.boxscore(game_id)
+
+
+def put_dropping_oldest(queue, message):
+    """Queue a message for a client, dropping its oldest pending one when the queue is full"""
+    try:
+        queue.put_nowait(message)
+    except asyncio.QueueFull:
+        queue.get_nowait()
+        queue.put_nowait(message)
+
+
+def next_poll(schedule, interval):
+    """Seconds until a poller's next fetch: `interval` while games are live, longer between windows"""
+    if schedule is None:
+        return interval
+    try:
+        # Never waits on upstream: the scheduler reloads its schedule in the background
+        return schedule.poll_interval(live_interval=interval)
+    except Exception as ex:
+        log_exceptions(ex)
+        return interval
+
+
+class ScoreboardBroadcaster:
+    """Single upstream scoreboard poller fanned out to every connected SSE client.
+
+    Polling starts with the first subscriber and stops once the last one disconnects.
+    Each poll also refreshes the /api/scoreboard cache entry. With a schedule,
+    `interval` is the live cadence and polls between game windows are spaced
+    by schedule.poll_interval().
+    """
+
+    def __init__(self, fetch_games=fetch_live_games, interval=POLL_INTERVAL, schedule=None):
+        self._fetch_games = fetch_games
+        self._interval = interval
+        self._schedule = schedule
+        self._subscribers = set()
+        self._states = {}
+        self._scoreboard = {"games": [], "date": get_display_date(0)}
+        self._task = None
+
+    async def _poll(self):
+        loop = asyncio.get_running_loop()
+        while self._subscribers:
+            try:
+                games = await loop.run_in_executor(executor, self._fetch_games)
+                changed = changed_games(self._states, games)
+                self._states = {g["gameId"]: game_state(g) for g in games}
+                # Event handlers (standings, store, cache invalidation) block, so keep them off the loop
+                self._scoreboard = await loop.run_in_executor(executor, self._refresh_scoreboard, games)
+
+                formatted = {g["gameId"]: g for g in self._scoreboard["games"]}
+                for game in changed:
+                    self._publish(sse_event("game", formatted[game["gameId"]]))
+            except Exception as ex:
+                log_exceptions(ex)
+            await asyncio.sleep(next_poll(self._schedule, self._interval))
+        self._task = None
+
+    def _refresh_scoreboard(self, games):
+        scoreboard = build_scoreboard(games)
+        ttl = self._schedule.ttl("scoreboard") if self._schedule else CACHE_TTL["scoreboard"]
+        cache.set("scoreboard", scoreboard, ttl)
+        return scoreboard
+
+    def _publish(self, message):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too slow to keep up: end its stream, EventSource reconnects and gets a fresh snapshot
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    async def subscribe(self):
+        """Yield SSE messages: a full snapshot first, then one event per changed game"""
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers.add(queue)
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll())
+        try:
+            yield sse_event("snapshot", self._scoreboard)
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    message = ": ping\n\n"
+                if message is None:
+                    break
+                yield message
+        finally:
+            self._subscribers.discard(queue)
+
+
+class PlayerStatsHub:
+    """Live stat lines for the players WebSocket clients are subscribed to.
+
+    Subscriptions are reference counted across clients; each poll only refreshes
+    boxscores (via play-by-play deltas) of today's games involving a subscribed
+    player's team, and a player's line is pushed to its subscribers only when it changed.
+    Like the scoreboard broadcaster, an optional schedule spaces polls between game windows.
+    """
+
+    def __init__(
+        self,
+        fetch_games=get_live_games,
+        fetch_boxscore=fetch_live_boxscore,
+        interval=PLAYER_POLL_INTERVAL,
+        schedule=None,
+    ):
+        self._fetch_games = fetch_games
+        self._fetch_boxscore = fetch_boxscore
+        self._interval = interval
+        self._schedule = schedule
+        self._refs = Counter()
+        self._clients = {}  # queue -> set of subscribed player ids
+        self._lines = {}  # player id -> latest stat line
+        self._task = None
+
+    def connect(self):
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._clients[queue] = set()
+        return queue
+
+    def disconnect(self, queue):
+        self._release(self._clients.pop(queue, set()))
+
+    def subscribe(self, queue, player_ids):
+        """Add subscriptions and return the already known lines for the new players"""
+        new_ids = set(player_ids) - self._clients[queue]
+        self._clients[queue] |= new_ids
+        self._refs.update(new_ids)
+        if self._refs and self._task is None:
+            self._task = asyncio.create_task(self._poll())
+        return [self._lines[pid] for pid in new_ids if pid in self._lines]
+
+    def unsubscribe(self, queue, player_ids):
+        removed = set(player_ids) & self._clients[queue]
+        self._clients[queue] -= removed
+        self._release(removed)
+
+    def _release(self, player_ids):
+        for pid in player_ids:
+            self._refs[pid] -= 1
+            if self._refs[pid] <= 0:
+                del self._refs[pid]
+                self._lines.pop(pid, None)
+
+    async def _poll(self):
+        loop = asyncio.get_running_loop()
+        while self._refs:
+            try:
+                await self._poll_once(loop)
+            except Exception as ex:
+                log_exceptions(ex)
+            await asyncio.sleep(next_poll(self._schedule, self._interval))
+        self._task = None
+
+    async def _poll_once(self, loop):
+        players_dict = load_players_dict()
+        team_ids = set()
+        for pid in self._refs:
+            player = players_dict.get(pid)
+            if player and player[2]:
+                team_ids.add(player[2])
+        if not team_ids:
+            return
+
+        games = await loop.run_in_executor(executor, self._fetch_games)
+        game_ids = [
+            g["gameId"]
+            for g in games
+            if g["homeTeam"]["teamId"] in team_ids or g["awayTeam"]["teamId"] in team_ids
+        ]
+        boxscores = await asyncio.gather(
+            *(loop.run_in_executor(executor, self._fetch_boxscore, gid) for gid in game_ids)
+        )
+
+        for bs in boxscores:
+            if not bs:
+                continue
+            for team_key in ["homeTeam", "awayTeam"]:
+                team = bs["game"][team_key]
+                for player in team["players"]:
+                    pid = player["personId"]
+                    if pid in self._refs and player["status"] == "ACTIVE":
+                        line = format_player_line(player, team)
+                        if self._lines.get(pid) != line:
+                            self._lines[pid] = line
+                            self._publish(pid, line)
+
+    def _publish(self, player_id, line):
+        message = {"type": "player", "data": line}
+        for queue, player_ids in list(self._clients.items()):
+            if player_id in player_ids:
+                put_dropping_oldest(queue, message)
+
+
+scoreboard_broadcaster = ScoreboardBroadcaster(schedule=scheduler)
+player_stats_hub = PlayerStatsHub(schedule=scheduler)
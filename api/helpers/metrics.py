@@ -0,0 +1,133 @@
+import numpy as np
+from helpers.common import CACHE_TTL, cache
+from isodate import parse_duration
+
+# Raw boxscore statistics loaded into the per-game player matrix
+FIELDS = (
+    "points", "reboundsTotal", "reboundsOffensive", "reboundsDefensive", "assists",
+    "steals", "blocks", "turnovers", "foulsPersonal", "fieldGoalsMade",
+    "fieldGoalsAttempted", "threePointersMade", "freeThrowsMade", "freeThrowsAttempted",
+)
+(PTS, REB, OREB, DREB, AST, STL, BLK, TOV, PF, FGM, FGA, FG3M, FTM, FTA) = range(len(FIELDS))
+
+# Categories counted towards double-doubles / triple-doubles
+DOUBLE_DIGIT_CATEGORIES = (("pts", PTS), ("reb", REB), ("ast", AST), ("stl", STL), ("blk", BLK))
+
+
+def _seconds(minutes) -> int:
+    try:
+        return int(parse_duration(minutes).total_seconds())
+    except Exception:
+        return 0
+
+
+def _ratio(num, den):
+    return np.divide(num, den, out=np.zeros(len(num)), where=den > 0)
+
+
+def compute_metrics(values, seconds, team_index):
+    """Compute every derived metric for a game's players at once.
+
+    `values` is a players x FIELDS matrix, `seconds` the minutes played and
+    `team_index` 0/1 per player (team totals for usage rate are summed from it).
+    Returns a dict of metric name -> array.
+    """
+    v = values.astype(float)
+    fga, fta, tov = v[:, FGA], v[:, FTA], v[:, TOV]
+    ts_denom = 2 * (fga + 0.44 * fta)
+
+    # Usage rate: share of team possessions used while on the floor
+    possessions = fga + 0.44 * fta + tov
+    team_possessions = np.bincount(team_index, weights=possessions, minlength=2)[team_index]
+    team_seconds = np.bincount(team_index, weights=seconds, minlength=2)[team_index]
+    usage = _ratio(100 * possessions * (team_seconds / 5), seconds * team_possessions)
+
+    game_score = (
+        v[:, PTS] + 0.4 * v[:, FGM] - 0.7 * fga - 0.4 * (fta - v[:, FTM])
+        + 0.7 * v[:, OREB] + 0.3 * v[:, DREB] + v[:, STL] + 0.7 * v[:, AST]
+        + 0.7 * v[:, BLK] - 0.4 * v[:, PF] - tov
+    )
+    # Without turnovers the ratio is just the assists
+    ast_tov = np.where(tov > 0, _ratio(v[:, AST], tov), v[:, AST])
+
+    double_digits = values[:, [col for _, col in DOUBLE_DIGIT_CATEGORIES]] >= 10
+
+    return {
+        "fgPct": _ratio(v[:, FGM], fga).round(3),
+        "ftPct": _ratio(v[:, FTM], fta).round(3),
+        "efgPct": _ratio(v[:, FGM] + 0.5 * v[:, FG3M], fga).round(3),
+        "tsPct": _ratio(v[:, PTS], ts_denom).round(3),
+        "gameScore": game_score.round(1),
+        "usgPct": usage.round(1),
+        "astTov": ast_tov.round(2),
+        "doubleDigits": double_digits,
+    }
+
+
+def player_metrics(bs: dict) -> dict:
+    """Metrics of every ACTIVE player in a live BoxScore dict, keyed by person id"""
+    ids, rows, seconds, team_index = [], [], [], []
+    for i, team_key in enumerate(["homeTeam", "awayTeam"]):
+        for player in bs["game"][team_key]["players"]:
+            if player["status"] != "ACTIVE":
+                continue
+            stats = player["statistics"]
+            ids.append(player["personId"])
+            rows.append([stats.get(f, 0) or 0 for f in FIELDS])
+            seconds.append(_seconds(stats.get("minutes")))
+            team_index.append(i)
+    if not ids:
+        return {}
+
+    m = compute_metrics(
+        np.array(rows, dtype=np.int64),
+        np.array(seconds, dtype=float),
+        np.array(team_index, dtype=np.int64),
+    )
+    result = {}
+    for i, pid in enumerate(ids):
+        categories = [name for (name, _), hit in zip(DOUBLE_DIGIT_CATEGORIES, m["doubleDigits"][i]) if hit]
+        result[pid] = {
+            "fgPct": float(m["fgPct"][i]),
+            "ftPct": float(m["ftPct"][i]),
+            "efgPct": float(m["efgPct"][i]),
+            "tsPct": float(m["tsPct"][i]),
+            "gameScore": float(m["gameScore"][i]),
+            "usgPct": float(m["usgPct"][i]),
+            "astTov": float(m["astTov"][i]),
+            "doubleDigitCategories": categories,
+            "isDoubleDouble": len(categories) >= 2,
+            "isTripleDouble": len(categories) >= 3,
+        }
+    return result
+
+
+def _game_state(game: dict):
+    """Cheap game fields only; hashing every player line costs about as much as recomputing"""
+    return (
+        game.get("gameStatus"),
+        game["homeTeam"].get("score"),
+        game["awayTeam"].get("score"),
+        game.get("period"),
+        game.get("gameClock"),
+    )
+
+
+def get_game_metrics(bs: dict) -> dict:
+    """Player metrics for a game, computed once per game state.
+
+    Finished games are computed a single time (at ingestion, or by whichever
+    route sees them first); live games only when their score or clock moved.
+    """
+    game = bs["game"]
+    if not game.get("gameId"):
+        return player_metrics(bs)
+    cache_key = f"game_metrics_{game['gameId']}"
+    state = _game_state(game)
+    entry = cache.get(cache_key)
+    if entry is not None and entry["state"] == state:
+        return entry["metrics"]
+
+    metrics = player_metrics(bs)
+    cache.set(cache_key, {"state": state, "metrics": metrics}, CACHE_TTL["historical"])
+    return metrics
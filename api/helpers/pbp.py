@@ -0,0 +1,212 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from helpers.logger import log_exceptions, logger
+from helpers.store import GAME_STATUS_FINAL
+from isodate import parse_duration
+from nba_api.live.nba.endpoints import boxscore, playbyplay
+
+SYNC_INTERVAL = 60  # seconds between full boxscore cross-checks of a live game
+MAX_GAMES = 32
+
+# Player statistics kept up to date from play-by-play; minutes and plus/minus
+# only move with the full boxscore syncs
+TRACKED_STATS = (
+    "points", "fieldGoalsMade", "fieldGoalsAttempted", "threePointersMade",
+    "threePointersAttempted", "freeThrowsMade", "freeThrowsAttempted",
+    "reboundsTotal", "reboundsOffensive", "reboundsDefensive", "assists",
+    "steals", "blocks", "turnovers", "foulsPersonal",
+)
+
+
+def action_increments(action):
+    """Return [(person_id, stat, amount)] for a single play-by-play action"""
+    kind = action.get("actionType")
+    pid = action.get("personId")
+    made = action.get("shotResult") == "Made"
+
+    if kind in ("2pt", "3pt"):
+        inc = [(pid, "fieldGoalsAttempted", 1)]
+        if kind == "3pt":
+            inc.append((pid, "threePointersAttempted", 1))
+        if made:
+            inc += [(pid, "fieldGoalsMade", 1), (pid, "points", 3 if kind == "3pt" else 2)]
+            if kind == "3pt":
+                inc.append((pid, "threePointersMade", 1))
+            if action.get("assistPersonId"):
+                inc.append((action["assistPersonId"], "assists", 1))
+        return inc
+    if kind == "freethrow":
+        inc = [(pid, "freeThrowsAttempted", 1)]
+        if made:
+            inc += [(pid, "freeThrowsMade", 1), (pid, "points", 1)]
+        return inc
+    if kind == "rebound":
+        side = "reboundsOffensive" if action.get("subType") == "offensive" else "reboundsDefensive"
+        return [(pid, "reboundsTotal", 1), (pid, side, 1)]
+    if kind == "turnover":
+        return [(pid, "turnovers", 1)]
+    if kind == "steal":
+        return [(pid, "steals", 1)]
+    if kind == "block":
+        return [(pid, "blocks", 1)]
+    if kind == "foul" and action.get("subType") != "technical":
+        return [(pid, "foulsPersonal", 1)]
+    return []
+
+
+def game_position(period, clock):
+    """Sortable point in a game from its period and (counting down) clock, or None"""
+    try:
+        return (int(period), -parse_duration(clock).total_seconds())
+    except Exception:
+        return None
+
+
+def _action_points(action):
+    """Combined score after an action, or None when the feed left it blank"""
+    try:
+        return int(action["scoreHome"]) + int(action["scoreAway"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def last_counted_action(actions, game):
+    """Number of the last action a boxscore already counts.
+
+    The CDN boxscore can lag or lead the play-by-play feed, so the feed is
+    walked in order up to the first action past the boxscore: one later on the
+    game clock, or one at the boxscore's clock that took the score past it
+    (free throws and and-ones share a second).
+    """
+    position = game_position(game.get("period"), game.get("gameClock"))
+    points = game["homeTeam"].get("score", 0) + game["awayTeam"].get("score", 0)
+    last = 0
+    for action in sorted(actions, key=lambda a: a.get("orderNumber", a["actionNumber"])):
+        at = game_position(action.get("period"), action.get("clock"))
+        if position is not None and at is not None:
+            if at > position:
+                break
+            scored = _action_points(action)
+            if at == position and scored is not None and scored > points:
+                break
+        last = max(last, action["actionNumber"])
+    return last
+
+
+class LiveBoxScore:
+    """A live BoxScore dict kept current by applying play-by-play actions to it"""
+
+    def __init__(self, bs):
+        # Parsed CDN payloads are shared (see helpers/cdn.py), so work on a copy
+        self.boxscore = copy.deepcopy(bs)
+        self.last_action = 0
+        self.synced = time.time()
+        self._players = {}
+        for team_key in ("homeTeam", "awayTeam"):
+            for player in self.boxscore["game"][team_key]["players"]:
+                self._players[player["personId"]] = player
+
+    @property
+    def is_final(self):
+        return self.boxscore["game"].get("gameStatus") == GAME_STATUS_FINAL
+
+    def apply(self, actions):
+        """Apply actions newer than the last one seen; returns the ids of players whose line changed"""
+        changed = set()
+        game = self.boxscore["game"]
+        for action in sorted(actions, key=lambda a: a["actionNumber"]):
+            if action["actionNumber"] <= self.last_action:
+                continue
+            self.last_action = action["actionNumber"]
+            for pid, stat, amount in action_increments(action):
+                player = self._players.get(pid)
+                if player is not None:
+                    player["statistics"][stat] = player["statistics"].get(stat, 0) + amount
+                    changed.add(pid)
+            if action.get("scoreHome") not in (None, ""):
+                game["homeTeam"]["score"] = int(action["scoreHome"])
+                game["awayTeam"]["score"] = int(action["scoreAway"])
+            if action.get("period"):
+                game["period"] = action["period"]
+            if action.get("clock"):
+                game["gameClock"] = action["clock"]
+        return changed
+
+    def mismatches(self, bs):
+        """Players whose tracked stats differ from a fresh boxscore"""
+        result = []
+        for team_key in ("homeTeam", "awayTeam"):
+            for player in bs["game"][team_key]["players"]:
+                ours = self._players.get(player["personId"])
+                if ours is None:
+                    continue
+                if any(ours["statistics"].get(s) != player["statistics"].get(s) for s in TRACKED_STATS):
+                    result.append(player["personId"])
+        return result
+
+
+def fetch_live_actions(game_id):
+    return playbyplay.PlayByPlay(game_id=game_id).get_dict()["game"]["actions"]
+
+
+def fetch_full_boxscore(game_id):
+    return boxscore.BoxScore(game_id=game_id).get_dict()
+
+
+class LiveGameEngine:
+    """Live boxscores maintained from play-by-play deltas.
+
+    A game is seeded from one full BoxScore fetch; later refreshes read the
+    play-by-play feed and only apply actions past the last action number seen.
+    Every `sync_interval` seconds the state is cross-checked against (and
+    replaced by) a full boxscore, which also picks up minutes, plus/minus and
+    any actions the league edited or deleted.
+    """
+
+    def __init__(self, fetch_boxscore=fetch_full_boxscore, fetch_actions=fetch_live_actions, sync_interval=SYNC_INTERVAL):
+        self._fetch_boxscore = fetch_boxscore
+        self._fetch_actions = fetch_actions
+        self._sync_interval = sync_interval
+        self._games = OrderedDict()  # game id -> LiveBoxScore
+        self._lock = threading.Lock()
+
+    def _sync(self, game_id, state):
+        # Read the feed first: any action logged after it has a higher number
+        # and is applied by the next refresh instead of being skipped
+        actions = self._fetch_actions(game_id)
+        bs = self._fetch_boxscore(game_id)
+        fresh = LiveBoxScore(bs)
+        if not fresh.is_final:
+            # Deltas start right after the last action the boxscore counts
+            fresh.last_action = last_counted_action(actions, bs["game"])
+        if state is not None:
+            drift = state.mismatches(bs)
+            if drift:
+                logger.warning("play-by-play drift in game %s for players %s", game_id, drift)
+        return fresh
+
+    def boxscore(self, game_id):
+        """Current boxscore dict for a game, or None when it cannot be fetched"""
+        try:
+            with self._lock:
+                state = self._games.get(game_id)
+            if state is None or (not state.is_final and time.time() - state.synced >= self._sync_interval):
+                state = self._sync(game_id, state)
+            elif not state.is_final:
+                state.apply(self._fetch_actions(game_id))
+
+            with self._lock:
+                self._games[game_id] = state
+                self._games.move_to_end(game_id)
+                while len(self._games) > MAX_GAMES:
+                    self._games.popitem(last=False)
+            return state.boxscore
+        except Exception as ex:
+            log_exceptions(ex)
+            return None
+
+
+live_engine = LiveGameEngine()
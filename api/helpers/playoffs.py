@@ -0,0 +1,141 @@
+from datetime import datetime, timezone
+
+import numpy as np
+from helpers.events import tracker
+from helpers.scheduler import GAME_LENGTH, scheduler
+from helpers.seeding import results
+from helpers.store import GAME_STATUS_FINAL
+
+N_SIMULATIONS = 10000
+BATCH_SIZE = 2000  # simulations drawn at once, bounds the outcome matrix to a few MB
+HOME_EDGE = 0.24  # log-odds home-court advantage (~56% between equal teams)
+PRIOR_GAMES = 10  # .500 games blended into each record, so early-season records are not taken at face value
+TOP_SEED = 6  # seeds 1-6 are in, 7-10 play-in, the rest out
+PLAY_IN_SEED = 10
+
+GAME_STATUS_SCHEDULED = 1
+REGULAR_SEASON_PREFIX = "002"
+
+
+def is_played(game: dict, now: datetime) -> bool:
+    """Whether a game of the (up to a week old) schedule has been played since it was loaded.
+
+    A game is played once the live scoreboard saw it final or its result is
+    stored; without either, once its window has passed.
+    """
+    status = tracker.status(game["gameId"])
+    if status is not None:
+        return status == GAME_STATUS_FINAL
+    if results.played(game["gameId"]):
+        return True
+    return game["tipOff"] is not None and game["tipOff"] + GAME_LENGTH <= now
+
+
+def get_remaining_games(now: datetime = None):
+    """Get the unplayed regular season games as (home team id, away team id) pairs.
+
+    Read from the scheduler's season schedule. Returns None when the schedule
+    cannot be loaded, so callers can fall back to simulating games remaining
+    against an average opponent.
+    """
+    schedule = scheduler.schedule()
+    if not schedule.known:
+        return None
+    now = now or datetime.now(timezone.utc)
+    results.refresh()
+    return [
+        (g["homeTeamId"], g["awayTeamId"])
+        for g in schedule.games
+        if str(g["gameId"]).startswith(REGULAR_SEASON_PREFIX)
+        and g["gameStatus"] == GAME_STATUS_SCHEDULED
+        and not is_played(g, now)
+    ]
+
+
+def team_strength(wins, losses):
+    """Win probability against an average team, regressed towards .500"""
+    return (wins + PRIOR_GAMES / 2) / (wins + losses + PRIOR_GAMES)
+
+
+def _logit(p):
+    return np.log(p / (1 - p))
+
+
+def home_win_probabilities(strength, home, away):
+    """Log5 win probability of the home side for every game, with home-court edge"""
+    x = _logit(strength[home]) - _logit(strength[away]) + HOME_EDGE
+    return 1 / (1 + np.exp(-x))
+
+
+def _final_wins(wins, strength, remaining, games, size, rng):
+    """Draw `size` seasons of final win totals (simulations x teams)"""
+    if games is None:
+        return wins + rng.binomial(remaining, strength, size=(size, len(wins)))
+
+    home, away = games
+    n_teams = len(wins)
+    if len(home) == 0:
+        return np.broadcast_to(wins, (size, n_teams)).astype(float)
+
+    # Game x team incidence matrices turn per-game outcomes into win totals with two products
+    home_matrix = np.zeros((len(home), n_teams), dtype=np.float32)
+    away_matrix = np.zeros((len(home), n_teams), dtype=np.float32)
+    home_matrix[np.arange(len(home)), home] = 1
+    away_matrix[np.arange(len(home)), away] = 1
+
+    home_won = (rng.random((size, len(home))) < home_win_probabilities(strength, home, away)).astype(np.float32)
+    return wins + home_won @ home_matrix + (1 - home_won) @ away_matrix
+
+
+def simulate_seeding(wins, losses, conferences, remaining, games=None, n_simulations=N_SIMULATIONS, rng=None):
+    """Play out the rest of the season `n_simulations` times.
+
+    `wins`, `losses`, `conferences` and `remaining` are per-team arrays; `games`
+    is an optional (home indices, away indices) pair of the unplayed schedule.
+    Without it every team plays its remaining games against an average
+    opponent. Ties in final wins are broken at random.
+
+    Returns, per team, the probability of each conference seed and the mean
+    final win total.
+    """
+    rng = rng or np.random.default_rng()
+    wins = np.asarray(wins, dtype=float)
+    losses = np.asarray(losses, dtype=float)
+    conferences = np.asarray(conferences)
+    remaining = np.asarray(remaining, dtype=np.int64)
+    strength = team_strength(wins, losses)
+    if games is not None:
+        games = (np.asarray(games[0], dtype=np.int64), np.asarray(games[1], dtype=np.int64))
+
+    groups = [np.flatnonzero(conferences == c) for c in np.unique(conferences)]
+    seed_counts = {tuple(g): np.zeros(len(g) * len(g), dtype=np.int64) for g in groups}
+    win_totals = np.zeros(len(wins))
+
+    done = 0
+    while done < n_simulations:
+        size = min(BATCH_SIZE, n_simulations - done)
+        final = _final_wins(wins, strength, remaining, games, size, rng)
+        win_totals += final.sum(axis=0)
+
+        for group in groups:
+            # Sub-one-win noise only reorders teams tied on wins
+            noisy = final[:, group] + rng.random((size, len(group))) * 0.5
+            order = np.argsort(-noisy, axis=1)
+            seeds = np.argsort(order, axis=1)
+            flat = np.arange(len(group)) * len(group) + seeds
+            seed_counts[tuple(group)] += np.bincount(flat.ravel(), minlength=len(group) * len(group))
+        done += size
+
+    results = [None] * len(wins)
+    for group in groups:
+        probabilities = seed_counts[tuple(group)].reshape(len(group), len(group)) / n_simulations
+        for local, team in enumerate(group):
+            seed_probs = probabilities[local]
+            results[team] = {
+                "seedProbabilities": [round(float(p), 4) for p in seed_probs],
+                "top6": round(float(seed_probs[:TOP_SEED].sum()), 4),
+                "playIn": round(float(seed_probs[TOP_SEED:PLAY_IN_SEED].sum()), 4),
+                "eliminated": round(float(seed_probs[PLAY_IN_SEED:].sum()), 4),
+                "projectedWins": round(float(win_totals[team] / n_simulations), 1),
+            }
+    return results
@@ -0,0 +1,165 @@
+import threading
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from helpers.common import CACHE_TTL, STATS_PROXY, cache, executor
+from helpers.events import tracker
+from helpers.logger import log_exceptions
+from helpers.store import GAME_STATUS_FINAL
+from nba_api.stats.endpoints import scheduleleaguev2
+
+PREGAME = timedelta(minutes=15)  # polling speeds up shortly before the first tip-off
+GAME_LENGTH = timedelta(hours=3)  # games running longer stay live through the event tracker
+LIVE_POLL_INTERVAL = 5  # seconds between upstream polls while games are on
+IDLE_POLL_INTERVAL = 3600  # at most hourly upstream checks between slates
+SCHEDULE_RETRY = 300  # first retry of an unavailable schedule; doubles with each further failure
+SCHEDULE_RETRY_MAX = 21600  # retries back off to at most every 6 hours
+
+
+def fetch_season_schedule():
+    """Every game of the season; tipOff is a UTC datetime, or None while the time is to be determined"""
+    schedule = scheduleleaguev2.ScheduleLeagueV2(proxy=STATS_PROXY).season_games.get_dict()
+    h = {name: i for i, name in enumerate(schedule["headers"])}
+    games = []
+    for row in schedule["data"]:
+        tip_off = row[h["gameDateTimeUTC"]]
+        games.append({
+            "gameId": row[h["gameId"]],
+            "gameDate": row[h["gameDateEst"]][:10],
+            "tipOff": datetime.fromisoformat(tip_off.replace("Z", "+00:00")) if tip_off else None,
+            "gameStatus": row[h["gameStatus"]],
+            "homeTeamId": row[h["homeTeam_teamId"]],
+            "awayTeamId": row[h["awayTeam_teamId"]],
+        })
+    return games
+
+
+class SeasonSchedule:
+    """The season's games and their windows, computed once per schedule load.
+
+    A game's window runs from PREGAME before tip-off to GAME_LENGTH after it;
+    overlapping windows of a day's slate are merged into (start, end, game ids).
+    A schedule that could not be loaded is unknown, and callers poll as if live.
+    """
+
+    def __init__(self, games=None):
+        self.known = games is not None
+        self.games = games or []
+        by_day = defaultdict(list)
+        for game in self.games:
+            if game["tipOff"] is not None:
+                tip_off = game["tipOff"]
+                by_day[game["gameDate"]].append((tip_off - PREGAME, tip_off + GAME_LENGTH, game["gameId"]))
+
+        self.days = {}
+        for game_date, windows in by_day.items():
+            merged = []
+            for start, end, game_id in sorted(windows):
+                if merged and start <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], end)
+                    merged[-1][2].add(game_id)
+                else:
+                    merged.append([start, end, {game_id}])
+            self.days[game_date] = [tuple(w) for w in merged]
+        self.windows = sorted((w for windows in self.days.values() for w in windows), key=lambda w: w[0])
+        self._starts = [w[0] for w in self.windows]
+
+    def day_windows(self, game_date: str):
+        """A game date's (start, end) windows"""
+        return [(start, end) for start, end, _ in self.days.get(game_date, [])]
+
+    def window_at(self, now: datetime):
+        """The window containing now, or None"""
+        i = bisect_right(self._starts, now) - 1
+        if i >= 0 and now < self.windows[i][1]:
+            return self.windows[i]
+        return None
+
+    def next_start(self, now: datetime):
+        """Start of the first window after now, or None once the season is over"""
+        i = bisect_right(self._starts, now)
+        return self._starts[i] if i < len(self._starts) else None
+
+
+class PollingScheduler:
+    """Decides how often live data is polled, from the season schedule.
+
+    Inside a game window polling runs at its live cadence until every game of
+    the window is final; a game the tracker still sees live (overtime, a late
+    tip) keeps it live past the window. Between windows pollers sleep until
+    the next window opens, at most IDLE_POLL_INTERVAL, and cached live data is
+    kept that long instead of its CACHE_TTL.
+    """
+
+    def __init__(self, submit=executor.submit):
+        self._submit = submit
+        self._lock = threading.Lock()
+        self._last = SeasonSchedule(None)  # last good schedule, served while a refresh runs or fails
+        self._refreshing = False
+        self._failures = 0
+
+    def schedule(self) -> SeasonSchedule:
+        """Get the season schedule without waiting on upstream.
+
+        Once the cached copy expires (CACHE_TTL["schedule"]) it is reloaded in
+        the background and the last good schedule is served meanwhile; before
+        the first load the schedule is unknown and callers poll as if live.
+        """
+        schedule = cache.get("season_schedule")
+        if schedule is not None:
+            return schedule
+        with self._lock:
+            start, self._refreshing = not self._refreshing, True
+        if start:
+            # The fetcher is looked up now, not when the worker gets to it
+            self._submit(self.refresh, fetch_season_schedule)
+        return cache.get("season_schedule") or self._last
+
+    def refresh(self, fetch=fetch_season_schedule):
+        """Reload the schedule; failures keep the last good one and back off exponentially"""
+        try:
+            try:
+                schedule, ttl = SeasonSchedule(fetch()), CACHE_TTL["schedule"]
+                self._last, self._failures = schedule, 0
+            except Exception as ex:
+                log_exceptions(ex)
+                self._failures += 1
+                schedule = self._last
+                ttl = min(SCHEDULE_RETRY_MAX, SCHEDULE_RETRY * 2 ** (self._failures - 1))
+            cache.set("season_schedule", schedule, ttl)
+            return schedule
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def is_live(self, now: datetime = None) -> bool:
+        now = now or datetime.now(timezone.utc)
+        schedule = self.schedule()
+        if not schedule.known or tracker.has_live_games():
+            return True
+        window = schedule.window_at(now)
+        return window is not None and not all(tracker.status(gid) == GAME_STATUS_FINAL for gid in window[2])
+
+    def _idle_seconds(self, now: datetime) -> int:
+        next_start = self.schedule().next_start(now)
+        if next_start is None:
+            return IDLE_POLL_INTERVAL
+        return min(IDLE_POLL_INTERVAL, int((next_start - now).total_seconds()))
+
+    def poll_interval(self, now: datetime = None, live_interval: float = LIVE_POLL_INTERVAL) -> float:
+        """Seconds a poller should wait before its next upstream fetch"""
+        now = now or datetime.now(timezone.utc)
+        if self.is_live(now):
+            return live_interval
+        return max(live_interval, self._idle_seconds(now))
+
+    def ttl(self, key: str, now: datetime = None) -> int:
+        """CACHE_TTL[key] while games are live, otherwise until the next window (at most an hour)"""
+        now = now or datetime.now(timezone.utc)
+        if self.is_live(now):
+            return CACHE_TTL[key]
+        return max(CACHE_TTL[key], self._idle_seconds(now))
+
+
+scheduler = PollingScheduler()
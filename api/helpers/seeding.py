@@ -0,0 +1,149 @@
+import threading
+from collections import Counter, defaultdict
+
+from helpers.store import get_games_since
+from nba_api.stats.library.parameters import Season
+
+# Regular season game ids look like 002YYNNNNN, YY being the season's start year
+SEASON_PREFIX = "002" + Season.default[2:4]
+
+
+def _pct(wins, losses):
+    return wins / (wins + losses) if wins + losses else 0.5
+
+
+class GameResults:
+    """Head-to-head wins and point differentials precomputed from stored games.
+
+    The tables are built from the `games` table once and then only read rows
+    added since (by rowid), so each game that goes final is folded in
+    incrementally - including games another worker stored.
+    """
+
+    def __init__(self, season_prefix=SEASON_PREFIX):
+        self.season_prefix = season_prefix
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget every folded-in game, so the next refresh reads the store from the start"""
+        with self._lock:
+            self.wins = defaultdict(Counter)  # team -> Counter(opponent -> wins)
+            self.point_diff = Counter()
+            self._seen = set()
+            self._last_rowid = 0
+
+    def add_game(self, game_id, home_id, away_id, home_score, away_score):
+        if game_id in self._seen or home_score == away_score:
+            return
+        self._seen.add(game_id)
+        winner, loser = (home_id, away_id) if home_score > away_score else (away_id, home_id)
+        self.wins[winner][loser] += 1
+        self.point_diff[home_id] += home_score - away_score
+        self.point_diff[away_id] += away_score - home_score
+
+    def refresh(self, conn=None):
+        """Fold in games stored since the last refresh"""
+        with self._lock:
+            for game in get_games_since(self._last_rowid, self.season_prefix, conn):
+                self.add_game(
+                    game["game_id"], game["home_team_id"], game["away_team_id"],
+                    game["home_score"], game["away_score"],
+                )
+                self._last_rowid = game["rowid"]
+        return self
+
+    def played(self, game_id) -> bool:
+        """Whether a game's result has been folded in"""
+        return game_id in self._seen
+
+    def game_count(self) -> int:
+        """Number of games folded in"""
+        return len(self._seen)
+
+    def record_against(self, team, opponents):
+        """(wins, losses) of a team against a set of opponents"""
+        wins = sum(self.wins[team][o] for o in opponents if o != team)
+        losses = sum(self.wins[o][team] for o in opponents if o != team)
+        return wins, losses
+
+
+class SeedingEngine:
+    """Conference seeding with the NBA tiebreak procedure.
+
+    `records` maps team id -> (wins, losses), real or hypothetical, and `info`
+    maps team id -> (conference, division). Ties are broken by head-to-head,
+    division leadership, division record (same division only), conference
+    record and finally point differential; the steps comparing records against
+    playoff-eligible teams are not applied. Whenever a step splits the tied
+    teams, each remaining sub-group goes through the procedure again.
+    """
+
+    def __init__(self, results, records, info):
+        self.results = results
+        self.records = records
+        self.info = info
+        self._division_leaders = None
+
+    def _members(self, index, value):
+        return {t for t, i in self.info.items() if i[index] == value}
+
+    def _head_to_head(self, team, tied):
+        return _pct(*self.results.record_against(team, tied))
+
+    def _division_leader(self, team, tied):
+        if self._division_leaders is None:
+            self._division_leaders = set()
+            for division in {i[1] for i in self.info.values()}:
+                ordered = self._order(self._members(1, division), with_leaders=False)
+                self._division_leaders.add(ordered[0])
+        return 1 if team in self._division_leaders else 0
+
+    def _division_record(self, team, tied):
+        if len({self.info[t][1] for t in tied}) > 1:
+            return 0
+        return _pct(*self.results.record_against(team, self._members(1, self.info[team][1])))
+
+    def _conference_record(self, team, tied):
+        return _pct(*self.results.record_against(team, self._members(0, self.info[team][0])))
+
+    def _point_differential(self, team, tied):
+        return self.results.point_diff[team]
+
+    def _criteria(self, tied, with_leaders):
+        if len(tied) == 2:
+            steps = [self._head_to_head, self._division_leader]
+        else:
+            steps = [self._division_leader, self._head_to_head]
+        if not with_leaders:
+            steps.remove(self._division_leader)
+        return steps + [self._division_record, self._conference_record, self._point_differential]
+
+    def _break_tie(self, tied, with_leaders):
+        if len(tied) == 1:
+            return list(tied)
+        for criterion in self._criteria(tied, with_leaders):
+            scores = {t: criterion(t, tied) for t in tied}
+            if len(set(scores.values())) > 1:
+                ordered = []
+                for score in sorted(set(scores.values()), reverse=True):
+                    ordered += self._break_tie([t for t in tied if scores[t] == score], with_leaders)
+                return ordered
+        # Still tied: the league draws lots, we fall back to team id
+        return sorted(tied)
+
+    def _order(self, teams, with_leaders=True):
+        by_pct = defaultdict(list)
+        for t in teams:
+            by_pct[_pct(*self.records[t])].append(t)
+        ordered = []
+        for pct in sorted(by_pct, reverse=True):
+            ordered += self._break_tie(sorted(by_pct[pct]), with_leaders)
+        return ordered
+
+    def seed_conference(self, conference):
+        """Team ids of a conference in seed order"""
+        return self._order(self._members(0, conference))
+
+
+results = GameResults()
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from helpers.common import cache
+from helpers.league import get_league_season_table, is_qualified
+
+# Per-game averages scaled to 36 minutes, then shooting percentages as they are
+PER_36 = ("points", "rebounds", "assists", "steals", "blocks", "turnovers", "fga", "fg3a", "fta")
+PERCENTAGES = ("fgPct", "fg3Pct", "ftPct")
+FEATURES = PER_36 + PERCENTAGES
+
+MAX_NEIGHBOURS = 25
+REFRESH_HOUR_UTC = 9  # nightly rebuild, once the previous night's games are final
+
+
+class SimilarityIndex:
+    """Nearest neighbours of every qualified player by season stat profile.
+
+    Each player is a vector of per-36 rates and shooting percentages,
+    standardized per feature across the league and scaled to unit length, so a
+    dot product is the cosine similarity. All pairs are scored once when the
+    index is built; a query only reads the precomputed neighbour lists.
+    """
+
+    def __init__(self, players):
+        # Below MIN_MINUTES per game per-36 rates are mostly noise
+        players = [p for p in players if is_qualified(p)]
+        self.players = players
+        self.position = {p["id"]: i for i, p in enumerate(players)}
+        self.per36 = np.array(
+            [[p[f] * 36 / p["minutes"] for f in PER_36] + [p[f] for f in PERCENTAGES] for p in players],
+            dtype=np.float64,
+        ).reshape(-1, len(FEATURES))
+        self.neighbours, self.scores = self._build()
+
+    def _build(self):
+        n = len(self.players)
+        k = min(MAX_NEIGHBOURS, n - 1)
+        if k < 1:
+            return np.empty((n, 0), dtype=np.int64), np.empty((n, 0))
+
+        std = self.per36.std(axis=0)
+        z = (self.per36 - self.per36.mean(axis=0)) / np.where(std > 0, std, 1)
+        norms = np.linalg.norm(z, axis=1, keepdims=True)
+        unit = z / np.where(norms > 0, norms, 1)
+
+        similarity = unit @ unit.T
+        np.fill_diagonal(similarity, -np.inf)
+        # Top k per row without a full sort, then order just those k
+        top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(similarity, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def __contains__(self, player_id):
+        return player_id in self.position
+
+    def per36_stats(self, i: int) -> dict:
+        return {f: round(float(v), 1) for f, v in zip(FEATURES, self.per36[i])}
+
+    def similar(self, player_id: int, k: int = 10):
+        """The k most similar players, most similar first"""
+        i = self.position[player_id]
+        result = []
+        for j, score in zip(self.neighbours[i, :k], self.scores[i, :k]):
+            p = self.players[j]
+            result.append({
+                "id": p["id"],
+                "name": p["name"],
+                "team": p["team"],
+                "similarity": round(float(score), 3),
+                "per36": self.per36_stats(j),
+            })
+        return result
+
+
+def seconds_until_refresh(now: datetime = None) -> int:
+    """Seconds until the next nightly rebuild at REFRESH_HOUR_UTC"""
+    now = now or datetime.now(timezone.utc)
+    refresh = now.replace(hour=REFRESH_HOUR_UTC, minute=0, second=0, microsecond=0)
+    if refresh <= now:
+        refresh += timedelta(days=1)
+    return int((refresh - now).total_seconds())
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """Get the cached index, rebuilt nightly from the league season table"""
+    index = cache.get("similarity_index")
+    if index is None:
+        index = SimilarityIndex(get_league_season_table().values())
+        cache.set("similarity_index", index, seconds_until_refresh())
+    return index
@@ -0,0 +1,177 @@
+import threading
+
+from helpers.common import STATS_PROXY, cache
+from helpers.logger import log_exceptions
+from helpers.seeding import SEASON_PREFIX, SeedingEngine
+from helpers.seeding import results as seeding_results
+from helpers.store import get_team_results
+from nba_api.stats.endpoints import leaguestandings
+
+SNAPSHOT_KEY = "standings_snapshot"
+_lock = threading.Lock()
+
+
+def _parse_record(record: str):
+    try:
+        wins, losses = (record or "0-0").split("-")
+        return int(wins), int(losses)
+    except ValueError:
+        return 0, 0
+
+
+def _bump_record(record: str, won: bool) -> str:
+    wins, losses = _parse_record(record)
+    return f"{wins + won}-{losses + (not won)}"
+
+
+def _bump_streak(streak: str, won: bool) -> str:
+    """Extend or restart a 'W3' / 'L 2' style streak"""
+    letter = "W" if won else "L"
+    streak = (streak or "").strip()
+    separator = " " if " " in streak else ""
+    if streak[:1] == letter and streak[1:].strip().isdigit():
+        return f"{letter}{separator}{int(streak[1:].strip()) + 1}"
+    return f"{letter}{separator}1"
+
+
+def snapshot_from_rows(rows):
+    """Turn LeagueStandings rows into {team id: standings record}"""
+    teams = {}
+    for team in rows:
+        # Indices based on API headers:
+        # 2=TeamID, 4=TeamName, 5=Conference, 7=PlayoffRank, 9=Division, 12=WINS, 13=LOSSES,
+        # 14=WinPCT, 17=HOME, 18=ROAD, 19=L10, 36=strCurrentStreak, 37=ConferenceGamesBack
+        win_pct = team[14] if team[14] is not None else 0
+        teams[team[2]] = {
+            "rank": team[7] or 0,
+            "name": f"{team[3]} {team[4]}" or "",
+            "tricode": (team[3] or "")[:3].upper(),  # TeamCity -> tricode
+            "wins": team[12] or 0,
+            "losses": team[13] or 0,
+            "winPct": round(win_pct, 3) if win_pct else 0,
+            "gamesBack": team[37] if team[37] is not None else "-",
+            "streak": team[36] or "-",
+            "last10": team[19] or "0-0",
+            "homeRecord": team[17] or "0-0",
+            "awayRecord": team[18] or "0-0",
+            "conference": team[5],
+            "division": team[9],
+        }
+    return teams
+
+
+def get_snapshot():
+    """Standings state: the last LeagueStandings pull plus finals applied since.
+
+    The upstream pull is repeated on a TTL learned from how often the pulled
+    rows change, within CACHE_TTL_BOUNDS["standings_reconcile"]; each pull
+    also corrects anything the incremental updates missed.
+    """
+    state = cache.get(SNAPSHOT_KEY)
+    if state is None:
+        rows = leaguestandings.LeagueStandings(proxy=STATS_PROXY).get_dict()["resultSets"][0]["rowSet"]
+        state = {"teams": snapshot_from_rows(rows), "changed": set(), "formatted": None}
+        cache.set_adaptive(SNAPSHOT_KEY, state, "standings_reconcile", content=rows)
+    return state
+
+
+def _last10(team_id, game_id, won, current):
+    """Recompute L10 from stored results; keep the current value when history is short"""
+    try:
+        stored = [r for gid, r in get_team_results(team_id, 10, SEASON_PREFIX) if gid != game_id][:9]
+    except Exception as ex:
+        log_exceptions(ex)
+        return current
+    if len(stored) < 9:
+        return current
+    results = [won] + stored
+    return f"{sum(results)}-{len(results) - sum(results)}"
+
+
+def apply_final_game(game):
+    """Fold a final live-scoreboard game into the standings.
+
+    The scoreboard reports each team's record including the game, so a team is
+    only updated while our record is behind it; repeated polls of the same
+    final and snapshots that already count it are no-ops.
+    """
+    state = cache.get(SNAPSHOT_KEY)
+    if state is None:
+        return False
+
+    home, away = game["homeTeam"], game["awayTeam"]
+    if home["score"] == away["score"]:
+        return False
+
+    updated = False
+    with _lock:
+        for team, opponent, is_home in ((home, away, True), (away, home, False)):
+            record = state["teams"].get(team["teamId"])
+            wins, losses = team.get("wins"), team.get("losses")
+            if record is None or wins is None or losses is None:
+                continue
+            if wins + losses <= record["wins"] + record["losses"]:
+                continue
+
+            won = team["score"] > opponent["score"]
+            record["wins"], record["losses"] = wins, losses
+            record["winPct"] = round(wins / (wins + losses), 3)
+            side = "homeRecord" if is_home else "awayRecord"
+            record[side] = _bump_record(record[side], won)
+            record["streak"] = _bump_streak(record["streak"], won)
+            record["last10"] = _last10(team["teamId"], game["gameId"], won, record["last10"])
+            state["changed"].add(record["conference"])
+            updated = True
+        if updated:
+            state["formatted"] = None
+    return updated
+
+
+def apply_final_games(games):
+    return [g["gameId"] for g in games if apply_final_game(g)]
+
+
+def _rerank(teams, conference):
+    """Re-rank a conference after live updates and recompute games back.
+
+    Seeding tiebreakers need every final game's result, so while the stored
+    results cover fewer games than the records count, the official
+    PlayoffRank is kept and only games back is recomputed.
+    """
+    try:
+        seeding_results.refresh()
+    except Exception as ex:
+        log_exceptions(ex)
+    members = [tid for tid, t in teams.items() if t["conference"] == conference]
+    if seeding_results.game_count() >= sum(t["wins"] for t in teams.values()):
+        engine = SeedingEngine(
+            seeding_results,
+            {tid: (t["wins"], t["losses"]) for tid, t in teams.items()},
+            {tid: (t["conference"], t["division"]) for tid, t in teams.items()},
+        )
+        for rank, tid in enumerate(engine.seed_conference(conference), 1):
+            teams[tid]["rank"] = rank
+    leader = max((teams[tid] for tid in members), key=lambda t: t["wins"] - t["losses"])
+    for tid in members:
+        team = teams[tid]
+        back = ((leader["wins"] - team["wins"]) + (team["losses"] - leader["losses"])) / 2
+        team["gamesBack"] = back if back else "-"
+
+
+def get_live_standings():
+    """Standings by conference, current as of the latest final seen on the scoreboard"""
+    state = get_snapshot()
+    with _lock:
+        if state["formatted"] is None:
+            for conference in state["changed"]:
+                _rerank(state["teams"], conference)
+            state["changed"] = set()
+
+            east, west = [], []
+            for team in state["teams"].values():
+                team_data = {k: v for k, v in team.items() if k not in ("conference", "division")}
+                (east if team["conference"] == "East" else west).append(team_data)
+            east.sort(key=lambda x: x["rank"] or 99)
+            west.sort(key=lambda x: x["rank"] or 99)
+            state["formatted"] = {"east": east, "west": west}
+        return state["formatted"]
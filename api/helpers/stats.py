@@ -5,7 +5,8 @@ from zoneinfo import ZoneInfo
 
 from helpers.common import STATS_PROXY
 from helpers.logger import log_exceptions
-from nba_api.stats.endpoints import boxscoretraditionalv3, scoreboardv3
+from isodate import parse_duration
+from nba_api.stats.endpoints import scoreboardv3
 
 PLAYERS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../static/players_with_teamid.json")
 
@@ -100,86 +101,67 @@ def get_games_list(days_offset: int = 1):
     return list(set(g_dict))
 
 
-def get_games_leaders_list(days_offset: int = 1):
-    """Get games with their leaders"""
-    g_dict = {}
-    target_date = date.today() - timedelta(days=days_offset)
+def format_scoreboard_game(game):
+    """Format a live ScoreBoard game with both teams' scores and leading scorers"""
+    home_team = game["homeTeam"]
+    away_team = game["awayTeam"]
+    home_leaders = game["gameLeaders"]["homeLeaders"]
+    away_leaders = game["gameLeaders"]["awayLeaders"]
+
+    status_text = game["gameStatusText"]
+    if "ET" in status_text:
+        status_text = convert_et_to_cet(status_text)
+
+    return {
+        "gameId": game["gameId"],
+        "status": status_text,
+        "homeTeam": {
+            "name": "{} {}".format(home_team["teamCity"], home_team["teamName"]),
+            "tricode": home_team["teamTricode"],
+            "score": home_team["score"],
+            "leader": {
+                "name": fix_encoding(home_leaders["name"]) if home_leaders["name"] else "",
+                "points": home_leaders["points"],
+                "rebounds": home_leaders["rebounds"],
+                "assists": home_leaders["assists"],
+            },
+        },
+        "awayTeam": {
+            "name": "{} {}".format(away_team["teamCity"], away_team["teamName"]),
+            "tricode": away_team["teamTricode"],
+            "score": away_team["score"],
+            "leader": {
+                "name": fix_encoding(away_leaders["name"]) if away_leaders["name"] else "",
+                "points": away_leaders["points"],
+                "rebounds": away_leaders["rebounds"],
+                "assists": away_leaders["assists"],
+            },
+        },
+    }
+
+
+def format_player_line(player, team):
+    """Format a live BoxScore player's stat line (used by the player tracker)"""
+    stats = player["statistics"]
     try:
-        sb = scoreboardv3.ScoreboardV3(
-            game_date=target_date.strftime("%Y-%m-%d"),
-            proxy=STATS_PROXY,
-        )
-        games = sb.game_header.get_dict()
-        leaders = sb.game_leaders.get_dict()
-
-        # Get game IDs
-        for g in games["data"]:
-            if g[2] > 1:
-                game_id = g[0]
-                g_dict[game_id] = []
-
-        for ld in leaders["data"]:
-            game_id = ld[0]
-            if game_id in g_dict:
-                team_id = ld[1]
-                pts_player = fix_encoding(ld[4])
-                pts = ld[9]
-                reb = ld[10]
-                ast = ld[11]
-                g_dict[game_id].append([pts_player, pts, reb, ast, team_id])
+        minutes = reformat_player_minutes(int(parse_duration(stats["minutes"]).total_seconds()))
     except Exception as ex:
         log_exceptions(ex)
-        pass
-    return g_dict
-
-def fetch_single_boxscore(game_id, leaders_data):
-    """Fetch boxscore for a single game (for parallel execution)"""
-    game_box = {}
-    try:
-        bs_stats = boxscoretraditionalv3.BoxScoreTraditionalV3(
-            game_id=game_id,
-            proxy=STATS_PROXY,
-        )
-
-        team_stats = bs_stats.team_stats.get_dict()["data"]
-        game_box = {"gameId": game_id, "teams": []}
-
-        for i, team in enumerate(team_stats):
-            leader = {"name": "", "points": 0, "rebounds": 0, "assists": 0}
-            team_id = team[1]  # TEAM_ID from boxscore
-            ld = next((leader for leader in leaders_data if len(leader) > 4 and leader[4] == team_id), None)
-            if ld:
-                leader = {
-                    "name": ld[0],
-                    "points": ld[1],
-                    "rebounds": ld[2],
-                    "assists": ld[3],
-                }
-
-            game_box["teams"].append(
-                {
-                    "name": "{} {}".format(team[2], team[3]),
-                    "score": team[-2],
-                    "stats": {
-                        "fg": "{}/{}".format(team[7], team[8]),
-                        "fgPct": team[9],
-                        "threePt": "{}/{}".format(team[10], team[11]),
-                        "threePtPct": team[12],
-                        "ft": "{}/{}".format(team[13], team[14]),
-                        "ftPct": team[15],
-                        "rebounds": team[18],
-                        "offRebounds": team[16],
-                        "assists": team[19],
-                        "steals": team[20],
-                        "blocks": team[21],
-                        "turnovers": team[22],
-                        "fouls": team[23],
-                    },
-                    "leader": leader,
-                }
-            )
-
-        return game_box
-    except Exception:
-        # Ignore exception as the game hasn't started yet (No response from boxscore endpoint for provided gameId)
-        return game_box
\ No newline at end of file
+        minutes = "0:00"
+
+    return {
+        "id": player["personId"],
+        "name": fix_encoding(player["name"]),
+        "team": team["teamTricode"],
+        "minutes": minutes,
+        "points": stats["points"],
+        "threePointers": "{}/{}".format(
+            stats["threePointersMade"],
+            stats["threePointersAttempted"],
+        ),
+        "rebounds": stats["reboundsTotal"],
+        "assists": stats["assists"],
+        "blocks": stats["blocks"],
+        "steals": stats["steals"],
+        "turnovers": stats["turnovers"],
+    }
@@ -0,0 +1,371 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from helpers.common import executor
+from helpers.logger import log_exceptions
+from helpers.metrics import get_game_metrics
+from helpers.stats import fix_encoding
+from isodate import parse_duration
+from nba_api.live.nba.endpoints import boxscore
+
+STATS_DB_FILE = os.environ.get(
+    "STATS_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../data/stats.db"),
+)
+
+GAME_STATUS_FINAL = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    game_date TEXT NOT NULL,
+    home_team_id INTEGER NOT NULL,
+    away_team_id INTEGER NOT NULL,
+    home_score INTEGER NOT NULL,
+    away_score INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS team_games (
+    game_id TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    team_id INTEGER NOT NULL,
+    opponent_id INTEGER NOT NULL,
+    is_home INTEGER NOT NULL,
+    tricode TEXT NOT NULL,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    fgm INTEGER, fga INTEGER, fg3m INTEGER, fg3a INTEGER, ftm INTEGER, fta INTEGER,
+    oreb INTEGER, reb INTEGER, ast INTEGER, stl INTEGER, blk INTEGER, tov INTEGER, pf INTEGER,
+    PRIMARY KEY (game_id, team_id)
+);
+CREATE TABLE IF NOT EXISTS player_games (
+    game_id TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    tricode TEXT NOT NULL,
+    name TEXT NOT NULL,
+    seconds INTEGER NOT NULL,
+    pts INTEGER, reb INTEGER, oreb INTEGER, dreb INTEGER, ast INTEGER, stl INTEGER, blk INTEGER,
+    tov INTEGER, pf INTEGER, fgm INTEGER, fga INTEGER, fg3m INTEGER, fg3a INTEGER, ftm INTEGER,
+    fta INTEGER, plus_minus REAL,
+    ts_pct REAL, efg_pct REAL, game_score REAL, usg_pct REAL, ast_tov REAL,
+    PRIMARY KEY (game_id, player_id)
+);
+CREATE TABLE IF NOT EXISTS archived_dates (
+    game_date TEXT PRIMARY KEY,
+    games INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_games_date ON games (game_date);
+CREATE INDEX IF NOT EXISTS idx_team_games_team ON team_games (team_id, game_date);
+CREATE INDEX IF NOT EXISTS idx_player_games_player ON player_games (player_id, game_date);
+CREATE INDEX IF NOT EXISTS idx_player_games_date ON player_games (game_date);
+"""
+
+PLAYER_COLUMNS = (
+    "game_id", "game_date", "player_id", "team_id", "tricode", "name", "seconds",
+    "pts", "reb", "oreb", "dreb", "ast", "stl", "blk", "tov", "pf",
+    "fgm", "fga", "fg3m", "fg3a", "ftm", "fta", "plus_minus",
+    "ts_pct", "efg_pct", "game_score", "usg_pct", "ast_tov",
+)
+
+# Derived metric columns added after the first release, and their metrics.py names
+METRIC_COLUMNS = {
+    "ts_pct": "tsPct",
+    "efg_pct": "efgPct",
+    "game_score": "gameScore",
+    "usg_pct": "usgPct",
+    "ast_tov": "astTov",
+}
+
+TEAM_COLUMNS = (
+    "game_id", "game_date", "team_id", "opponent_id", "is_home", "tricode", "name", "score",
+    "fgm", "fga", "fg3m", "fg3a", "ftm", "fta", "oreb", "reb", "ast", "stl", "blk", "tov", "pf",
+)
+
+_schema_ready = set()
+_lock = threading.Lock()
+# Game ids known to be stored or currently being fetched, so repeated
+# scoreboard polls neither hit the database nor refetch the same game
+_ingested = set()
+_pending = set()
+
+
+def connect(path: str = None) -> sqlite3.Connection:
+    """Open a connection to the stats database, creating the schema on first use"""
+    path = path or STATS_DB_FILE
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    with _lock:
+        if path not in _schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            _add_missing_columns(conn)
+            _schema_ready.add(path)
+    return conn
+
+
+def _add_missing_columns(conn: sqlite3.Connection):
+    """Bring databases created before the metric columns existed up to date"""
+    existing = {row["name"] for row in conn.execute("PRAGMA table_info(player_games)")}
+    for column in METRIC_COLUMNS:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE player_games ADD COLUMN {column} REAL")
+    conn.commit()
+
+
+@contextmanager
+def _connection(conn: sqlite3.Connection = None):
+    """Use the given connection, or open (and close) a fresh one"""
+    if conn is not None:
+        yield conn
+        return
+    conn = connect()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _player_seconds(minutes: str) -> int:
+    try:
+        return int(parse_duration(minutes).total_seconds())
+    except Exception:
+        return 0
+
+
+def boxscore_rows(bs: dict):
+    """Extract (game, team rows, player rows) from a live BoxScore dict.
+
+    Player rows carry the game's derived metrics, computed (and cached) here once.
+    """
+    game = bs["game"]
+    game_id = game["gameId"]
+    game_date = game.get("gameEt", "")[:10]
+    home, away = game["homeTeam"], game["awayTeam"]
+    metrics = get_game_metrics(bs)
+
+    game_row = {
+        "game_id": game_id,
+        "game_date": game_date,
+        "home_team_id": home["teamId"],
+        "away_team_id": away["teamId"],
+        "home_score": home["score"],
+        "away_score": away["score"],
+    }
+
+    team_rows = []
+    player_rows = []
+    for team, opponent, is_home in ((home, away, 1), (away, home, 0)):
+        ts = team.get("statistics", {})
+        team_rows.append({
+            "game_id": game_id,
+            "game_date": game_date,
+            "team_id": team["teamId"],
+            "opponent_id": opponent["teamId"],
+            "is_home": is_home,
+            "tricode": team["teamTricode"],
+            "name": f"{team['teamCity']} {team['teamName']}",
+            "score": team["score"],
+            "fgm": ts.get("fieldGoalsMade"),
+            "fga": ts.get("fieldGoalsAttempted"),
+            "fg3m": ts.get("threePointersMade"),
+            "fg3a": ts.get("threePointersAttempted"),
+            "ftm": ts.get("freeThrowsMade"),
+            "fta": ts.get("freeThrowsAttempted"),
+            "oreb": ts.get("reboundsOffensive"),
+            "reb": ts.get("reboundsTotal"),
+            "ast": ts.get("assists"),
+            "stl": ts.get("steals"),
+            "blk": ts.get("blocks"),
+            "tov": ts.get("turnovers"),
+            "pf": ts.get("foulsPersonal"),
+        })
+
+        for player in team["players"]:
+            if player["status"] != "ACTIVE":
+                continue
+            stats = player["statistics"]
+            seconds = _player_seconds(stats["minutes"])
+            if seconds == 0:
+                continue
+            player_rows.append({
+                "game_id": game_id,
+                "game_date": game_date,
+                "player_id": player["personId"],
+                "team_id": team["teamId"],
+                "tricode": team["teamTricode"],
+                "name": fix_encoding(player["name"]),
+                "seconds": seconds,
+                "pts": stats["points"],
+                "reb": stats["reboundsTotal"],
+                "oreb": stats["reboundsOffensive"],
+                "dreb": stats["reboundsDefensive"],
+                "ast": stats["assists"],
+                "stl": stats["steals"],
+                "blk": stats["blocks"],
+                "tov": stats["turnovers"],
+                "pf": stats["foulsPersonal"],
+                "fgm": stats["fieldGoalsMade"],
+                "fga": stats["fieldGoalsAttempted"],
+                "fg3m": stats["threePointersMade"],
+                "fg3a": stats["threePointersAttempted"],
+                "ftm": stats["freeThrowsMade"],
+                "fta": stats["freeThrowsAttempted"],
+                "plus_minus": stats.get("plusMinusPoints", 0),
+                **{column: metrics[player["personId"]][key] for column, key in METRIC_COLUMNS.items()},
+            })
+
+    return game_row, team_rows, player_rows
+
+
+def _insert_sql(table, columns):
+    placeholders = ", ".join(f":{c}" for c in columns)
+    return f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+def ingest_boxscore(bs: dict, conn: sqlite3.Connection = None) -> bool:
+    """Store a final game's team and player rows; returns False for unfinished games"""
+    if bs["game"].get("gameStatus") != GAME_STATUS_FINAL:
+        return False
+
+    game_row, team_rows, player_rows = boxscore_rows(bs)
+    with _connection(conn) as db, db:
+        db.execute(_insert_sql("games", tuple(game_row)), game_row)
+        db.executemany(_insert_sql("team_games", TEAM_COLUMNS), team_rows)
+        db.executemany(_insert_sql("player_games", PLAYER_COLUMNS), player_rows)
+    _ingested.add(game_row["game_id"])
+    return True
+
+
+def is_ingested(game_id: str, conn: sqlite3.Connection = None) -> bool:
+    if game_id in _ingested:
+        return True
+    with _connection(conn) as db:
+        found = db.execute("SELECT 1 FROM games WHERE game_id = ?", (game_id,)).fetchone() is not None
+    if found:
+        _ingested.add(game_id)
+    return found
+
+
+def ingest_game(game_id: str) -> bool:
+    """Fetch and store a single game if it is final and not stored yet"""
+    try:
+        if is_ingested(game_id):
+            return False
+        return ingest_boxscore(boxscore.BoxScore(game_id=game_id).get_dict())
+    except Exception as ex:
+        log_exceptions(ex)
+        return False
+    finally:
+        _pending.discard(game_id)
+
+
+def schedule_ingest(game_ids):
+    """Queue background ingestion for final games that are not stored or in flight yet"""
+    with _lock:
+        new_ids = [gid for gid in dict.fromkeys(game_ids) if gid not in _ingested and gid not in _pending]
+        _pending.update(new_ids)
+    for gid in new_ids:
+        executor.submit(ingest_game, gid)
+    return new_ids
+
+
+def get_player_last_n_games(player_id: int, n: int, conn: sqlite3.Connection = None):
+    """Get a player's last n stored games, newest first"""
+    with _connection(conn) as db:
+        rows = db.execute(
+            "SELECT * FROM player_games WHERE player_id = ? ORDER BY game_date DESC LIMIT ?",
+            (player_id, n),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def get_player_seconds(player_id: int, game_ids, conn: sqlite3.Connection = None):
+    """Get a player's exact seconds played in stored games, as {game id: seconds}"""
+    game_ids = list(game_ids)
+    if not game_ids:
+        return {}
+    with _connection(conn) as db:
+        rows = db.execute(
+            f"SELECT game_id, seconds FROM player_games WHERE player_id = ? AND game_id IN ({','.join('?' * len(game_ids))})",
+            (player_id, *game_ids),
+        ).fetchall()
+    return {r["game_id"]: r["seconds"] for r in rows}
+
+
+def get_player_lines_on(game_date: str, conn: sqlite3.Connection = None):
+    """Get every stored player line for a date (YYYY-MM-DD)"""
+    return get_rows_between("player_games", game_date, game_date, conn)
+
+
+def get_rows_between(table: str, start: str, end: str, conn: sqlite3.Connection = None):
+    """Get the rows of games, team_games or player_games dated start..end (inclusive)"""
+    if table not in ("games", "team_games", "player_games"):
+        raise ValueError(f"Unknown table {table}")
+    with _connection(conn) as db:
+        rows = db.execute(
+            f"SELECT * FROM {table} WHERE game_date BETWEEN ? AND ? ORDER BY game_date, game_id",
+            (start, end),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def mark_date_archived(game_date: str, games: int, conn: sqlite3.Connection = None):
+    """Record that every game of a date is stored"""
+    with _connection(conn) as db, db:
+        db.execute("INSERT OR REPLACE INTO archived_dates VALUES (?, ?)", (game_date, games))
+
+
+def get_archived_dates(start: str, end: str, conn: sqlite3.Connection = None):
+    """Get the fully archived dates between start and end (inclusive)"""
+    with _connection(conn) as db:
+        rows = db.execute(
+            "SELECT game_date FROM archived_dates WHERE game_date BETWEEN ? AND ? ORDER BY game_date",
+            (start, end),
+        ).fetchall()
+    return [r["game_date"] for r in rows]
+
+
+def get_games_since(rowid: int, game_id_prefix: str = "", conn: sqlite3.Connection = None):
+    """Get stored games added after `rowid` (oldest first), optionally only ids with a prefix"""
+    with _connection(conn) as db:
+        rows = db.execute(
+            "SELECT rowid, * FROM games WHERE rowid > ? AND game_id LIKE ? ORDER BY rowid",
+            (rowid, game_id_prefix + "%"),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def get_team_results(team_id: int, n: int, game_id_prefix: str = "", conn: sqlite3.Connection = None):
+    """Get a team's last n stored results as (game_id, won) pairs, newest first"""
+    with _connection(conn) as db:
+        rows = db.execute(
+            "SELECT t.game_id, t.score > o.score AS won FROM team_games t "
+            "JOIN team_games o ON o.game_id = t.game_id AND o.team_id = t.opponent_id "
+            "WHERE t.team_id = ? AND t.game_id LIKE ? ORDER BY t.game_date DESC LIMIT ?",
+            (team_id, game_id_prefix + "%", n),
+        ).fetchall()
+    return [(r["game_id"], bool(r["won"])) for r in rows]
+
+
+def get_player_lines_since(rowid: int, game_id_prefix: str = "", conn: sqlite3.Connection = None):
+    """Get player lines stored after `rowid` (oldest first), optionally only game ids with a prefix"""
+    with _connection(conn) as db:
+        rows = db.execute(
+            "SELECT rowid, * FROM player_games WHERE rowid > ? AND game_id LIKE ? ORDER BY rowid",
+            (rowid, game_id_prefix + "%"),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def get_player_history(player_id: int, game_id_prefix: str = "", conn: sqlite3.Connection = None):
+    """Get every stored line of a player in game order, optionally only game ids with a prefix"""
+    with _connection(conn) as db:
+        rows = db.execute(
+            "SELECT * FROM player_games WHERE player_id = ? AND game_id LIKE ? ORDER BY game_date, game_id",
+            (player_id, game_id_prefix + "%"),
+        ).fetchall()
+    return [dict(r) for r in rows]
@@ -0,0 +1,156 @@
+import threading
+
+from helpers.metrics import DOUBLE_DIGIT_CATEGORIES
+from helpers.seeding import SEASON_PREFIX
+from helpers.store import get_player_history, get_player_lines_since
+
+# streak key -> (label, rule); a rule is (column, minimum) or a number of double-digit categories
+STREAKS = {
+    "pts20": ("20+ points", ("pts", 20)),
+    "pts30": ("30+ points", ("pts", 30)),
+    "pts40": ("40+ points", ("pts", 40)),
+    "reb10": ("10+ rebounds", ("reb", 10)),
+    "ast10": ("10+ assists", ("ast", 10)),
+    "fg3m3": ("3+ threes", ("fg3m", 3)),
+    "stocks3": ("3+ steals and blocks", (("stl", "blk"), 3)),
+    "doubleDouble": ("Double-doubles", 2),
+    "tripleDouble": ("Triple-doubles", 3),
+}
+
+
+def qualifies(line: dict, rule) -> bool:
+    """Whether a stored player line meets a streak rule"""
+    if isinstance(rule, int):
+        return sum((line[name] or 0) >= 10 for name, _ in DOUBLE_DIGIT_CATEGORIES) >= rule
+    columns, minimum = rule
+    if isinstance(columns, str):
+        columns = (columns,)
+    return sum(line[c] or 0 for c in columns) >= minimum
+
+
+class PlayerStreaks:
+    """Running streak counters of one player, one entry per STREAKS key"""
+
+    __slots__ = ("name", "team", "last", "games", "counters")
+
+    def __init__(self):
+        self.name = ""
+        self.team = ""
+        self.last = ("", "")  # (game date, game id) of the latest game applied
+        self.games = 0
+        # key -> [current, current since, best, best from, best to, qualifying games]
+        self.counters = {key: [0, None, 0, None, None, 0] for key in STREAKS}
+
+    def add(self, line: dict):
+        """Apply the player's next game in O(1) per streak"""
+        self.name, self.team = line["name"], line["tricode"]
+        self.last = (line["game_date"], line["game_id"])
+        self.games += 1
+        for key, (_, rule) in STREAKS.items():
+            c = self.counters[key]
+            if not qualifies(line, rule):
+                c[0], c[1] = 0, None
+                continue
+            c[0] += 1
+            c[5] += 1
+            if c[0] == 1:
+                c[1] = line["game_date"]
+            if c[0] > c[2]:
+                c[2], c[3], c[4] = c[0], c[1], line["game_date"]
+
+    def to_dict(self, key: str) -> dict:
+        current, since, best, best_from, best_to, total = self.counters[key]
+        return {
+            "current": current,
+            "since": since,
+            "best": best,
+            "bestFrom": best_from,
+            "bestTo": best_to,
+            "games": total,
+        }
+
+
+class StreakTracker:
+    """Streaks and qualifying-game counts of every player, maintained incrementally.
+
+    Like seeding.GameResults, the tracker only reads player lines stored since
+    its last refresh (by rowid), so each finished game costs O(1) per streak
+    and requests never rescan the season. A line older than a player's latest
+    applied game (a backfilled date) rebuilds just that player from the store.
+    Players who did not play (no seconds) neither extend nor break streaks.
+    Reads take the same lock as refresh, which mutates counters in place.
+    """
+
+    def __init__(self, season_prefix=SEASON_PREFIX):
+        self.season_prefix = season_prefix
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget every applied line, so the next refresh reads the store from the start"""
+        with self._lock:
+            self.players = {}  # player id -> PlayerStreaks
+            self._last_rowid = 0
+
+    def add_line(self, line: dict) -> bool:
+        """Apply a line in game order; returns False if it arrived out of order"""
+        if not line["seconds"]:
+            return True
+        player = self.players.get(line["player_id"])
+        if player is None:
+            player = self.players[line["player_id"]] = PlayerStreaks()
+        key = (line["game_date"], line["game_id"])
+        if key == player.last:
+            return True
+        if key < player.last:
+            return False
+        player.add(line)
+        return True
+
+    def _rebuild(self, player_id, conn=None):
+        self.players.pop(player_id, None)
+        for line in get_player_history(player_id, self.season_prefix, conn):
+            self.add_line(line)
+
+    def refresh(self, conn=None):
+        """Fold in player lines stored since the last refresh"""
+        with self._lock:
+            stale = set()
+            for line in get_player_lines_since(self._last_rowid, self.season_prefix, conn):
+                if not self.add_line(line):
+                    stale.add(line["player_id"])
+                self._last_rowid = line["rowid"]
+            for player_id in stale:
+                self._rebuild(player_id, conn)
+        return self
+
+    def leaders(self, key: str, active: bool = True, top: int = 10, min_length: int = 2):
+        """Longest current (or season best) streaks of a kind, longest first"""
+        index = 0 if active else 2
+        with self._lock:
+            rows = [
+                (pid, p) for pid, p in self.players.items()
+                if p.counters[key][index] >= min_length
+            ]
+            rows.sort(key=lambda r: (-r[1].counters[key][index], -r[1].counters[key][5], r[1].name))
+            return [
+                {"id": pid, "name": p.name, "team": p.team, **p.to_dict(key)}
+                for pid, p in rows[:top]
+            ]
+
+    def player(self, player_id: int):
+        """Every streak of one player, or None if they have no stored games"""
+        with self._lock:
+            p = self.players.get(player_id)
+            if p is None:
+                return None
+            return {
+                "id": player_id,
+                "name": p.name,
+                "team": p.team,
+                "gamesPlayed": p.games,
+                "streaks": {key: {"label": label, **p.to_dict(key)} for key, (label, _) in STREAKS.items()},
+            }
+
+
+streaks = StreakTracker()
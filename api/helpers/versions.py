@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+
+MAX_VERSIONS = 10  # retained versions per document a client can diff against
+MAX_DOCUMENTS = 64  # least recently updated documents are forgotten beyond this
+
+
+def _escape(key) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def json_diff(old, new, path=""):
+    """Return JSON-patch style operations turning `old` into `new`.
+
+    Dicts are diffed per key and equal-length lists per index; anything else
+    that differs is replaced wholesale.
+    """
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+            else:
+                ops.extend(json_diff(old[key], value, f"{path}/{_escape(key)}"))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for i, (a, b) in enumerate(zip(old, new)):
+            ops.extend(json_diff(a, b, f"{path}/{i}"))
+        return ops
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+class VersionStore:
+    """Recent versions of named JSON documents, for `?since=<version>` delta responses.
+
+    A new version is minted only when a document's content changes. Versions are
+    millisecond timestamps (bumped to stay strictly increasing), so they stay
+    roughly comparable across uvicorn workers; a base version a worker does not
+    hold simply gets the full document.
+    """
+
+    def __init__(self, max_versions=MAX_VERSIONS, max_documents=MAX_DOCUMENTS):
+        self._max_versions = max_versions
+        self._max_documents = max_documents
+        self._documents = OrderedDict()  # name -> OrderedDict(version -> document)
+        self._lock = threading.Lock()
+
+    def update(self, name, document) -> int:
+        """Record the document's current content and return its version"""
+        with self._lock:
+            versions = self._documents.get(name)
+            if versions is None:
+                versions = self._documents[name] = OrderedDict()
+            self._documents.move_to_end(name)
+
+            if versions:
+                latest_version, latest = next(reversed(versions.items()))
+                if latest is document or latest == document:
+                    return latest_version
+                version = max(int(time.time() * 1000), latest_version + 1)
+            else:
+                version = int(time.time() * 1000)
+
+            versions[version] = document
+            while len(versions) > self._max_versions:
+                versions.popitem(last=False)
+            while len(self._documents) > self._max_documents:
+                self._documents.popitem(last=False)
+            return version
+
+    def respond(self, name, document, since=None):
+        """Build a response: the full document, or a patch against `since` when retained"""
+        version = self.update(name, document)
+        if since is not None:
+            with self._lock:
+                base = self._documents.get(name, {}).get(since)
+            if base is not None:
+                return {"version": version, "since": since, "patch": json_diff(base, document)}
+        return {**document, "version": version}
+
+
+versions = VersionStore()
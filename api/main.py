@@ -6,6 +6,7 @@ FastAPI backend for live NBA statistics
 import json
 import logging.config
 import os
+from contextlib import asynccontextmanager
 
 import uvicorn
 import yaml
@@ -13,14 +14,32 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
-from helpers.common import CACHE_TTL, cache
+from helpers import cdn
+from helpers.archive import start_backfill
+from helpers.common import CACHE_TTL, cache, executor
 from helpers.stats import get_display_date
+from helpers.streaks import streaks
+from routes.live import router as live_router
 from routes.players import router as players_router
 from routes.scores import router
 from routes.trades import router as trades_router
 from starlette.middleware.gzip import GZipMiddleware
 
+# Fill the historical archive in the background (one worker wins the lock)
+ARCHIVE_BACKFILL = os.environ.get("ARCHIVE_BACKFILL", "0") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if ARCHIVE_BACKFILL: # pragma: no cover
+        start_backfill()
+    # Build the streak counters off the request path; later refreshes are incremental
+    executor.submit(streaks.refresh)
+    yield
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="NBA Stables API",
     description="Live NBA statistics API",
     version="1.1.0",
@@ -39,10 +58,14 @@ app.add_middleware(
 )
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+# Revalidate live cdn.nba.com files instead of re-downloading and re-parsing them
+cdn.install()
+
 # sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 app.include_router(router)
 app.include_router(players_router)
 app.include_router(trades_router)
+app.include_router(live_router)
 
 CBS_INJURIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static/cbs_injuries.json")
 LOG_CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "log_config.yml")
@@ -61,17 +84,18 @@ async def health_check():
 
 @app.get("/api/injuries")
 def get_injuries():
-    """Get NBA injury report from CBS Sports"""
-    cached = cache.get("injuries")
-    if cached:
-        return cached
-
+    """Get NBA injury report from CBS Sports, reloaded whenever the scraper rewrites the file"""
     if not os.path.exists(CBS_INJURIES_FILE):
         raise HTTPException(status_code=503, detail="CBS injuries data not available")
     try:
+        mtime = os.path.getmtime(CBS_INJURIES_FILE)
+        cached = cache.get("injuries")
+        if cached is not None and cached["mtime"] == mtime:
+            return cached["data"]
+
         with open(CBS_INJURIES_FILE, "r", encoding="utf-8") as f:
             result = json.load(f)
-        cache.set("injuries", result, CACHE_TTL["injuries"])
+        cache.set("injuries", {"mtime": mtime, "data": result}, CACHE_TTL["injuries"])
         return result
     except Exception as e: # pragma: no cover
         from helpers.logger import log_exceptions
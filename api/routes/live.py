@@ -0,0 +1,55 @@
+import asyncio
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from helpers.live import player_stats_hub, put_dropping_oldest, scoreboard_broadcaster
+
+router = APIRouter()
+
+
+@router.get("/api/stream/scoreboard")
+async def stream_scoreboard():
+    """Server-Sent Events stream of live scoreboard changes (score, clock, status)"""
+    return StreamingResponse(
+        scoreboard_broadcaster.subscribe(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _parse_ids(ids):
+    if not isinstance(ids, list):
+        return []
+    return [int(pid) for pid in ids if str(pid).strip().isdigit()]
+
+
+@router.websocket("/api/ws/players")
+async def players_socket(websocket: WebSocket):
+    """Push live stat lines for subscribed players.
+
+    Clients send {"subscribe": [ids]} or {"unsubscribe": [ids]}; the server sends
+    {"type": "player", "data": line} whenever a subscribed player's line changes.
+    """
+    await websocket.accept()
+    queue = player_stats_hub.connect()
+
+    async def forward():
+        while True:
+            await websocket.send_json(await queue.get())
+
+    sender = asyncio.create_task(forward())
+    try:
+        while True:
+            message = await websocket.receive_json()
+            if not isinstance(message, dict):
+                continue
+            if "subscribe" in message:
+                for line in player_stats_hub.subscribe(queue, _parse_ids(message["subscribe"])):
+                    put_dropping_oldest(queue, {"type": "player", "data": line})
+            if "unsubscribe" in message:
+                player_stats_hub.unsubscribe(queue, _parse_ids(message["unsubscribe"]))
+    except (WebSocketDisconnect, ValueError):
+        pass
+    finally:
+        sender.cancel()
+        player_stats_hub.disconnect(queue)
@@ -1,24 +1,43 @@
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, Query
 from helpers.common import CACHE_TTL, STATS_PROXY, cache, executor
+from helpers.events import FINAL, PERIOD_END, bus
+from helpers.gamelog import get_player_game_log
+from helpers.league import (
+    MIN_GAMES,
+    MIN_MINUTES,
+    get_league_percentiles,
+    get_league_season_table,
+    season_averages,
+    with_percentiles,
+)
 from helpers.logger import log_exceptions
+from helpers.metrics import get_game_metrics
+from helpers.scheduler import scheduler
+from helpers.similarity import MAX_NEIGHBOURS, get_similarity_index
 from helpers.stats import (
     fix_encoding,
+    format_player_line,
     load_players_dict,
     load_players_file,
     reformat_player_minutes,
 )
+from helpers.store import GAME_STATUS_FINAL, get_player_seconds
+from helpers.streaks import STREAKS, streaks
+from helpers.versions import versions
 from isodate import parse_duration
 from nba_api.live.nba.endpoints import boxscore, scoreboard
-from nba_api.stats.endpoints import (
-    boxscoreadvancedv3,
-    boxscoretraditionalv3,
-    cumestatsteamgames,
-    playercareerstats,
-)
+from nba_api.stats.endpoints import boxscoreadvancedv3, playercareerstats
 
 router = APIRouter()
 
 
+@bus.on(PERIOD_END, FINAL)
+def invalidate_game_players(game):
+    cache.delete(f"game_players_{game['gameId']}")
+
+
 @router.get("/api/players/search")
 def search_players(q: str = Query(..., min_length=2)):
     """Search for players by name"""
@@ -80,31 +99,7 @@ def get_player_stats(ids: str = Query(..., description="Comma-separated player I
                 team = bs["game"][team_key]
                 for player in team["players"]:
                     if player["personId"] in players_ids and player["status"] == "ACTIVE":
-                        stats = player["statistics"]
-                        try:
-                            minutes = reformat_player_minutes(int(parse_duration(stats["minutes"]).total_seconds()))
-                        except Exception as ex:
-                            log_exceptions(ex)
-                            minutes = "0:00"
-
-                        results.append(
-                            {
-                                "id": player["personId"],
-                                "name": fix_encoding(player["name"]),
-                                "team": team["teamTricode"],
-                                "minutes": minutes,
-                                "points": stats["points"],
-                                "threePointers": "{}/{}".format(
-                                    stats["threePointersMade"],
-                                    stats["threePointersAttempted"],
-                                ),
-                                "rebounds": stats["reboundsTotal"],
-                                "assists": stats["assists"],
-                                "blocks": stats["blocks"],
-                                "steals": stats["steals"],
-                                "turnovers": stats["turnovers"],
-                            }
-                        )
+                        results.append(format_player_line(player, team))
 
         return {"players": results}
     except ValueError as err:
@@ -116,8 +111,16 @@ def get_player_stats(ids: str = Query(..., description="Comma-separated player I
 
 
 @router.get("/api/games/{game_id}/players")
-def get_game_players(game_id: str):
+def get_game_players(
+        game_id: str,
+        since: Optional[int] = Query(default=None, description="Return a patch against this version"),
+):
     """Get all player stats for a specific game with advanced metrics"""
+    cache_key = f"game_players_{game_id}"
+    cached = cache.get(cache_key)
+    if cached:
+        return versions.respond(cache_key, cached, since)
+
     try:
         bs = boxscore.BoxScore(game_id=game_id).get_dict()
 
@@ -134,6 +137,7 @@ def get_game_players(game_id: str):
 
         teams = []
         adv_by_pid = {p[6]: p for p in adv_players} if adv_players else {}
+        metrics = get_game_metrics(bs)
 
         for team_key in ["homeTeam", "awayTeam"]:
             team = bs["game"][team_key]
@@ -156,22 +160,17 @@ def get_game_players(game_id: str):
 
                     # Find advanced stats
                     adv_stat = adv_by_pid.get(player["personId"])
+                    m = metrics[player["personId"]]
 
                     fgm = stats["fieldGoalsMade"]
                     fga = stats["fieldGoalsAttempted"]
-                    tpm = stats["threePointersMade"]
-                    fta = stats["freeThrowsAttempted"]
-                    ftm = stats["freeThrowsMade"]
-                    pts = stats["points"]
-
-                    ts_denom = 2 * (fga + 0.44 * fta)
 
                     team_data["players"].append(
                         {
                             "id": player["personId"],
                             "name": fix_encoding(player["name"]),
                             "minutes": minutes,
-                            "points": pts,
+                            "points": stats["points"],
                             "rebounds": stats["reboundsTotal"],
                             "offRebounds": stats["reboundsOffensive"],
                             "defRebounds": stats["reboundsDefensive"],
@@ -181,12 +180,15 @@ def get_game_players(game_id: str):
                             "turnovers": stats["turnovers"],
                             "fouls": stats["foulsPersonal"],
                             "fg": f"{fgm}/{fga}",
-                            "fgPct": round(fgm / fga, 3) if fga > 0 else 0,
-                            "threePt": f"{tpm}/{stats['threePointersAttempted']}",
-                            "ft": f"{ftm}/{fta}",
+                            "fgPct": m["fgPct"],
+                            "threePt": f"{stats['threePointersMade']}/{stats['threePointersAttempted']}",
+                            "ft": f"{stats['freeThrowsMade']}/{stats['freeThrowsAttempted']}",
                             "plusMinus": (adv_stat[14] if adv_stat else stats.get("plusMinusPoints", 0)),
-                            "efgPct": (round((fgm + 0.5 * tpm) / fga, 3) if fga > 0 else 0),
-                            "tsPct": round(pts / ts_denom, 3) if ts_denom > 0 else 0,
+                            "efgPct": m["efgPct"],
+                            "tsPct": m["tsPct"],
+                            "gameScore": m["gameScore"],
+                            "usgPct": m["usgPct"],
+                            "astTov": m["astTov"],
                         }
                     )
 
@@ -194,11 +196,15 @@ def get_game_players(game_id: str):
             team_data["players"].sort(key=lambda x: x["minutes"], reverse=True)
             teams.append(team_data)
 
-        return {
+        result = {
             "gameId": game_id,
             "status": bs["game"]["gameStatusText"],
             "teams": teams,
         }
+        # A final game with its advanced stats in can no longer change
+        done = bs["game"].get("gameStatus") == GAME_STATUS_FINAL and adv_players
+        cache.set(cache_key, result, CACHE_TTL["historical"] if done else scheduler.ttl("player_stats"))
+        return versions.respond(cache_key, result, since)
     except Exception as e:
         log_exceptions(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -210,62 +216,46 @@ def get_last_n_games_stats(
         n: int = Query(default=5, ge=1, le=15),
 ):
     """Get last N games stats for a specific player"""
-    cache_key = f"last_n_games_{player_id}_{n}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-
     try:
         players_dict = load_players_dict()
         player = players_dict.get(player_id)
         if not player:
             raise HTTPException(status_code=404, detail="Player not found")
 
-        team_id = player[2]
         player_name = fix_encoding(player[1])
 
-        cc = cumestatsteamgames.CumeStatsTeamGames(team_id=team_id, proxy=STATS_PROXY)
-        game_rows = cc.cume_stats_team_games.get_dict()["data"][:n]
-
-        def fetch_game_stats(gg):
-            try:
-                csp = boxscoretraditionalv3.BoxScoreTraditionalV3(
-                    game_id=gg[1], proxy=STATS_PROXY
-                )
-                player_stats = csp.player_stats.get_dict()["data"]
-                ss = next((x for x in player_stats if x[6] == player_id), None)
-                if ss is not None and ss[14] != "":
-                    return {
-                        "matchup": gg[0],
-                        "gameId": gg[1],
-                        "minutes": ss[14],
-                        "points": ss[32],
-                        "fg": f"{ss[15]}/{ss[16]}",
-                        "threePointers": f"{ss[18]}/{ss[19]}",
-                        "ft": f"{ss[21]}/{ss[22]}",
-                        "rebounds": ss[26],
-                        "assists": ss[27],
-                        "blocks": ss[28],
-                        "steals": ss[29],
-                        "fouls": ss[31],
-                        "dnp": False,
-                    }
-                else:
-                    return {"matchup": gg[0], "gameId": gg[1], "dnp": True}
-            except Exception as ex:
-                log_exceptions(ex)
-                return None
-
-        futures = [executor.submit(fetch_game_stats, gg) for gg in game_rows]
-        games = [r for f in futures for r in [f.result()] if r is not None]
+        # The game log only has whole minutes; stored boxscore lines have the seconds
+        rows = get_player_game_log(player_id)[:n]
+        try:
+            seconds = get_player_seconds(player_id, [row["Game_ID"] for row in rows])
+        except Exception as ex:
+            log_exceptions(ex)
+            seconds = {}
+
+        games = [
+            {
+                "matchup": row["MATCHUP"],
+                "gameId": row["Game_ID"],
+                "date": row["GAME_DATE"],
+                "minutes": reformat_player_minutes(seconds.get(row["Game_ID"], round((row["MIN"] or 0) * 60))),
+                "points": row["PTS"],
+                "fg": f"{row['FGM']}/{row['FGA']}",
+                "threePointers": f"{row['FG3M']}/{row['FG3A']}",
+                "ft": f"{row['FTM']}/{row['FTA']}",
+                "rebounds": row["REB"],
+                "assists": row["AST"],
+                "blocks": row["BLK"],
+                "steals": row["STL"],
+                "fouls": row["PF"],
+            }
+            for row in rows
+        ]
 
-        result = {
+        return {
             "playerId": player_id,
             "playerName": player_name,
             "games": games,
         }
-        cache.set(cache_key, result, CACHE_TTL["historical"])
-        return result
     except HTTPException:
         raise
     except Exception as e:
@@ -273,9 +263,61 @@ def get_last_n_games_stats(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/api/players/{player_id}/similar")
+def get_similar_players(player_id: int, k: int = Query(default=10, ge=1, le=MAX_NEIGHBOURS)):
+    """Get the players with the most similar per-36 season profile"""
+    try:
+        index = get_similarity_index()
+        if player_id not in index:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Player needs {MIN_GAMES}+ games and {MIN_MINUTES:g}+ minutes per game this season",
+            )
+        player = index.players[index.position[player_id]]
+        return {
+            "playerId": player_id,
+            "playerName": player["name"],
+            "per36": index.per36_stats(index.position[player_id]),
+            "players": index.similar(player_id, k),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_exceptions(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/api/players/season-avg")
+def get_players_season_avg(ids: str = Query(..., description="Comma-separated player IDs")):
+    """Get current season averages for several players from the cached league-wide table, with league percentiles"""
+    try:
+        players_ids = []
+        for pid in ids.split(","):
+            if pid.strip().isdigit():
+                players_ids.append(int(pid.strip()))
+
+        if not players_ids:
+            return {"players": []}
+
+        table = get_league_season_table()
+        percentiles = get_league_percentiles()
+        return {"players": [with_percentiles(table[pid], percentiles) for pid in players_ids if pid in table]}
+    except Exception as e:
+        log_exceptions(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/api/players/{player_id}/season-avg")
 def get_player_season_avg(player_id: int):
-    """Get current season averages for a player"""
+    """Get current season averages for a player, with league percentiles when they played this season"""
+    try:
+        league_row = get_league_season_table().get(player_id)
+        if league_row:
+            return with_percentiles(league_row, get_league_percentiles())
+    except Exception as ex:
+        log_exceptions(ex)
+
+    # Players without a game this season fall back to their latest career season
     cache_key = f"season_avg_{player_id}"
     cached = cache.get(cache_key)
     if cached:
@@ -292,39 +334,41 @@ def get_player_season_avg(player_id: int):
 
         row = rows[-1]
         h = {k: i for i, k in enumerate(headers)}
-        gp = row[h["GP"]] or 1
+        result = season_averages(row, h, row[h["SEASON_ID"]])
 
-        def avg(key):
-            return round((row[h[key]] or 0) / gp, 1)
+        cache.set(cache_key, result, CACHE_TTL["standings"])
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_exceptions(e)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        def pct(key):
-            val = row[h[key]]
-            return round(val * 100, 1) if val else 0.0
 
-        result = {
-            "season": row[h["SEASON_ID"]],
-            "gp": gp,
-            "minutes": avg("MIN"),
-            "points": avg("PTS"),
-            "rebounds": avg("REB"),
-            "assists": avg("AST"),
-            "steals": avg("STL"),
-            "blocks": avg("BLK"),
-            "turnovers": avg("TOV"),
-            "fouls": avg("PF"),
-            "fgm": round((row[h["FGM"]] or 0) / gp, 1),
-            "fga": round((row[h["FGA"]] or 0) / gp, 1),
-            "fgPct": pct("FG_PCT"),
-            "fg3m": round((row[h["FG3M"]] or 0) / gp, 1),
-            "fg3a": round((row[h["FG3A"]] or 0) / gp, 1),
-            "fg3Pct": pct("FG3_PCT"),
-            "ftm": round((row[h["FTM"]] or 0) / gp, 1),
-            "fta": round((row[h["FTA"]] or 0) / gp, 1),
-            "ftPct": pct("FT_PCT"),
+@router.get("/api/streaks")
+def get_streaks(
+    streak: str = Query(default="pts20", description=f"One of {', '.join(STREAKS)}"),
+    active: bool = Query(default=True, description="Current streaks, or season bests when false"),
+    top: int = Query(default=10, ge=1, le=50),
+    min_length: int = Query(default=2, ge=1),
+    player_id: Optional[int] = Query(default=None, description="Every streak of one player instead"),
+):
+    """Get consecutive-game streaks (e.g. 20+ points, double-doubles) from stored games"""
+    if streak not in STREAKS:
+        raise HTTPException(status_code=400, detail=f"Unknown streak {streak}")
+    try:
+        streaks.refresh()
+        if player_id is not None:
+            result = streaks.player(player_id)
+            if result is None:
+                raise HTTPException(status_code=404, detail="No stored games for this player")
+            return result
+        return {
+            "streak": streak,
+            "label": STREAKS[streak][0],
+            "active": active,
+            "players": streaks.leaders(streak, active, top, min_length),
         }
-
-        cache.set(cache_key, result, CACHE_TTL["standings"])
-        return result
     except HTTPException:
         raise
     except Exception as e:
@@ -1,242 +1,261 @@
-from concurrent.futures import as_completed
+from datetime import datetime, timedelta
+from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query
+from helpers.archive import (
+    SEASON_START,
+    display_range,
+    get_archived_boxscores,
+    get_archived_double_doubles,
+    get_archived_table,
+    get_coverage,
+    parse_date_range,
+)
+from helpers.columnar import partition_dates, query_leaders
 from helpers.common import CACHE_TTL, STATS_PROXY, cache, executor
+from helpers.daily import DailyDigest, DailyTable
+from helpers.events import FINAL, GAME_EVENTS, NEW_SLATE, bus, invalidate
+from helpers.fantasy import PROFILES, fantasy_ranking, get_profile, profile_hash
+from helpers.live import build_scoreboard
 from helpers.logger import log_exceptions
+from helpers.metrics import get_game_metrics
+from helpers.playoffs import N_SIMULATIONS, get_remaining_games, simulate_seeding
+from helpers.scheduler import scheduler
+from helpers.seeding import SeedingEngine
+from helpers.seeding import results as seeding_results
+from helpers.standings import get_live_standings
 from helpers.stats import (
-    convert_et_to_cet,
-    fetch_single_boxscore,
     fix_encoding,
     get_display_date,
-    get_games_leaders_list,
     get_games_list,
     load_players_dict,
     reformat_player_minutes,
 )
+from helpers.versions import versions
 from isodate import parse_duration
 from nba_api.live.nba.endpoints import boxscore, scoreboard
 from nba_api.stats.endpoints import boxscoreadvancedv3, leaguestandings
 
 router = APIRouter()
 
+DATE_QUERY = Query(default=None, description="Archived date YYYY-MM-DD or range YYYY-MM-DD..YYYY-MM-DD")
+
+# Caches keyed by day offset (fantasy keys also carry a profile hash)
+DAY_CACHES = ("daily", "daily_table")
+
+
+def invalidate_days(offsets):
+    return invalidate(
+        *(f"{name}_{offset}" for name in DAY_CACHES for offset in offsets),
+        prefixes=tuple(f"fantasy_{offset}_" for offset in offsets),
+    )
+
+
+# Today's caches are recomputed once a game tips off, ends a period or goes final;
+# a new slate moves every day offset to another date
+for _event in GAME_EVENTS:
+    bus.subscribe(_event, invalidate_days([0]))
+bus.subscribe(NEW_SLATE, invalidate_days(range(8)))
+bus.subscribe(FINAL, invalidate("playoffs"))
+
+
+def archived_range(value: str):
+    """Validate a date/range query and return (start, end, response metadata) for archived data"""
+    try:
+        start, end = parse_date_range(value)
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err))
+    dates, missing = get_coverage(start, end)
+    if not dates:
+        raise HTTPException(status_code=404, detail="Not archived yet")
+    return start, end, {"date": display_range(start, end), "dates": dates, "missing": missing}
+
 @router.get("/api/dates")
 def get_date_labels():
     """Return display dates for day offsets 0-7 so the frontend can label date buttons accurately"""
     return {"dates": [get_display_date(i) for i in range(8)]}
 
 @router.get("/api/boxscores")
-def get_boxscores(days_offset: int = Query(default=1, ge=0, le=7)):
-    """Get detailed box scores for games"""
-    cache_key = f"boxscores_{days_offset}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
+def get_boxscores(days_offset: int = Query(default=1, ge=0, le=7), date: Optional[str] = DATE_QUERY):
+    """Get detailed box scores for games (a recent day offset, or archived dates)"""
+    if date is not None:
+        start, end, meta = archived_range(date)
+        return {"boxscores": get_archived_boxscores(start, end), **meta}
 
     try:
-        # Use the helper function to get games with leaders
-        leaders_by_game = get_games_leaders_list(days_offset)
-
-        # Fetch all boxscores in parallel
-        boxscores_list = []
-        futures = {
-            executor.submit(fetch_single_boxscore, game_id, leaders_data): game_id
-            for game_id, leaders_data in leaders_by_game.items()
-            if leaders_data
-        }
-        for future in as_completed(futures):
-            result = future.result()
-            if result:
-                boxscores_list.append(result)
-
-        result = {"boxscores": boxscores_list, "date": get_display_date(days_offset)}
-        ttl = CACHE_TTL["historical"] if days_offset >= 2 else CACHE_TTL["boxscores"]
-        cache.set(cache_key, result, ttl)
-        return result
+        digest = get_daily_digest(days_offset)
+        return {"boxscores": digest.boxscores, "date": get_display_date(days_offset)}
     except Exception as e: # pragma: no cover
         log_exceptions(e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-
-
 @router.get("/api/scoreboard")
-def get_scoreboard():
+def get_scoreboard(since: Optional[int] = Query(default=None, description="Return a patch against this version")):
     """Get live scoreboard with game results and leading scorers"""
     # Check cache first
-    cached = cache.get("scoreboard")
-    if cached: # pragma: no cover
-        return cached
+    result = cache.get("scoreboard")
+    if result:
+        return versions.respond("scoreboard", result, since)
 
     try:
-        games = []
-        for game in scoreboard.ScoreBoard().games.data:
-            home_team = game["homeTeam"]
-            away_team = game["awayTeam"]
-            home_leaders = game["gameLeaders"]["homeLeaders"]
-            away_leaders = game["gameLeaders"]["awayLeaders"]
-
-            status_text = game["gameStatusText"]
-            if "ET" in status_text:
-                status_text = convert_et_to_cet(status_text)
-
-            games.append(
-                {
-                    "gameId": game["gameId"],
-                    "status": status_text,
-                    "homeTeam": {
-                        "name": "{} {}".format(home_team["teamCity"], home_team["teamName"]),
-                        "tricode": home_team["teamTricode"],
-                        "score": home_team["score"],
-                        "leader": {
-                            "name": fix_encoding(home_leaders["name"]) if home_leaders["name"] else "",
-                            "points": home_leaders["points"],
-                            "rebounds": home_leaders["rebounds"],
-                            "assists": home_leaders["assists"],
-                        },
-                    },
-                    "awayTeam": {
-                        "name": "{} {}".format(away_team["teamCity"], away_team["teamName"]),
-                        "tricode": away_team["teamTricode"],
-                        "score": away_team["score"],
-                        "leader": {
-                            "name": fix_encoding(away_leaders["name"]) if away_leaders["name"] else "",
-                            "points": away_leaders["points"],
-                            "rebounds": away_leaders["rebounds"],
-                            "assists": away_leaders["assists"],
-                        },
-                    },
-                }
-            )
-
-        result = {"games": games, "date": get_display_date(0)}
-        cache.set("scoreboard", result, CACHE_TTL["scoreboard"])
-        return result
+        result = build_scoreboard(scoreboard.ScoreBoard().games.data)
+        cache.set("scoreboard", result, scheduler.ttl("scoreboard"))
+        return versions.respond("scoreboard", result, since)
     except Exception as e: # pragma: no cover
         log_exceptions(e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/api/leaders")
-def get_daily_leaders(days_offset: int = Query(default=1, ge=0, le=7)):
-    """Get daily leaders across statistical categories"""
-    cache_key = f"leaders_{days_offset}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
+def get_daily_digest(days_offset: int) -> DailyDigest:
+    """Get (and cache) a day's boxscores, leaders table and double-doubles, built in one pipeline run"""
+    cache_key = f"daily_{days_offset}"
+    digest = cache.get(cache_key)
+    if digest is not None:
+        return digest
 
-    try:
-        # Get game IDs using helper function
-        game_ids = get_games_list(days_offset)
+    game_ids = get_games_list(days_offset)
 
-        all_players = []
+    def fetch_day_boxscore(gid):
+        try:
+            return boxscore.BoxScore(game_id=gid).get_dict()
+        except Exception as ex: # pragma: no cover
+            log_exceptions(ex)
+            return {}
 
-        def fetch_leaders_boxscore(gid):
-            try:
-                return boxscore.BoxScore(game_id=gid).get_dict()
-            except Exception as ex: # pragma: no cover
-                log_exceptions(ex)
-                return {}
+    digest = DailyDigest(executor.map(fetch_day_boxscore, sorted(game_ids)))
+    ttl = CACHE_TTL["historical"] if days_offset >= 2 else scheduler.ttl("boxscores")
+    cache.set(cache_key, digest, ttl)
+    return digest
 
-        results = executor.map(fetch_leaders_boxscore, game_ids)
 
-        for bs in results:
-            if not bs:
-                continue
-            for team_key in ["homeTeam", "awayTeam"]:
-                team = bs["game"][team_key]
-                tricode = team["teamTricode"]
+def get_daily_table(days_offset: int) -> DailyTable:
+    """Get (and cache) a day's leaders table, kept for the leaders TTL rather than the boxscores one"""
+    cache_key = f"daily_table_{days_offset}"
+    table = cache.get(cache_key)
+    if table is None:
+        table = get_daily_digest(days_offset).table
+        ttl = CACHE_TTL["historical"] if days_offset >= 2 else scheduler.ttl("leaders")
+        cache.set(cache_key, table, ttl)
+    return table
 
-                for player in team["players"]:
-                    if player["status"] == "ACTIVE":
-                        stats = player["statistics"]
-                        all_players.append(
-                            {
-                                "name": fix_encoding(player["name"]),
-                                "team": tricode,
-                                "points": stats["points"],
-                                "rebounds": stats["reboundsTotal"],
-                                "assists": stats["assists"],
-                                "blocks": stats["blocks"],
-                                "steals": stats["steals"],
-                                "threePointers": stats["threePointersMade"],
-                            }
-                        )
-
-        categories = [
-            ("points", "Points"),
-            ("rebounds", "Rebounds"),
-            ("assists", "Assists"),
-            ("blocks", "Blocks"),
-            ("steals", "Steals"),
-            ("threePointers", "3-Pointers"),
-        ]
 
-        leaders = {}
-        for key, label in categories:
-            if all_players:
-                max_val = max(p[key] for p in all_players)
-                top_players = [p for p in all_players if p[key] == max_val]
-                leaders[key] = {
-                    "label": label,
-                    "value": max_val,
-                    "players": [{"name": p["name"], "team": p["team"]} for p in top_players],
-                }
-
-        result = {"leaders": leaders, "date": get_display_date(days_offset)}
-        ttl = CACHE_TTL["historical"] if days_offset >= 2 else CACHE_TTL["leaders"]
-        cache.set(cache_key, result, ttl)
+@router.get("/api/leaders")
+def get_daily_leaders(
+    days_offset: int = Query(default=1, ge=0, le=7),
+    top: int = Query(default=1, ge=1, le=25, description="Players ranked per category"),
+    team: Optional[str] = Query(default=None, description="Only rank this team's players (tricode)"),
+    by_team: bool = Query(default=False, description="Also return leaders within every team"),
+    date: Optional[str] = DATE_QUERY,
+):
+    """Get daily leaders across statistical categories (including PRA and stocks).
+
+    With `date`, the best single-game lines of archived dates are ranked instead.
+    """
+    meta = {}
+    if date is not None:
+        start, end, meta = archived_range(date)
+    try:
+        table = get_archived_table(start, end) if meta else get_daily_table(days_offset)
+        mask = table.teams == team.upper() if team else None
+        result = {"leaders": table.leaders(top, mask), "date": get_display_date(days_offset), **meta}
+        if by_team:
+            result["teams"] = table.team_leaders(top)
         return result
     except Exception as e: # pragma: no cover
         log_exceptions(e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/api/standings")
-def get_standings():
-    """Get current NBA standings by conference"""
-    cached = cache.get("standings")
-    if cached:
-        return cached
-
+@router.get("/api/fantasy")
+def get_fantasy_leaders(
+    profile: Optional[str] = Query(default=None, description=f"Scoring profile: {', '.join(PROFILES)}"),
+    weights: Optional[str] = Query(default=None, description="Custom profile, e.g. pts:1,reb:1.2,tov:-1,dd:1.5"),
+    days_offset: int = Query(default=1, ge=0, le=7),
+    top: int = Query(default=25, ge=1, le=200),
+    team: Optional[str] = Query(default=None, description="Only this team's players (tricode); ranks stay league-wide"),
+    date: Optional[str] = DATE_QUERY,
+):
+    """Score every player of a day (or archived range) with a fantasy scoring profile"""
     try:
-        standings = leaguestandings.LeagueStandings(
-            proxy=STATS_PROXY,
-        ).get_dict()
-        teams = standings["resultSets"][0]["rowSet"]
+        name, profile_weights = get_profile(profile, weights)
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err))
+    meta = {"date": get_display_date(days_offset)}
+    if date is not None:
+        start, end, meta = archived_range(date)
+
+    digest = profile_hash(profile_weights)
+    scope = f"{start}_{end}" if date is not None else days_offset
+    cache_key = f"fantasy_{scope}_{digest}"
+    try:
+        ranking = cache.get(cache_key)
+        if ranking is None:
+            table = get_archived_table(start, end) if date is not None else get_daily_table(days_offset)
+            ranking = fantasy_ranking(table, profile_weights, top=len(table))
+            ttl = CACHE_TTL["historical"] if date is not None or days_offset >= 2 else scheduler.ttl("leaders")
+            cache.set(cache_key, ranking, ttl)
+        if team:
+            ranking = [p for p in ranking if p["team"] == team.upper()]
+        return {
+            "profile": name,
+            "profileHash": digest,
+            "weights": profile_weights,
+            "players": ranking[:top],
+            **meta,
+        }
+    except Exception as e: # pragma: no cover
+        log_exceptions(e)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        east = []
-        west = []
 
-        for team in teams:
-            # Indices based on API headers:
-            # 4=TeamName, 5=Conference, 7=PlayoffRank, 12=WINS, 13=LOSSES,
-            # 14=WinPCT, 17=HOME, 18=ROAD, 19=L10, 36=strCurrentStreak, 37=ConferenceGamesBack
-            win_pct = team[14] if team[14] is not None else 0
-            team_data = {
-                "rank": team[7] or 0,
-                "name": f"{team[3]} {team[4]}" or "",
-                "tricode": (team[3] or "")[:3].upper(),  # TeamCity -> tricode
-                "wins": team[12] or 0,
-                "losses": team[13] or 0,
-                "winPct": round(win_pct, 3) if win_pct else 0,
-                "gamesBack": team[37] if team[37] is not None else "-",
-                "streak": team[36] or "-",
-                "last10": team[19] or "0-0",
-                "homeRecord": team[17] or "0-0",
-                "awayRecord": team[18] or "0-0",
-            }
+@router.get("/api/leaders/range")
+def get_range_leaders(
+    stat: str = Query(default="points", description="Stat column, leaders category (pra, stocks) or rate (tsPct)"),
+    agg: str = Query(default="avg", description="sum, avg, max or count (games reaching min); rates take avg only"),
+    min_value: Optional[float] = Query(default=None, alias="min", description="Only count lines with at least this value"),
+    min_games: int = Query(default=1, ge=1),
+    last: Optional[int] = Query(default=None, ge=1, le=366, description="The last N days instead of the season"),
+    group: str = Query(default="player", description="player or team"),
+    team: Optional[str] = Query(default=None, description="Only this team's players (tricode)"),
+    top: int = Query(default=10, ge=1, le=100),
+    date: Optional[str] = DATE_QUERY,
+):
+    """Rank week, month or season aggregates (e.g. most 30-point games, best TS% over 14 days).
 
-            if team[5] == "East":
-                east.append(team_data)
-            else:
-                west.append(team_data)
+    Answered from the columnar archive only; defaults to the whole season so far.
+    """
+    yesterday = datetime.now().date() - timedelta(days=1)
+    try:
+        if date is not None:
+            start, end = parse_date_range(date, max_days=None)
+        else:
+            start = SEASON_START if last is None else max(SEASON_START, yesterday - timedelta(days=last - 1))
+            end = yesterday
+        dates = partition_dates(start, end) if start <= end else []
+        if not dates:
+            raise HTTPException(status_code=404, detail="Not archived yet")
+        ranking = query_leaders(dates, stat, agg, min_value, min_games, group, team, top)
+    except HTTPException:
+        raise
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err))
+    except Exception as e:
+        log_exceptions(e)
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "stat": stat,
+        "agg": agg,
+        "ranking": ranking,
+        "date": display_range(start, end),
+        "days": len(dates),
+    }
 
-        # Sort by rank
-        east.sort(key=lambda x: x["rank"] or 99)
-        west.sort(key=lambda x: x["rank"] or 99)
 
-        result = {"east": east, "west": west}
-        cache.set("standings", result, CACHE_TTL["standings"])
-        return result
+@router.get("/api/standings")
+def get_standings():
+    """Get current NBA standings by conference, updated as games go final"""
+    try:
+        return get_live_standings()
     except Exception as e: # pragma: no cover
         log_exceptions(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -292,6 +311,7 @@ def get_player_advanced_stats(
             if not bs:
                 continue
             adv_by_pid = {p[6]: p for p in adv_players} if adv_players else {}
+            metrics = get_game_metrics(bs)
             for team_key in ["homeTeam", "awayTeam"]:
                 team = bs["game"][team_key]
                 for player in team["players"]:
@@ -299,6 +319,7 @@ def get_player_advanced_stats(
                         stats = player["statistics"]
 
                         adv_stat = adv_by_pid.get(player["personId"])
+                        m = metrics[player["personId"]]
 
                         try:
                             minutes = reformat_player_minutes(int(parse_duration(stats["minutes"]).total_seconds()))
@@ -306,44 +327,33 @@ def get_player_advanced_stats(
                             log_exceptions(ex)
                             minutes = "0:00"
 
-                        pts = stats["points"]
                         fgm = stats["fieldGoalsMade"]
                         fga = stats["fieldGoalsAttempted"]
-                        tpm = stats["threePointersMade"]
-                        fta = stats["freeThrowsAttempted"]
-                        ftm = stats["freeThrowsMade"]
-                        reb = stats["reboundsTotal"]
-                        ast = stats["assists"]
-                        stl = stats["steals"]
-                        blk = stats["blocks"]
-                        tov = stats["turnovers"]
-
-                        ts_denom = 2 * (fga + 0.44 * fta)
-                        ts_pct = round(pts / ts_denom, 3) if ts_denom > 0 else 0
-                        efg_pct = round((fgm + 0.5 * tpm) / fga, 3) if fga > 0 else 0
-                        double_digits = sum(1 for x in [pts, reb, ast, stl, blk] if x >= 10)
 
                         results.append({
                             "id": player["personId"],
                             "name": fix_encoding(player["name"]),
                             "team": team["teamTricode"],
                             "minutes": minutes,
-                            "points": pts,
-                            "rebounds": reb,
-                            "assists": ast,
-                            "steals": stl,
-                            "blocks": blk,
-                            "turnovers": tov,
+                            "points": stats["points"],
+                            "rebounds": stats["reboundsTotal"],
+                            "assists": stats["assists"],
+                            "steals": stats["steals"],
+                            "blocks": stats["blocks"],
+                            "turnovers": stats["turnovers"],
                             "fg": f"{fgm}/{fga}",
-                            "fgPct": round(fgm / fga, 3) if fga > 0 else 0,
-                            "threePt": f"{tpm}/{stats['threePointersAttempted']}",
-                            "ft": f"{ftm}/{fta}",
-                            "ftPct": round(ftm / fta, 3) if fta > 0 else 0,
-                            "efgPct": efg_pct,
-                            "tsPct": ts_pct,
+                            "fgPct": m["fgPct"],
+                            "threePt": f"{stats['threePointersMade']}/{stats['threePointersAttempted']}",
+                            "ft": f"{stats['freeThrowsMade']}/{stats['freeThrowsAttempted']}",
+                            "ftPct": m["ftPct"],
+                            "efgPct": m["efgPct"],
+                            "tsPct": m["tsPct"],
+                            "gameScore": m["gameScore"],
+                            "usgPct": m["usgPct"],
+                            "astTov": m["astTov"],
                             "plusMinus": (adv_stat[14] if adv_stat else stats.get("plusMinusPoints", 0)),
-                            "isDoubleDouble": double_digits >= 2,
-                            "isTripleDouble": double_digits >= 3,
+                            "isDoubleDouble": m["isDoubleDouble"],
+                            "isTripleDouble": m["isTripleDouble"],
                         })
 
         return {"players": results}
@@ -357,7 +367,7 @@ def get_player_advanced_stats(
 
 @router.get("/api/playoffs")
 def get_playoff_picture():
-    """Get current playoff picture with projected final records"""
+    """Get current playoff picture with simulated seed odds and projected final records"""
     cached = cache.get("playoffs")
     if cached: # pragma: no cover
         return cached
@@ -369,6 +379,7 @@ def get_playoff_picture():
         TOTAL_GAMES = 82
         east = []
         west = []
+        all_teams = []
 
         for team in teams:
             win_pct = team[14] if team[14] is not None else 0
@@ -377,8 +388,6 @@ def get_playoff_picture():
             rank = team[7] or 0
             games_played = wins + losses
             games_remaining = max(0, TOTAL_GAMES - games_played)
-            projected_wins = round(wins + games_remaining * win_pct)
-            projected_losses = TOTAL_GAMES - projected_wins
 
             if rank <= 6:
                 status = "in"
@@ -398,20 +407,54 @@ def get_playoff_picture():
                 "streak": team[36] or "-",
                 "last10": team[19] or "0-0",
                 "gamesRemaining": games_remaining,
-                "projectedWins": projected_wins,
-                "projectedLosses": projected_losses,
                 "status": status,
             }
+            all_teams.append((team[2], team[5], team[9], team_data))
 
             if team[5] == "East":
                 east.append(team_data)
             else:
                 west.append(team_data)
 
+        # Seed odds from playing out the remaining schedule
+        index = {team_id: i for i, (team_id, _, _, _) in enumerate(all_teams)}
+        remaining_games = get_remaining_games()
+        games = None
+        if remaining_games is not None:
+            pairs = [(index[h], index[a]) for h, a in remaining_games if h in index and a in index]
+            games = ([h for h, _ in pairs], [a for _, a in pairs])
+        odds = simulate_seeding(
+            [t["wins"] for _, _, _, t in all_teams],
+            [t["losses"] for _, _, _, t in all_teams],
+            [conf for _, conf, _, _ in all_teams],
+            [t["gamesRemaining"] for _, _, _, t in all_teams],
+            games,
+        ) if all_teams else []
+        for (_, _, _, team_data), team_odds in zip(all_teams, odds):
+            projected_wins = round(team_odds.pop("projectedWins"))
+            team_data["projectedWins"] = projected_wins
+            team_data["projectedLosses"] = TOTAL_GAMES - projected_wins
+            team_data["odds"] = team_odds
+
+        # Local seeding, applying tiebreakers over the stored head-to-head results
+        try:
+            seeding_results.refresh()
+        except Exception as ex:
+            log_exceptions(ex)
+        engine = SeedingEngine(
+            seeding_results,
+            {team_id: (t["wins"], t["losses"]) for team_id, _, _, t in all_teams},
+            {team_id: (conf, division) for team_id, conf, division, _ in all_teams},
+        )
+        by_id = {team_id: t for team_id, _, _, t in all_teams}
+        for conference in {conf for _, conf, _, _ in all_teams}:
+            for seed, team_id in enumerate(engine.seed_conference(conference), 1):
+                by_id[team_id]["seed"] = seed
+
         east.sort(key=lambda x: x["rank"] or 99)
         west.sort(key=lambda x: x["rank"] or 99)
 
-        result = {"east": east, "west": west}
+        result = {"east": east, "west": west, "simulations": N_SIMULATIONS}
         cache.set("playoffs", result, CACHE_TTL["standings"])
         return result
     except Exception as e:
@@ -420,82 +463,20 @@ def get_playoff_picture():
 
 
 @router.get("/api/doubledoubles")
-def get_double_doubles(days_offset: int = Query(default=0, ge=0, le=7)):
-    """Get players with double-doubles or triple-doubles for a given day"""
-    cache_key = f"doubledoubles_{days_offset}"
-    cached = cache.get(cache_key)
-    if cached: # pragma: no cover
-        return cached
+def get_double_doubles(days_offset: int = Query(default=0, ge=0, le=7), date: Optional[str] = DATE_QUERY):
+    """Get players with double-doubles or triple-doubles for a given day (or archived dates)"""
+    if date is not None:
+        start, end, meta = archived_range(date)
+        triple_doubles, double_doubles = get_archived_double_doubles(start, end)
+        return {"tripleDoubles": triple_doubles, "doubleDoubles": double_doubles, **meta}
 
     try:
-        if days_offset == 0:
-            # Use live scoreboard for today
-            game_ids = [g["gameId"] for g in scoreboard.ScoreBoard().games.data]
-        else:
-            game_ids = get_games_list(days_offset)
-
-        double_doubles = []
-        triple_doubles = []
-
-        def fetch_dd_boxscore(gid):
-            try:
-                return boxscore.BoxScore(game_id=gid).get_dict()
-            except Exception as ex:
-                log_exceptions(ex)
-                return {}
-
-        boxscore_results = list(executor.map(fetch_dd_boxscore, game_ids))
-
-        for bs in boxscore_results:
-            if not bs:
-                continue
-            for team_key in ["homeTeam", "awayTeam"]:
-                team = bs["game"][team_key]
-                tricode = team["teamTricode"]
-
-                for player in team["players"]:
-                    if player["status"] == "ACTIVE":
-                        stats = player["statistics"]
-                        pts = stats["points"]
-                        reb = stats["reboundsTotal"]
-                        ast = stats["assists"]
-                        stl = stats["steals"]
-                        blk = stats["blocks"]
-
-                        categories = {
-                            "pts": pts,
-                            "reb": reb,
-                            "ast": ast,
-                            "stl": stl,
-                            "blk": blk,
-                        }
-                        double_digit_cats = [k for k, v in categories.items() if v >= 10]
-
-                        if len(double_digit_cats) >= 2:
-                            player_data = {
-                                "name": fix_encoding(player["name"]),
-                                "team": tricode,
-                                "points": pts,
-                                "rebounds": reb,
-                                "assists": ast,
-                                "steals": stl,
-                                "blocks": blk,
-                                "categories": double_digit_cats,
-                            }
-
-                            if len(double_digit_cats) >= 3:
-                                triple_doubles.append(player_data)
-                            else:
-                                double_doubles.append(player_data)
-
-        result = {
-            "tripleDoubles": triple_doubles,
-            "doubleDoubles": double_doubles,
+        digest = get_daily_digest(days_offset)
+        return {
+            "tripleDoubles": digest.triple_doubles,
+            "doubleDoubles": digest.double_doubles,
             "date": get_display_date(days_offset),
         }
-        ttl = CACHE_TTL["historical"] if days_offset >= 2 else CACHE_TTL["boxscores"]
-        cache.set(cache_key, result, ttl)
-        return result
     except Exception as e:
         log_exceptions(e)
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,6 +1,6 @@
 import requests
 from fastapi import APIRouter, HTTPException
-from helpers.common import CACHE_TTL, cache
+from helpers.common import cache
 from helpers.logger import log_exceptions
 from helpers.stats import load_players_dict
 
@@ -91,7 +91,7 @@ def get_trades():
 
         transactions.sort(key=lambda x: x["date"], reverse=True)
         result = {"transactions": transactions, "total": len(transactions)}
-        cache.set("trades", result, CACHE_TTL["standings"])  # 1 hour cache
+        cache.set_adaptive("trades", result, "trades")
         return result
     except requests.RequestException as e:
         log_exceptions(e)
@@ -1,7 +1,9 @@
+import argparse
 import json
 import os
-import sys
-from datetime import date, datetime, timedelta
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 
 from nba_api.stats.endpoints import boxscoretraditionalv3, scoreboardv3
 
@@ -9,63 +11,167 @@ PLAYERS_FILE = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "players_with_teamid.json"
 )
 
-TRADES_LOG_FILE = os.path.join(
-    os.path.dirname(os.path.abspath(__file__)), "trades.log"
+CHANGES_LOG_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "player_changes.jsonl"
 )
 
-def get_games_list(days_offset: int = 1):
-    """Get list of game IDs for a given date offset"""
-    g_dict = []
-    target_date = date.today() - timedelta(days=days_offset)
+# Last fully processed date; kept out of git (the workflow caches it between runs)
+# so quiet days do not produce a commit
+STATE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".update_state.json"
+)
+
+MAX_WORKERS = 8
+MAX_BACKFILL_DAYS = 30
+
+
+def get_games_list(target_date: date):
+    """Get list of game IDs played on a given date; fetch errors propagate"""
+    sb = scoreboardv3.ScoreboardV3(game_date=target_date.strftime("%Y-%m-%d"))
+    games = sb.game_header.get_dict()
+    return list({g[0] for g in games["data"]})
+
+
+def fetch_player_rows(game_id):
+    """Fetch BoxScoreTraditionalV3 player rows for a single game (for parallel execution)"""
+    bs_stats = boxscoretraditionalv3.BoxScoreTraditionalV3(game_id=game_id)
+    return bs_stats.player_stats.get_dict()["data"]
+
+
+def date_range(start: date, end: date):
+    """Yield every date from start to end, inclusive"""
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+
+def last_processed_date():
+    """Return the last fully processed date, or None"""
+    if not os.path.exists(STATE_FILE):
+        return None
     try:
-        sb = scoreboardv3.ScoreboardV3(game_date=target_date.strftime("%Y-%m-%d"))
-        games = sb.game_header.get_dict()
-        for g in games["data"]:
-            g_dict.append(g[0])
+        with open(STATE_FILE, "r") as f:
+            return date.fromisoformat(json.load(f)["lastDate"])
+    except (ValueError, KeyError):
+        return None
+
+
+def save_processed_date(game_date: date):
+    """Record the last fully processed date"""
+    with open(STATE_FILE, "w") as f:
+        json.dump({
+            "lastDate": game_date.isoformat(),
+            "ranAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }, f)
+
+
+def apply_player_rows(players_by_id, players_with_teamid, rows, game_date: date):
+    """Apply one game's player rows to the index and return the resulting changes"""
+    changes = []
+    for row in rows:
+        # Skip DNP rows (non-empty comment) - the player did not suit up for that team
+        if row[12] != "":
+            continue
+        player_id, team_id = row[6], row[1]
+        p = players_by_id.get(player_id)
+        if p is None:
+            p = [player_id, f"{row[7]} {row[8]}".strip(), team_id]
+            players_with_teamid.append(p)
+            players_by_id[player_id] = p
+            changes.append({
+                "type": "new_player",
+                "date": game_date.isoformat(),
+                "gameId": row[0],
+                "playerId": player_id,
+                "name": p[1],
+                "toTeamId": team_id,
+            })
+        elif p[2] != team_id:
+            changes.append({
+                "type": "team_change",
+                "date": game_date.isoformat(),
+                "gameId": row[0],
+                "playerId": player_id,
+                "name": p[1],
+                "fromTeamId": p[2],
+                "toTeamId": team_id,
+            })
+            p[2] = team_id
+    return changes
+
+
+def write_players_file(players_with_teamid):
+    """Atomically replace the players file (one player per line keeps git diffs readable)"""
+    directory = os.path.dirname(PLAYERS_FILE)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".players_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write("[\n")
+            f.write(",\n".join(json.dumps(p, ensure_ascii=False) for p in players_with_teamid))
+            f.write("\n]\n")
+        os.replace(tmp_path, PLAYERS_FILE)
     except Exception:
-        pass
-    return list(set(g_dict))
+        os.unlink(tmp_path)
+        raise
 
 
-def update_players():
-    date_offset = 1
-    now = datetime.now()
+def append_changes_log(entries):
+    """Append change entries to the JSON Lines change log"""
+    with open(CHANGES_LOG_FILE, "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
 
-    log_file = open(TRADES_LOG_FILE, "w")
-    sys.stdout = log_file
+
+def update_players(start: date = None, end: date = None):
+    """Update player team ids from boxscores played between start and end (inclusive).
+
+    Without an explicit start, resumes from the day after the last processed
+    date so missed days are backfilled automatically (capped at MAX_BACKFILL_DAYS).
+    A date counts as processed only once its scoreboard and every boxscore were
+    fetched; the first failing date stops the run (after saving the dates
+    before it) and its error propagates, so the next run retries from there.
+    The players file and change log are only written when something changed.
+    """
+    yesterday = date.today() - timedelta(days=1)
+    end = end or yesterday
+    if start is None:
+        last = last_processed_date()
+        start = last + timedelta(days=1) if last else end
+        start = max(start, end - timedelta(days=MAX_BACKFILL_DAYS - 1))
+    if start > end:
+        return []
 
     with open(PLAYERS_FILE, "r") as file:
         players_with_teamid = json.load(file)
+    players_by_id = {p[0]: p for p in players_with_teamid}
 
-    changes = 0
-    changed_players = []
-    off_date = (now + timedelta(days=-date_offset)).strftime("%d-%m-%Y")
-    for game in get_games_list(date_offset):
-        try:
-            bs_stats = boxscoretraditionalv3.BoxScoreTraditionalV3(game_id=game)
-        except Exception:
-            continue
-
-        for player in bs_stats.player_stats.get_dict()["data"]:
-            p = next((x for x in players_with_teamid if x[0] == player[6]), None)
-            if p is not None:
-                if player[12] == "":
-                    if p[2] != player[1]:
-                        p[2] = player[1]
-                        changes += 1
-                        changed_players.append(player)
-    with open(PLAYERS_FILE, "w") as ffile:
-        json.dump(players_with_teamid, ffile, indent=4)
+    changes = []
+    processed = None
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            # Dates are applied in order so the latest team wins when a player moves twice
+            for game_date in date_range(start, end):
+                game_ids = get_games_list(game_date)
+                # Fetch the whole date before applying any of it, so a failed date leaves no trace
+                game_rows = list(pool.map(fetch_player_rows, game_ids))
+                for rows in game_rows:
+                    changes.extend(apply_player_rows(players_by_id, players_with_teamid, rows, game_date))
+                processed = game_date
+    finally:
+        if changes:
+            write_players_file(players_with_teamid)
+            append_changes_log(changes)
+        if processed is not None:
+            save_processed_date(processed)
+    return changes
 
-    if changes > 0:
-        print(f"Date: {off_date} Changes: {changes}")
-        for player in changed_players:
-            print(player)
-    else:
-        print(f"Date: {off_date}")
 
-    log_file.close()
+def parse_args():
+    parser = argparse.ArgumentParser(description="Update player team ids from NBA boxscores")
+    parser.add_argument("--start", type=date.fromisoformat, help="first date to process (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="last date to process (YYYY-MM-DD), default yesterday")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    update_players()
+    args = parse_args()
+    update_players(args.start, args.end)
@@ -1,5 +1,30 @@
 import os
 import sys
+import tempfile
+
+import pytest
 
 # Make `api/` importable from anywhere pytest is run
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+# Module-level defaults (and the app lifespan) must never reach data/stats.db
+_SESSION_DATA = tempfile.mkdtemp(prefix="nba-stables-tests-")
+os.environ.setdefault("STATS_DB", os.path.join(_SESSION_DATA, "stats.db"))
+os.environ.setdefault("COLUMNAR_DIR", os.path.join(_SESSION_DATA, "columnar"))
+
+
+@pytest.fixture(autouse=True)
+def stats_store(tmp_path, monkeypatch):
+    """Give every test its own empty stats database and columnar archive"""
+    from helpers import columnar, seeding, store, streaks
+
+    monkeypatch.setattr(store, "STATS_DB_FILE", str(tmp_path / "stats.db"))
+    monkeypatch.setattr(columnar, "COLUMNAR_DIR", str(tmp_path / "columnar"))
+    monkeypatch.setattr(store, "_ingested", set())
+    monkeypatch.setattr(store, "_pending", set())
+    # Consumers that read the store by rowid start over on the fresh database
+    seeding.results.reset()
+    streaks.streaks.reset()
+    yield
+    seeding.results.reset()
+    streaks.streaks.reset()
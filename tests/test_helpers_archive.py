@@ -0,0 +1,125 @@
+"""Unit tests for helpers/archive.py (historical archive and backfill)."""
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import helpers.archive as archive
+import helpers.columnar as columnar
+import helpers.store as store
+from helpers.common import cache
+from test_helpers_store import make_boxscore
+
+YESTERDAY = date.today() - timedelta(days=1)
+DAY = YESTERDAY - timedelta(days=3)
+
+
+@pytest.fixture(autouse=True)
+def season(monkeypatch):
+    monkeypatch.setattr(archive, "SEASON_START", date.today() - timedelta(days=60))
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "STATS_DB_FILE", str(tmp_path / "stats.db"))
+    monkeypatch.setattr(columnar, "COLUMNAR_DIR", str(tmp_path / "columnar"))
+    monkeypatch.setattr(store, "_ingested", set())
+    monkeypatch.setattr(store, "_pending", set())
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def archive_day(day=DAY, **kw):
+    store.ingest_boxscore(make_boxscore(game_date=day.isoformat(), **kw))
+    store.mark_date_archived(day.isoformat(), 1)
+
+
+class TestParseDateRange:
+    def test_single_date(self):
+        assert archive.parse_date_range(DAY.isoformat()) == (DAY, DAY)
+
+    def test_range(self):
+        start = DAY - timedelta(days=2)
+        assert archive.parse_date_range(f"{start}..{DAY}") == (start, DAY)
+
+    @pytest.mark.parametrize("value", [
+        "yesterday",
+        f"{DAY}..{DAY - timedelta(days=1)}",
+        f"{DAY - timedelta(days=40)}..{DAY}",
+        date.today().isoformat(),
+        (date.today() - timedelta(days=90)).isoformat(),
+    ])
+    def test_rejected(self, value):
+        with pytest.raises(ValueError):
+            archive.parse_date_range(value)
+
+
+class TestArchivedReads:
+    def test_coverage(self, db):
+        archive_day()
+        archived, missing = archive.get_coverage(DAY - timedelta(days=1), DAY)
+        assert archived == [DAY.isoformat()]
+        assert missing == [(DAY - timedelta(days=1)).isoformat()]
+
+    def test_boxscores(self, db):
+        archive_day()
+        games = archive.get_archived_boxscores(DAY, DAY)
+        assert len(games) == 1
+        home, away = games[0]["teams"]
+        assert home["name"] == "Los Angeles Lakers" and home["score"] == 110
+        assert home["stats"]["fg"] == "40/80" and home["stats"]["fgPct"] == 0.5
+        assert home["leader"]["name"] == "LeBron James"
+        assert away["leader"]["points"] == 32
+
+    def test_table(self, db):
+        archive_day()
+        leaders = archive.get_archived_table(DAY, DAY).leaders()
+        assert leaders["points"]["players"] == [{"name": "Jayson Tatum", "team": "BOS"}]
+
+    def test_double_doubles(self, db):
+        archive_day(points=10)
+        triples, doubles = archive.get_archived_double_doubles(DAY, DAY)
+        # make_player lines have 8 rebounds and 6 assists: only points reach ten
+        assert triples == [] and doubles == []
+
+
+class TestBackfill:
+    def _scoreboard(self, rows):
+        m = MagicMock()
+        m.return_value.game_header.get_dict.return_value = {"headers": ["gameId", "gameStatus"], "data": rows}
+        return m
+
+    def test_archives_final_dates(self, db):
+        def ingest(game_id):
+            store.ingest_boxscore(make_boxscore(game_id=game_id, game_date=DAY.isoformat()))
+            return True
+
+        with patch("helpers.archive.scoreboardv3.ScoreboardV3", self._scoreboard([["0022600001", 3]])), \
+             patch("helpers.archive.ingest_game", side_effect=ingest) as mock:
+            assert archive.backfill(DAY, DAY) == 1
+            assert archive.backfill(DAY, DAY) == 0
+        mock.assert_called_once_with("0022600001")
+        assert store.get_archived_dates(DAY.isoformat(), DAY.isoformat()) == [DAY.isoformat()]
+        assert columnar.partition_dates(DAY, DAY) == [DAY.isoformat()]
+
+    def test_unfinished_date_not_archived(self, db):
+        with patch("helpers.archive.scoreboardv3.ScoreboardV3", self._scoreboard([["0022600001", 2]])), \
+             patch("helpers.archive.ingest_game"):
+            assert archive.backfill(DAY, DAY) == 0
+
+    def test_upstream_error_not_archived(self, db):
+        with patch("helpers.archive.scoreboardv3.ScoreboardV3", side_effect=ConnectionError), \
+             patch("helpers.archive.log_exceptions"):
+            assert archive.backfill(DAY, DAY) == 0
+
+    def test_empty_date_archived(self, db):
+        with patch("helpers.archive.scoreboardv3.ScoreboardV3", self._scoreboard([])):
+            assert archive.backfill(DAY, DAY) == 1
+
+    def test_single_backfill_thread_per_host(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(archive, "BACKFILL_LOCK_FILE", str(tmp_path / "backfill.lock"))
+        with patch("helpers.archive.threading.Thread") as thread:
+            assert archive.start_backfill() is True
+            assert archive.start_backfill() is False
+        thread.return_value.start.assert_called_once()
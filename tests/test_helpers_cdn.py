@@ -0,0 +1,138 @@
+"""Unit tests for helpers/cdn.py (conditional GETs against the live CDN)."""
+import requests
+from requests.adapters import BaseAdapter
+
+from helpers.cdn import CachedNBAResponse, ConditionalSession, SizedLRU
+
+URL = "https://cdn.nba.com/static/json/liveData/scoreboard/todaysScoreboard_00.json"
+
+
+class FakeAdapter(BaseAdapter):
+    """Transport answering from a queue of (status, body, headers) and recording requests."""
+
+    def __init__(self, answers):
+        super().__init__()
+        self.answers = list(answers)
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        status, body, headers = self.answers.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        response.headers.update(headers)
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def make_session(answers):
+    session = ConditionalSession()
+    adapter = FakeAdapter(answers)
+    session.mount("https://", adapter)
+    return session, adapter
+
+
+class TestConditionalSession:
+    def test_first_request_is_unconditional(self):
+        session, adapter = make_session([(200, b'{"a": 1}', {"ETag": '"v1"'})])
+        response = session.get(URL, headers={"Accept": "application/json"})
+        assert response.status_code == 200
+        assert "If-None-Match" not in adapter.requests[0].headers
+        assert adapter.requests[0].headers["Accept"] == "application/json"
+
+    def test_revalidates_with_etag_and_last_modified(self):
+        session, adapter = make_session([
+            (200, b'{"a": 1}', {"ETag": '"v1"', "Last-Modified": "Sat, 18 Oct 2026 01:00:00 GMT"}),
+            (304, b"", {}),
+        ])
+        session.get(URL)
+        response = session.get(URL)
+        sent = adapter.requests[1].headers
+        assert sent["If-None-Match"] == '"v1"'
+        assert sent["If-Modified-Since"] == "Sat, 18 Oct 2026 01:00:00 GMT"
+        assert response.status_code == 200
+        assert response.text == '{"a": 1}'
+
+    def test_changed_body_replaces_entry(self):
+        session, adapter = make_session([
+            (200, b'{"a": 1}', {"ETag": '"v1"'}),
+            (200, b'{"a": 2}', {"ETag": '"v2"'}),
+            (304, b"", {}),
+        ])
+        session.get(URL)
+        session.get(URL)
+        response = session.get(URL)
+        assert adapter.requests[2].headers["If-None-Match"] == '"v2"'
+        assert response.text == '{"a": 2}'
+
+    def test_no_validators_means_no_conditional_request(self):
+        session, adapter = make_session([(200, b"{}", {}), (200, b"{}", {})])
+        session.get(URL)
+        session.get(URL)
+        assert "If-None-Match" not in adapter.requests[1].headers
+        assert "If-Modified-Since" not in adapter.requests[1].headers
+
+    def test_caller_headers_not_mutated(self):
+        headers = {"Accept": "application/json"}
+        session, _ = make_session([(200, b"{}", {"ETag": '"v1"'}), (304, b"", {})])
+        session.get(URL, headers=headers)
+        session.get(URL, headers=headers)
+        assert headers == {"Accept": "application/json"}
+
+    def test_entries_bounded_by_total_bytes(self):
+        session = ConditionalSession(max_bytes=10)
+        session.mount("https://", FakeAdapter([
+            (200, b'{"a": 1}', {"ETag": '"a"'}),
+            (200, b'{"b": 2}', {"ETag": '"b"'}),
+            (200, b'{"big": "' + b"x" * 20 + b'"}', {"ETag": '"c"'}),
+        ]))
+        session.get(URL)
+        session.get(URL + "?x=1")
+        assert len(session._entries) == 1 and session._entries.size == 8
+        session.get(URL + "?x=2")  # larger than the whole budget, never kept
+        assert len(session._entries) == 1
+
+
+class TestSizedLRU:
+    def test_evicts_least_recently_used(self):
+        lru = SizedLRU(10)
+        lru.put("a", 1, 4)
+        lru.put("b", 2, 4)
+        lru.get("a")
+        lru.put("c", 3, 4)
+        assert (lru.get("a"), lru.get("b"), lru.get("c")) == (1, None, 3)
+        assert lru.size == 8
+
+    def test_replacing_a_key_updates_its_size(self):
+        lru = SizedLRU(10)
+        lru.put("a", 1, 4)
+        lru.put("a", 2, 6)
+        assert lru.size == 6 and lru.get("a") == 2
+
+
+class TestCachedNBAResponse:
+    def setup_method(self):
+        CachedNBAResponse._parsed.clear()
+
+    def test_same_body_parsed_once(self):
+        first = CachedNBAResponse('{"a": [1, 2]}', 200, URL).get_dict()
+        second = CachedNBAResponse('{"a": [1, 2]}', 200, URL).get_dict()
+        assert first == {"a": [1, 2]}
+        assert second is first
+
+    def test_changed_body_reparsed(self):
+        first = CachedNBAResponse('{"a": 1}', 200, URL).get_dict()
+        second = CachedNBAResponse('{"a": 2}', 200, URL).get_dict()
+        assert second == {"a": 2}
+        assert second is not first
+
+    def test_urls_cached_separately(self):
+        a = CachedNBAResponse('{"a": 1}', 200, URL).get_dict()
+        b = CachedNBAResponse('{"a": 1}', 200, URL + "?x").get_dict()
+        assert a == b and a is not b
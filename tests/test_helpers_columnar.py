@@ -0,0 +1,121 @@
+"""Unit tests for helpers/columnar.py (partitioned season archive and range aggregates)."""
+from datetime import date
+
+import numpy as np
+import pytest
+
+import helpers.columnar as columnar
+from helpers.store import PLAYER_COLUMNS
+
+TEAM_IDS = {"LAL": 1610612747, "BOS": 1610612738, "NYK": 1610612752, "MIA": 1610612748}
+
+
+def line(game_date, player_id, name, tricode, pts, game_id=None, **stats):
+    row = {c: 0 for c in PLAYER_COLUMNS}
+    row.update(
+        game_id=game_id or f"g-{game_date}-{tricode}", game_date=game_date, player_id=player_id,
+        team_id=TEAM_IDS[tricode], tricode=tricode, name=name, seconds=1800,
+        pts=pts, fga=20, fta=4, fgm=10, ts_pct=None,
+    )
+    row.update(stats)
+    return row
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar, "COLUMNAR_DIR", str(tmp_path / "columnar"))
+    columnar.write_partition("2026-10-29", [
+        line("2026-10-29", 1, "Alpha", "LAL", 30, reb=10, ast=5),
+        line("2026-10-29", 2, "Beta", "BOS", 20, reb=2, ast=2),
+        line("2026-10-29", 3, "Gamma", "BOS", 10),
+    ])
+    columnar.write_partition("2026-11-02", [
+        line("2026-11-02", 1, "Alpha", "LAL", 20, fga=10, fgm=8),
+        line("2026-11-02", 2, "Beta", "NYK", 35),
+    ])
+    return columnar.partition_dates(date(2026, 10, 1), date(2026, 11, 30))
+
+
+class TestPartitions:
+    def test_partitioned_by_month_and_date(self, archive):
+        assert archive == ["2026-10-29", "2026-11-02"]
+        assert columnar.partition_path("2026-11-02").endswith("2026-11/2026-11-02")
+
+    def test_range_filter(self, archive):
+        assert columnar.partition_dates(date(2026, 11, 1), date(2026, 11, 30)) == ["2026-11-02"]
+
+    def test_columns_memory_mapped(self, archive):
+        cols = columnar.load_columns(archive[:1], ["pts", "name"])
+        assert isinstance(cols["pts"], np.memmap)
+        assert cols["pts"].tolist() == [30, 20, 10]
+        assert cols["name"].tolist() == ["Alpha", "Beta", "Gamma"]
+
+    def test_missing_metrics_stored_as_nan(self, archive):
+        assert np.isnan(columnar.load_columns(archive, ["ts_pct"])["ts_pct"]).all()
+
+    def test_write_missing_only(self, archive, monkeypatch):
+        written = []
+        monkeypatch.setattr(columnar, "get_player_lines_on", lambda d: written.append(d) or [])
+        assert columnar.write_missing_partitions(["2026-10-29", "2026-11-05"]) == 1
+        assert written == ["2026-11-05"]
+
+    def test_rewrite_replaces_partition(self, archive):
+        columnar.write_partition("2026-11-02", [line("2026-11-02", 4, "Delta", "MIA", 5)])
+        assert columnar.load_columns(["2026-11-02"], ["name"])["name"].tolist() == ["Delta"]
+
+
+class TestQueryLeaders:
+    def test_average(self, archive):
+        ranking = columnar.query_leaders(archive, "points")
+        assert [(p["name"], p["value"], p["games"]) for p in ranking] == [
+            ("Beta", 27.5, 2), ("Alpha", 25.0, 2), ("Gamma", 10.0, 1),
+        ]
+        # Latest line names the player's team
+        assert ranking[0]["team"] == "NYK"
+
+    def test_count_of_games_over_threshold(self, archive):
+        ranking = columnar.query_leaders(archive, "pts", agg="count", min_value=30)
+        assert [(p["name"], p["value"]) for p in ranking] == [("Alpha", 1), ("Beta", 1)]
+        assert ranking[1]["rank"] == 1
+
+    def test_category_sum_and_max(self, archive):
+        assert columnar.query_leaders(archive, "pra", agg="sum", top=1)[0]["value"] == 65
+        assert columnar.query_leaders(archive, "pts", agg="max", top=1)[0]["name"] == "Beta"
+
+    def test_rate_from_summed_components(self, archive):
+        ranking = columnar.query_leaders(archive, "fgPct", min_games=2)
+        # Alpha: 18/30 over both games, not the mean of 0.5 and 0.8
+        assert ranking[0] == {"rank": 1, "id": 1, "value": 0.6, "games": 2, "name": "Alpha", "team": "LAL"}
+        assert [p["name"] for p in ranking] == ["Alpha", "Beta"]
+
+    def test_team_group_counts_games(self, archive):
+        ranking = columnar.query_leaders(archive, "points", agg="sum", group="team")
+        assert [(p["team"], p["value"], p["games"]) for p in ranking] == [
+            ("LAL", 50, 2), ("NYK", 35, 1), ("BOS", 30, 1),
+        ]
+
+    def test_team_count_and_max_sum_each_team_game(self, archive):
+        # BOS scored 30 on 2026-10-29 across two lines, neither of which reached 25 alone
+        ranking = columnar.query_leaders(archive, "pts", agg="count", min_value=25, group="team")
+        assert [(p["team"], p["value"]) for p in ranking] == [("BOS", 1), ("LAL", 1), ("NYK", 1)]
+        ranking = columnar.query_leaders(archive, "pts", agg="max", group="team")
+        assert [(p["team"], p["value"]) for p in ranking] == [("NYK", 35), ("BOS", 30), ("LAL", 30)]
+
+    def test_team_filter(self, archive):
+        assert [p["name"] for p in columnar.query_leaders(archive, "points", team="bos")] == ["Beta", "Gamma"]
+
+    def test_no_dates(self, archive):
+        assert columnar.query_leaders([], "points") == []
+
+    @pytest.mark.parametrize("kw", [
+        {"stat": "bogus"},
+        {"stat": "pts", "agg": "median"},
+        {"stat": "pts", "agg": "count"},
+        {"stat": "tsPct", "min_value": 1},
+        {"stat": "tsPct", "agg": "sum"},
+        {"stat": "fgPct", "agg": "max"},
+        {"stat": "pts", "group": "conference"},
+    ])
+    def test_invalid(self, archive, kw):
+        with pytest.raises(ValueError):
+            columnar.query_leaders(archive, **kw)
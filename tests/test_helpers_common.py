@@ -1,8 +1,9 @@
 """Unit tests for helpers/common.py — SimpleCache and helpers/logger.py."""
+import threading
 import time
 from unittest.mock import patch
 
-from helpers.common import SimpleCache
+from helpers.common import CACHE_TTL, CACHE_TTL_BOUNDS, SimpleCache, content_hash
 
 
 class TestSimpleCache:
@@ -124,6 +125,70 @@ class TestSimpleCache:
         assert self.cache.get("short") is None
         assert self.cache.get("long") == "here"
 
+    # ------------------------------------------------------------------
+    # Prefix deletes
+    # ------------------------------------------------------------------
+
+    def test_delete_prefix(self):
+        self.cache.set("daily_0", 1, ttl_seconds=60)
+        self.cache.set("daily_table_0", 2, ttl_seconds=60)
+        self.cache.set("leaders_0", 3, ttl_seconds=60)
+        self.cache.delete_prefix("daily")
+        assert self.cache.get("daily_0") is None and self.cache.get("daily_table_0") is None
+        assert self.cache.get("leaders_0") == 3
+
+    def test_delete_prefix_waits_for_writers(self):
+        self.cache.set("daily_0", 1, ttl_seconds=60)
+        with self.cache._lock:
+            deleter = threading.Thread(target=self.cache.delete_prefix, args=("daily",))
+            deleter.start()
+            deleter.join(0.1)
+            assert deleter.is_alive()
+        deleter.join(1)
+        assert self.cache.get("daily_0") is None
+
+
+class TestAdaptiveTtl:
+    def setup_method(self):
+        self.cache = SimpleCache()
+
+    def test_first_refresh_uses_configured_ttl(self):
+        assert self.cache.set_adaptive("trades", {"a": 1}, "trades") == CACHE_TTL["trades"]
+        assert self.cache.get("trades") == {"a": 1}
+
+    def test_unchanged_content_stretches_ttl(self):
+        ttls = [self.cache.set_adaptive("trades", {"a": 1}, "trades") for _ in range(3)]
+        assert ttls == [3600, 5400, 8100]
+
+    def test_changed_content_shrinks_ttl(self):
+        ttls = [self.cache.set_adaptive("trades", {"a": i}, "trades") for i in range(3)]
+        assert ttls == [3600, 1800, 900]
+
+    def test_ttl_stays_within_bounds(self):
+        low, high = CACHE_TTL_BOUNDS["trades"]
+        for _ in range(20):
+            ttl = self.cache.set_adaptive("trades", "same", "trades")
+        assert ttl == high
+        for i in range(20):
+            ttl = self.cache.set_adaptive("trades", i, "trades")
+        assert ttl == low
+
+    def test_content_compared_instead_of_data(self):
+        self.cache.set_adaptive("snap", {"rows": [1], "changed": {1}}, "standings_reconcile", content=[1])
+        ttl = self.cache.set_adaptive("snap", {"rows": [1], "changed": {2}}, "standings_reconcile", content=[1])
+        assert ttl == CACHE_TTL["standings_reconcile"] * 1.5
+
+    def test_learned_ttl_survives_delete_not_clear(self):
+        self.cache.set_adaptive("trades", 1, "trades")
+        self.cache.delete("trades")
+        assert self.cache.set_adaptive("trades", 1, "trades") == 5400
+        self.cache.clear()
+        assert self.cache.set_adaptive("trades", 1, "trades") == 3600
+
+    def test_content_hash_ignores_key_order(self):
+        assert content_hash({"a": 1, "b": 2}) == content_hash({"b": 2, "a": 1})
+        assert content_hash({"a": 1}) != content_hash({"a": 2})
+
 
 class TestLogExceptions:
     def test_calls_logger_exception(self):
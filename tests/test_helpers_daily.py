@@ -0,0 +1,154 @@
+"""Unit tests for helpers/daily.py (columnar daily stat table, leaders and day digest)."""
+import numpy as np
+
+from helpers.daily import CATEGORIES, COLUMNS, EXTRA_TIES, DailyDigest, DailyTable, team_boxscore
+
+
+def line(pid, name, pts=0, reb=0, ast=0, stl=0, blk=0, fg3m=0, minutes="PT30M00.00S", status="ACTIVE"):
+    return {
+        "personId": pid, "name": name, "status": status,
+        "statistics": {
+            "points": pts, "reboundsTotal": reb, "assists": ast, "steals": stl,
+            "blocks": blk, "threePointersMade": fg3m, "minutes": minutes,
+        },
+    }
+
+
+def boxscore(home, away, home_code="LAL", away_code="BOS"):
+    return {"game": {
+        "homeTeam": {"teamTricode": home_code, "players": home},
+        "awayTeam": {"teamTricode": away_code, "players": away},
+    }}
+
+
+def make_table():
+    return DailyTable.from_boxscores([
+        boxscore(
+            [line(1, "A", pts=30, reb=5, ast=10, stl=1, blk=1, fg3m=4), line(2, "B", pts=12, reb=14, blk=4)],
+            [line(3, "C", pts=30, reb=8, ast=3, stl=3, fg3m=6), line(4, "D", status="INACTIVE")],
+        ),
+        {},
+    ])
+
+
+class TestFromBoxscores:
+    def test_columns_and_rows(self):
+        table = make_table()
+        assert len(table) == 3
+        assert table.values.shape == (3, len(COLUMNS))
+        assert list(table.ids) == [1, 2, 3]
+        assert list(table.teams) == ["LAL", "LAL", "BOS"]
+        assert table.values[0, COLUMNS.index("seconds")] == 1800
+
+    def test_empty(self):
+        table = DailyTable.from_boxscores([])
+        assert len(table) == 0
+        assert table.leaders() == {}
+
+
+class TestLeaders:
+    def test_every_category_ranked(self):
+        leaders = make_table().leaders()
+        assert set(leaders) == set(CATEGORIES)
+        assert leaders["rebounds"]["value"] == 14
+        assert leaders["rebounds"]["players"] == [{"name": "B", "team": "LAL"}]
+
+    def test_ties_share_the_lead(self):
+        points = make_table().leaders()["points"]
+        assert points["value"] == 30
+        assert [p["name"] for p in points["players"]] == ["A", "C"]
+
+    def test_combined_categories(self):
+        leaders = make_table().leaders()
+        assert leaders["pra"]["value"] == 45
+        assert leaders["pra"]["players"][0]["name"] == "A"
+        assert leaders["stocks"]["value"] == 4
+
+    def test_top_n_ranking(self):
+        ranking = make_table().leaders(top=2)["assists"]["ranking"]
+        assert [(p["rank"], p["name"], p["value"]) for p in ranking] == [(1, "A", 10), (2, "C", 3)]
+
+    def test_ties_at_cutoff_included(self):
+        ranking = make_table().leaders(top=1)["points"]["ranking"]
+        assert [p["rank"] for p in ranking] == [1, 1]
+
+    def test_zero_values_not_ranked(self):
+        # Only B blocked a shot; nobody else should share a 0-block lead or ranking
+        blocks = make_table().leaders(top=3)["blocks"]
+        assert [p["name"] for p in blocks["ranking"]] == ["B", "A"]
+        table = make_table()
+        steals = table.leaders(mask=table.ids == 2)["steals"]
+        assert (steals["value"], steals["players"], steals["ranking"]) == (0, [], [])
+
+    def test_ties_at_cutoff_capped(self):
+        table = DailyTable.from_boxscores([
+            boxscore([line(i, f"P{i}", blk=1) for i in range(1, 11)], []),
+        ])
+        blocks = table.leaders(top=1)["blocks"]
+        assert len(blocks["ranking"]) == 1 + EXTRA_TIES
+        assert blocks["tiedOut"] == 10 - 1 - EXTRA_TIES
+
+    def test_mask(self):
+        table = make_table()
+        leaders = table.leaders(mask=table.teams == "BOS")
+        assert leaders["points"]["players"] == [{"name": "C", "team": "BOS"}]
+
+    def test_team_leaders(self):
+        teams = make_table().team_leaders()
+        assert set(teams) == {"LAL", "BOS"}
+        assert teams["LAL"]["blocks"]["players"][0]["name"] == "B"
+
+    def test_totals_shape(self):
+        table = make_table()
+        totals = table.totals()
+        assert totals.shape == (len(CATEGORIES), 3)
+        assert np.array_equal(totals[list(CATEGORIES).index("pra")], [45, 26, 41])
+
+
+class TestTeamBoxscore:
+    def test_stats_and_leader(self):
+        totals = {"fgm": 40, "fga": 80, "fg3m": 12, "fg3a": 30, "ftm": 9, "fta": 0, "reb": 44}
+        leader = {"name": "A", "pts": 30, "reb": 5, "ast": 10}
+        entry = team_boxscore("Los Angeles Lakers", 101, totals, leader)
+        assert entry["stats"]["fg"] == "40/80"
+        assert entry["stats"]["fgPct"] == 0.5
+        assert entry["stats"]["threePtPct"] == 0.4
+        assert entry["stats"]["ftPct"] == 0
+        assert entry["stats"]["offRebounds"] == 0
+        assert entry["leader"] == {"name": "A", "points": 30, "rebounds": 5, "assists": 10}
+
+    def test_no_leader(self):
+        assert team_boxscore("X", 0, {})["leader"] == {"name": "", "points": 0, "rebounds": 0, "assists": 0}
+
+
+class TestDailyDigest:
+    def make_digest(self):
+        return DailyDigest([
+            boxscore(
+                [line(1, "A", pts=30, reb=5, ast=10, stl=1, blk=1, fg3m=4), line(2, "B", pts=12, reb=14, blk=4)],
+                [line(3, "C", pts=30, reb=10, ast=11, stl=3, fg3m=6), line(4, "D", pts=40, status="INACTIVE")],
+            ),
+            {},
+        ])
+
+    def test_table_holds_active_lines(self):
+        table = self.make_digest().table
+        assert list(table.ids) == [1, 2, 3]
+        assert list(table.values[:, COLUMNS.index("reb")]) == [5, 14, 10]
+
+    def test_double_and_triple_doubles(self):
+        digest = self.make_digest()
+        assert [(p["name"], p["categories"]) for p in digest.double_doubles] == [
+            ("A", ["pts", "ast"]), ("B", ["pts", "reb"]),
+        ]
+        assert [p["name"] for p in digest.triple_doubles] == ["C"]
+
+    def test_boxscore_leader_is_top_active_scorer(self):
+        teams = self.make_digest().boxscores[0]["teams"]
+        assert [t["leader"]["name"] for t in teams] == ["A", "C"]
+
+    def test_lines(self):
+        lines = self.make_digest().lines
+        assert [(p["id"], p["team"], p["seconds"]) for p in lines] == [
+            (1, "LAL", 1800), (2, "LAL", 1800), (3, "BOS", 1800),
+        ]
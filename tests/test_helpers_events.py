@@ -0,0 +1,91 @@
+"""Unit tests for helpers/events.py (game-state events and cache invalidation)."""
+from unittest.mock import MagicMock, patch
+
+from helpers.common import cache
+from helpers.events import (
+    FINAL,
+    NEW_SLATE,
+    PERIOD_END,
+    TIP_OFF,
+    EventBus,
+    GameStateTracker,
+    invalidate,
+)
+
+
+def game(game_id="0022600001", status=1, period=0):
+    return {"gameId": game_id, "gameStatus": status, "period": period}
+
+
+def kinds(events):
+    return [(event, g["gameId"] if g else None) for event, g in events]
+
+
+class TestGameStateTracker:
+    def test_lifecycle(self):
+        t = GameStateTracker(EventBus())
+        assert t.observe([game()]) == []
+        assert kinds(t.observe([game(status=2, period=1)])) == [(TIP_OFF, "0022600001")]
+        assert t.observe([game(status=2, period=1)]) == []
+        assert kinds(t.observe([game(status=2, period=2)])) == [(PERIOD_END, "0022600001")]
+        assert kinds(t.observe([game(status=3, period=4)])) == [(FINAL, "0022600001")]
+        assert t.observe([game(status=3, period=4)]) == []
+
+    def test_first_sight_compares_with_scheduled(self):
+        t = GameStateTracker(EventBus())
+        events = t.observe([game("a", status=2, period=3), game("b", status=3, period=4)])
+        assert kinds(events) == [(TIP_OFF, "a"), (FINAL, "b")]
+
+    def test_new_slate(self):
+        t = GameStateTracker(EventBus())
+        t.observe([game("a", status=3, period=4)])
+        assert kinds(t.observe([game("b")])) == [(NEW_SLATE, None)]
+
+    def test_empty_snapshot_keeps_state(self):
+        t = GameStateTracker(EventBus())
+        t.observe([game("a", status=3, period=4)])
+        assert t.observe([]) == []
+        assert t.observe([game("a", status=3, period=4)]) == []
+
+    def test_reset(self):
+        t = GameStateTracker(EventBus())
+        t.observe([game(status=3)])
+        t.reset()
+        assert kinds(t.observe([game(status=3)])) == [(FINAL, "0022600001")]
+
+    def test_status_and_live_games(self):
+        t = GameStateTracker(EventBus())
+        t.observe([game("a", status=2, period=1), game("b", status=3, period=4)])
+        assert (t.status("a"), t.status("b"), t.status("c")) == (2, 3, None)
+        assert t.has_live_games()
+        t.observe([game("a", status=3, period=4), game("b", status=3, period=4)])
+        assert not t.has_live_games()
+
+    def test_publishes_to_subscribers(self):
+        bus = EventBus()
+        handler = MagicMock()
+        bus.subscribe(FINAL, handler)
+        GameStateTracker(bus).observe([game(status=3)])
+        handler.assert_called_once_with(game(status=3))
+
+
+class TestEventBus:
+    def test_failing_handler_does_not_stop_others(self):
+        bus = EventBus()
+        calls = []
+        bus.subscribe(FINAL, MagicMock(side_effect=RuntimeError("boom")))
+        bus.on(FINAL, TIP_OFF)(calls.append)
+        with patch("helpers.events.log_exceptions") as log:
+            bus.publish(FINAL, "g")
+            bus.publish(TIP_OFF, "h")
+        log.assert_called_once()
+        assert calls == ["g", "h"]
+
+    def test_invalidate_keys_and_prefixes(self):
+        cache.clear()
+        for key in ("boxscores_0", "fantasy_0_abc", "fantasy_1_abc", "playoffs"):
+            cache.set(key, 1, 60)
+        invalidate("boxscores_0", prefixes=("fantasy_0_",))(None)
+        assert cache.get("boxscores_0") is None and cache.get("fantasy_0_abc") is None
+        assert cache.get("fantasy_1_abc") == 1 and cache.get("playoffs") == 1
+        cache.clear()
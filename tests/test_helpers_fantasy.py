@@ -0,0 +1,86 @@
+"""Unit tests for helpers/fantasy.py (profile scoring over the daily table)."""
+import pytest
+
+from helpers.daily import COLUMNS, DailyTable
+from helpers.fantasy import (
+    PROFILES,
+    fantasy_ranking,
+    get_profile,
+    parse_weights,
+    profile_hash,
+    score_lines,
+)
+
+
+def stat_line(**stats):
+    return [stats.get(c, 0) for c in COLUMNS]
+
+
+@pytest.fixture
+def table():
+    return DailyTable(
+        [1, 2, 3, 1],
+        ["Alpha", "Beta", "Gamma", "Alpha"],
+        ["LAL", "BOS", "BOS", "LAL"],
+        [
+            stat_line(pts=20, reb=10, ast=10, tov=2, seconds=2000),
+            stat_line(pts=30, reb=5, stl=2, fgm=12, fga=20, seconds=2100),
+            stat_line(pts=10, blk=3, seconds=900),
+            stat_line(pts=12, reb=4, seconds=1500),
+        ],
+    )
+
+
+class TestProfiles:
+    def test_builtin_default(self):
+        assert get_profile() == ("espn", PROFILES["espn"])
+        assert get_profile("fanduel")[1]["stl"] == 3
+
+    def test_custom_weights(self):
+        assert get_profile("espn", "pts:1, reb:1.2,dd:2") == ("custom", {"pts": 1, "reb": 1.2, "dd": 2})
+
+    @pytest.mark.parametrize("value", ["pts", "minutes:1", "seconds:1", "pts:x"])
+    def test_invalid_weights(self, value):
+        with pytest.raises(ValueError):
+            parse_weights(value)
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            get_profile("yahoo")
+
+    def test_hash_is_order_and_zero_insensitive(self):
+        assert profile_hash({"pts": 1, "reb": 1.2}) == profile_hash({"reb": 1.2, "pts": 1.0, "ast": 0})
+        assert profile_hash({"pts": 1}) != profile_hash({"pts": 2})
+
+
+class TestScoring:
+    def test_weights_and_bonuses(self, table):
+        points = score_lines(table, PROFILES["draftkings"])
+        # 20 + 12.5 + 15 - 1 + triple-double bonus 3 + double-double bonus 1.5
+        assert points[0] == pytest.approx(51.0)
+        assert points[2] == pytest.approx(16.0)
+
+    def test_shooting_weights(self, table):
+        assert score_lines(table, PROFILES["espn"])[1] == pytest.approx(30 + 5 + 8 + 24 - 20)
+
+    def test_espn_standard_scoring(self):
+        # 28 pts (10-20 FG, 3 3PM, 5-6 FT), 8 reb, 6 ast, 2 stl, 1 blk, 3 tov
+        line = stat_line(pts=28, reb=8, ast=6, stl=2, blk=1, fg3m=3, tov=3,
+                         fgm=10, fga=20, ftm=5, fta=6, seconds=2100)
+        table = DailyTable([1], ["Alpha"], ["LAL"], [line])
+        # 28 + 3 + (20 - 20) + (5 - 6) + 8 + 12 + 8 + 4 - 6
+        assert score_lines(table, PROFILES["espn"])[0] == pytest.approx(56)
+
+    def test_ranking_sums_games(self, table):
+        ranking = fantasy_ranking(table, {"pts": 1})
+        assert [(p["name"], p["points"], p["games"], p["average"]) for p in ranking] == [
+            ("Alpha", 32.0, 2, 16.0), ("Beta", 30.0, 1, 30.0), ("Gamma", 10.0, 1, 10.0),
+        ]
+
+    def test_ranking_top_and_mask(self, table):
+        assert [p["name"] for p in fantasy_ranking(table, {"pts": 1}, top=1)] == ["Alpha"]
+        ranking = fantasy_ranking(table, {"blk": 1}, mask=table.teams == "BOS")
+        assert [(p["name"], p["rank"]) for p in ranking] == [("Gamma", 1), ("Beta", 2)]
+
+    def test_empty(self, table):
+        assert fantasy_ranking(table, {"pts": 1}, mask=table.teams == "NYK") == []
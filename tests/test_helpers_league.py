@@ -0,0 +1,78 @@
+"""Unit tests for helpers/league.py (league percentile distributions)."""
+from unittest.mock import patch
+
+import pytest
+
+from helpers.common import cache
+from helpers.league import (
+    PERCENTILE_STATS,
+    LeaguePercentiles,
+    get_league_percentiles,
+    is_qualified,
+    with_percentiles,
+)
+
+
+def entry(pid, points, turnovers=2.0, gp=20, minutes=30.0):
+    row = {stat: 0.0 for stat in PERCENTILE_STATS}
+    row.update(id=pid, gp=gp, minutes=minutes, points=points, turnovers=turnovers)
+    return row
+
+
+ENTRIES = [
+    entry(1, 10.0, turnovers=1.0),
+    entry(2, 20.0, turnovers=2.0),
+    entry(3, 20.0, turnovers=3.0),
+    entry(4, 30.0, turnovers=4.0),
+    entry(5, 50.0, minutes=5.0),  # not qualified
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestLeaguePercentiles:
+    def test_qualification(self):
+        assert is_qualified(ENTRIES[0])
+        assert not is_qualified(ENTRIES[4])
+        assert not is_qualified(entry(6, 10.0, gp=2))
+
+    def test_share_at_or_below(self):
+        p = LeaguePercentiles(ENTRIES)
+        assert p.count == 4
+        assert p.percentile("points", 10.0) == 25.0
+        assert p.percentile("points", 20.0) == 75.0
+        assert p.percentile("points", 30.0) == 100.0
+        assert p.percentile("points", 5.0) == 0.0
+
+    def test_lower_is_better(self):
+        p = LeaguePercentiles(ENTRIES)
+        assert p.percentile("turnovers", 1.0) == 100.0
+        assert p.percentile("turnovers", 4.0) == 25.0
+
+    def test_unqualified_player_gets_percentiles(self):
+        p = LeaguePercentiles(ENTRIES)
+        assert p.percentiles(ENTRIES[4])["points"] == 100.0
+
+    def test_empty_league(self):
+        assert LeaguePercentiles([]).percentile("points", 10.0) == 0.0
+
+    def test_with_percentiles_copies(self):
+        p = LeaguePercentiles(ENTRIES)
+        result = with_percentiles(ENTRIES[1], p)
+        assert set(result["percentiles"]) == set(PERCENTILE_STATS)
+        assert "percentiles" not in ENTRIES[1]
+
+
+class TestGetLeaguePercentiles:
+    def test_rebuilt_only_with_the_table(self):
+        first_table = {e["id"]: e for e in ENTRIES}
+        with patch("helpers.league.get_league_season_table", return_value=first_table):
+            first = get_league_percentiles()
+            assert get_league_percentiles() is first
+        with patch("helpers.league.get_league_season_table", return_value=dict(first_table)):
+            assert get_league_percentiles() is not first
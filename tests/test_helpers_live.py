@@ -0,0 +1,284 @@
+"""Unit tests for helpers/live.py (scoreboard change detection and SSE fan-out)."""
+import asyncio
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+from helpers.common import cache
+from helpers.live import (
+    PlayerStatsHub,
+    ScoreboardBroadcaster,
+    build_scoreboard,
+    get_live_games,
+    put_dropping_oldest,
+    changed_games,
+    game_state,
+    sse_event,
+)
+
+
+def make_game(game_id="0022301234", home=50, away=48, clock="PT05M32.00S", status=2, text="Q2 5:32"):
+    return {
+        "gameId": game_id, "gameStatus": status, "gameStatusText": text,
+        "period": 2, "gameClock": clock,
+        "homeTeam": {"teamCity": "Los Angeles", "teamName": "Lakers", "teamTricode": "LAL", "score": home},
+        "awayTeam": {"teamCity": "Boston", "teamName": "Celtics", "teamTricode": "BOS", "score": away},
+        "gameLeaders": {
+            "homeLeaders": {"name": "LeBron James", "points": 20, "rebounds": 5, "assists": 4},
+            "awayLeaders": {"name": "Jayson Tatum", "points": 18, "rebounds": 6, "assists": 2},
+        },
+    }
+
+
+def parse_events(messages):
+    events = []
+    for message in messages:
+        lines = message.strip().split("\n")
+        events.append((lines[0][len("event: "):], json.loads(lines[1][len("data: "):])))
+    return events
+
+
+class TestChangedGames:
+    def test_new_game_is_changed(self):
+        assert changed_games({}, [make_game()]) == [make_game()]
+
+    def test_unchanged_game_skipped(self):
+        game = make_game()
+        assert changed_games({game["gameId"]: game_state(game)}, [game]) == []
+
+    def test_score_change_detected(self):
+        before = make_game()
+        after = make_game(home=52)
+        assert changed_games({before["gameId"]: game_state(before)}, [after]) == [after]
+
+    def test_clock_change_detected(self):
+        before = make_game()
+        after = make_game(clock="PT05M10.00S")
+        assert changed_games({before["gameId"]: game_state(before)}, [after]) == [after]
+
+
+class TestSseEvent:
+    def test_format(self):
+        assert sse_event("game", {"a": 1}) == 'event: game\ndata: {"a": 1}\n\n'
+
+
+class TestScoreboardBroadcaster:
+    def _run(self, snapshots, subscribers=1, messages=3):
+        """Subscribe clients and collect `messages` messages from each"""
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return snapshots[min(len(calls), len(snapshots)) - 1]
+
+        broadcaster = ScoreboardBroadcaster(fetch_games=fetch, interval=0.01)
+
+        async def collect():
+            async def client():
+                gen = broadcaster.subscribe()
+                out = [await gen.__anext__() for _ in range(messages)]
+                await gen.aclose()
+                return out
+            return await asyncio.gather(*(client() for _ in range(subscribers)))
+
+        with patch("helpers.live.schedule_ingest"):
+            return asyncio.run(collect()), calls, broadcaster
+
+    def test_snapshot_then_changes_only(self):
+        snapshots = [[make_game()], [make_game()], [make_game(home=53)]]
+        (messages,), _, _ = self._run(snapshots)
+        events = parse_events(messages)
+        assert events[0][0] == "snapshot"
+        assert events[1][0] == "game" and events[1][1]["homeTeam"]["score"] == 50
+        assert events[2][0] == "game" and events[2][1]["homeTeam"]["score"] == 53
+
+    def test_one_upstream_poll_fans_out(self):
+        snapshots = [[make_game()], [make_game(home=53)]]
+        results, calls, _ = self._run(snapshots, subscribers=5)
+        assert len(calls) <= 3
+        for messages in results:
+            assert parse_events(messages)[2][1]["homeTeam"]["score"] == 53
+
+    def test_polling_stops_without_subscribers(self):
+        _, _, broadcaster = self._run([[make_game()], [make_game(home=53)]])
+        assert broadcaster._subscribers == set()
+
+    def test_poll_refreshes_scoreboard_cache(self):
+        cache.clear()
+        self._run([[make_game()], [make_game(home=53)]])
+        assert cache.get("scoreboard")["games"][0]["gameId"] == "0022301234"
+        cache.clear()
+
+    def test_scoreboard_built_off_the_event_loop(self):
+        threads = []
+
+        def build(games):
+            threads.append(threading.current_thread())
+            return build_scoreboard(games)
+
+        with patch("helpers.live.build_scoreboard", side_effect=build):
+            self._run([[make_game()], [make_game(home=53)]])
+        assert threads and threading.main_thread() not in threads
+
+    def test_schedule_spaces_polls_and_cache(self):
+        schedule = MagicMock()
+        schedule.poll_interval.return_value = 0.01
+        schedule.ttl.return_value = 1234
+        cache.clear()
+        with patch.object(cache, "set", wraps=cache.set) as cache_set:
+            broadcaster = ScoreboardBroadcaster(fetch_games=lambda: [make_game()], interval=0.5, schedule=schedule)
+
+            async def collect():
+                gen = broadcaster.subscribe()
+                await gen.__anext__()
+                await asyncio.sleep(0.05)
+                await gen.aclose()
+
+            with patch("helpers.live.schedule_ingest"):
+                asyncio.run(collect())
+        schedule.poll_interval.assert_called_with(live_interval=0.5)
+        assert ("scoreboard", broadcaster._scoreboard, 1234) in [c.args for c in cache_set.call_args_list]
+        cache.clear()
+
+
+def make_boxscore(points=20):
+    def player(person_id, name, pts):
+        return {
+            "personId": person_id, "name": name, "status": "ACTIVE",
+            "statistics": {
+                "minutes": "PT20M00.00S", "points": pts, "threePointersMade": 1,
+                "threePointersAttempted": 3, "reboundsTotal": 5, "assists": 4,
+                "blocks": 0, "steals": 1, "turnovers": 2,
+            },
+        }
+    return {"game": {
+        "homeTeam": {"teamTricode": "LAL", "players": [player(2544, "LeBron James", points)]},
+        "awayTeam": {"teamTricode": "BOS", "players": [player(1629029, "Jayson Tatum", 18)]},
+    }}
+
+
+PLAYERS = {
+    2544: [2544, "LeBron James", 1610612747],
+    1629029: [1629029, "Jayson Tatum", 1610612738],
+    201939: [201939, "Stephen Curry", 1610612744],
+}
+
+
+def make_team_game(home_id=1610612747, away_id=1610612738):
+    game = make_game()
+    game["homeTeam"]["teamId"] = home_id
+    game["awayTeam"]["teamId"] = away_id
+    return game
+
+
+class TestPlayerStatsHub:
+    def _hub(self, boxscores, games=None):
+        fetched = []
+
+        def fetch_boxscore(game_id):
+            fetched.append(game_id)
+            return boxscores[min(len(fetched), len(boxscores)) - 1]
+
+        hub = PlayerStatsHub(
+            fetch_games=lambda: games if games is not None else [make_team_game()],
+            fetch_boxscore=fetch_boxscore,
+            interval=0.01,
+        )
+        return hub, fetched
+
+    def test_pushes_changes_to_subscribers_only(self):
+        hub, _ = self._hub([make_boxscore(20), make_boxscore(20), make_boxscore(22)])
+
+        async def run():
+            lebron, other = hub.connect(), hub.connect()
+            hub.subscribe(lebron, [2544])
+            hub.subscribe(other, [201939])
+            first = await asyncio.wait_for(lebron.get(), 1)
+            second = await asyncio.wait_for(lebron.get(), 1)
+            hub.disconnect(lebron)
+            hub.disconnect(other)
+            return first, second, other.qsize()
+
+        with patch("helpers.live.load_players_dict", return_value=PLAYERS):
+            first, second, other_pending = asyncio.run(run())
+        assert first["data"]["points"] == 20
+        assert second["data"]["points"] == 22
+        assert other_pending == 0
+
+    def test_reference_counted_subscriptions(self):
+        hub, _ = self._hub([make_boxscore()])
+
+        async def run():
+            a, b = hub.connect(), hub.connect()
+            hub.subscribe(a, [2544])
+            hub.subscribe(b, [2544, 1629029])
+            counts = dict(hub._refs)
+            hub.disconnect(a)
+            after_a = dict(hub._refs)
+            hub.unsubscribe(b, [2544, 1629029])
+            return counts, after_a, dict(hub._refs)
+
+        with patch("helpers.live.load_players_dict", return_value=PLAYERS):
+            counts, after_a, after_b = asyncio.run(run())
+        assert counts == {2544: 2, 1629029: 1}
+        assert after_a == {2544: 1, 1629029: 1}
+        assert after_b == {}
+
+    def test_only_relevant_games_fetched(self):
+        games = [make_team_game(), make_team_game(1610612744, 1610612743)]
+        games[1]["gameId"] = "0022309999"
+        hub, fetched = self._hub([make_boxscore()], games=games)
+
+        async def run():
+            queue = hub.connect()
+            hub.subscribe(queue, [2544])
+            await asyncio.wait_for(queue.get(), 1)
+            hub.disconnect(queue)
+
+        with patch("helpers.live.load_players_dict", return_value=PLAYERS):
+            asyncio.run(run())
+        assert set(fetched) == {"0022301234"}
+
+    def test_late_subscriber_gets_known_line(self):
+        hub, _ = self._hub([make_boxscore()])
+
+        async def run():
+            first = hub.connect()
+            hub.subscribe(first, [2544])
+            await asyncio.wait_for(first.get(), 1)
+            late = hub.connect()
+            known = hub.subscribe(late, [2544])
+            hub.disconnect(first)
+            hub.disconnect(late)
+            return known
+
+        with patch("helpers.live.load_players_dict", return_value=PLAYERS):
+            known = asyncio.run(run())
+        assert known[0]["points"] == 20
+
+
+class TestSharedLiveGames:
+    def test_scoreboard_build_feeds_the_hub(self):
+        cache.clear()
+        with patch("helpers.live.schedule_ingest"):
+            build_scoreboard([make_game()])
+        with patch("helpers.live.fetch_live_games") as fetch:
+            assert get_live_games()[0]["gameId"] == "0022301234"
+        fetch.assert_not_called()
+        cache.clear()
+
+    def test_fetched_once_per_ttl(self):
+        cache.clear()
+        with patch("helpers.live.fetch_live_games", return_value=[]) as fetch:
+            get_live_games()
+            get_live_games()
+        fetch.assert_called_once()
+        cache.clear()
+
+
+class TestPutDroppingOldest:
+    def test_full_queue_drops_oldest(self):
+        queue = asyncio.Queue(maxsize=2)
+        for message in (1, 2, 3):
+            put_dropping_oldest(queue, message)
+        assert [queue.get_nowait(), queue.get_nowait()] == [2, 3]
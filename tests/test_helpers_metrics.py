@@ -0,0 +1,115 @@
+"""Unit tests for helpers/metrics.py (vectorized per-game player metrics)."""
+import pytest
+
+from helpers.common import cache
+from helpers.metrics import get_game_metrics, player_metrics
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def make_player(pid, minutes="PT24M00.00S", status="ACTIVE", **overrides):
+    stats = {
+        "minutes": minutes, "points": 0, "reboundsTotal": 0, "reboundsOffensive": 0,
+        "reboundsDefensive": 0, "assists": 0, "steals": 0, "blocks": 0, "turnovers": 0,
+        "foulsPersonal": 0, "fieldGoalsMade": 0, "fieldGoalsAttempted": 0,
+        "threePointersMade": 0, "freeThrowsMade": 0, "freeThrowsAttempted": 0,
+    }
+    stats.update(overrides)
+    return {"personId": pid, "status": status, "statistics": stats}
+
+
+def make_boxscore(home, away, game_id="0022400001", home_score=100, status=3):
+    return {"game": {
+        "gameId": game_id, "gameStatus": status, "period": 4, "gameClock": "PT00M00.00S",
+        "homeTeam": {"score": home_score, "players": home},
+        "awayTeam": {"score": 90, "players": away},
+    }}
+
+
+STAR = dict(
+    points=30, fieldGoalsMade=11, fieldGoalsAttempted=20, threePointersMade=4,
+    freeThrowsMade=4, freeThrowsAttempted=5, reboundsTotal=10, reboundsOffensive=2,
+    reboundsDefensive=8, assists=8, steals=2, blocks=1, turnovers=4, foulsPersonal=3,
+)
+
+
+class TestPlayerMetrics:
+    def test_shooting_percentages(self):
+        m = player_metrics(make_boxscore([make_player(1, **STAR)], []))[1]
+        assert m["fgPct"] == 0.55
+        assert m["ftPct"] == 0.8
+        assert m["efgPct"] == 0.65
+        assert m["tsPct"] == round(30 / (2 * (20 + 0.44 * 5)), 3)
+
+    def test_game_score(self):
+        m = player_metrics(make_boxscore([make_player(1, **STAR)], []))[1]
+        expected = 30 + 0.4 * 11 - 0.7 * 20 - 0.4 * 1 + 0.7 * 2 + 0.3 * 8 + 2 + 0.7 * 8 + 0.7 * 1 - 0.4 * 3 - 4
+        assert m["gameScore"] == round(expected, 1)
+
+    def test_assist_turnover_ratio(self):
+        metrics = player_metrics(make_boxscore([make_player(1, **STAR), make_player(2, assists=5)], []))
+        assert metrics[1]["astTov"] == 2.0
+        assert metrics[2]["astTov"] == 5.0
+
+    def test_usage_rate_uses_own_team_only(self):
+        home = [
+            make_player(1, fieldGoalsAttempted=30),
+            make_player(2, fieldGoalsAttempted=10),
+        ]
+        away = [make_player(3, fieldGoalsAttempted=50)]
+        metrics = player_metrics(make_boxscore(home, away))
+        # 100 * possessions * (team minutes / 5) / (minutes * team possessions)
+        assert metrics[1]["usgPct"] == 30.0
+        assert metrics[2]["usgPct"] == 10.0
+        assert metrics[3]["usgPct"] == 20.0
+
+    def test_zero_attempts_and_minutes(self):
+        m = player_metrics(make_boxscore([make_player(1, minutes="PT00M00.00S")], []))[1]
+        assert m["fgPct"] == m["tsPct"] == m["usgPct"] == 0.0
+
+    def test_double_and_triple_doubles(self):
+        metrics = player_metrics(make_boxscore([
+            make_player(1, points=20, reboundsTotal=10),
+            make_player(2, points=10, reboundsTotal=10, assists=10),
+            make_player(3, points=40),
+        ], []))
+        assert metrics[1]["doubleDigitCategories"] == ["pts", "reb"]
+        assert metrics[1]["isDoubleDouble"] and not metrics[1]["isTripleDouble"]
+        assert metrics[2]["isTripleDouble"]
+        assert not metrics[3]["isDoubleDouble"]
+
+    def test_inactive_players_skipped(self):
+        metrics = player_metrics(make_boxscore([make_player(1), make_player(2, status="INACTIVE")], []))
+        assert list(metrics) == [1]
+
+    def test_empty_game(self):
+        assert player_metrics(make_boxscore([], [])) == {}
+
+
+class TestGetGameMetrics:
+    def test_computed_once_per_game_state(self, monkeypatch):
+        calls = []
+        import helpers.metrics as metrics_module
+        original = metrics_module.player_metrics
+
+        def counting(bs):
+            calls.append(bs)
+            return original(bs)
+
+        monkeypatch.setattr(metrics_module, "player_metrics", counting)
+        bs = make_boxscore([make_player(1, **STAR)], [])
+        first = get_game_metrics(bs)
+        assert get_game_metrics(bs) is first
+        assert len(calls) == 1
+
+        get_game_metrics(make_boxscore([make_player(1, **STAR)], [], home_score=102))
+        assert len(calls) == 2
+
+    def test_games_without_id_not_cached(self):
+        bs = make_boxscore([make_player(1, **STAR)], [], game_id=None)
+        assert get_game_metrics(bs) is not get_game_metrics(bs)
@@ -0,0 +1,198 @@
+"""Unit tests for helpers/pbp.py (live boxscores from play-by-play deltas)."""
+from unittest.mock import patch
+
+from helpers.pbp import LiveBoxScore, LiveGameEngine, action_increments, game_position
+
+LEBRON, AD, TATUM = 2544, 203076, 1628369
+
+
+def stats(**overrides):
+    base = {
+        "minutes": "PT10M00.00S", "points": 0, "fieldGoalsMade": 0, "fieldGoalsAttempted": 0,
+        "threePointersMade": 0, "threePointersAttempted": 0, "freeThrowsMade": 0,
+        "freeThrowsAttempted": 0, "reboundsTotal": 0, "reboundsOffensive": 0,
+        "reboundsDefensive": 0, "assists": 0, "steals": 0, "blocks": 0, "turnovers": 0,
+        "foulsPersonal": 0,
+    }
+    base.update(overrides)
+    return base
+
+
+def make_boxscore(lebron_points=0, status=2):
+    def player(pid, name, **s):
+        return {"personId": pid, "name": name, "status": "ACTIVE", "statistics": stats(**s)}
+    return {"game": {
+        "gameId": "0022400001", "gameStatus": status, "period": 1, "gameClock": "PT10M00.00S",
+        "homeTeam": {"teamTricode": "LAL", "score": lebron_points, "players": [
+            player(LEBRON, "LeBron James", points=lebron_points),
+            player(AD, "Anthony Davis"),
+        ]},
+        "awayTeam": {"teamTricode": "BOS", "score": 0, "players": [player(TATUM, "Jayson Tatum")]},
+    }}
+
+
+def action(number, kind, pid, **fields):
+    return {"actionNumber": number, "actionType": kind, "personId": pid, **fields}
+
+
+class TestActionIncrements:
+    def test_made_three_with_assist(self):
+        inc = action_increments(action(1, "3pt", LEBRON, shotResult="Made", assistPersonId=AD))
+        assert (LEBRON, "points", 3) in inc
+        assert (LEBRON, "threePointersMade", 1) in inc
+        assert (LEBRON, "fieldGoalsAttempted", 1) in inc
+        assert (AD, "assists", 1) in inc
+
+    def test_missed_two(self):
+        inc = action_increments(action(1, "2pt", LEBRON, shotResult="Missed"))
+        assert inc == [(LEBRON, "fieldGoalsAttempted", 1)]
+
+    def test_free_throws(self):
+        assert (LEBRON, "points", 1) in action_increments(action(1, "freethrow", LEBRON, shotResult="Made"))
+        assert action_increments(action(1, "freethrow", LEBRON, shotResult="Missed")) == [
+            (LEBRON, "freeThrowsAttempted", 1)
+        ]
+
+    def test_offensive_rebound(self):
+        inc = action_increments(action(1, "rebound", AD, subType="offensive"))
+        assert inc == [(AD, "reboundsTotal", 1), (AD, "reboundsOffensive", 1)]
+
+    def test_technical_foul_not_personal(self):
+        assert action_increments(action(1, "foul", AD, subType="technical")) == []
+        assert action_increments(action(1, "foul", AD, subType="personal")) == [(AD, "foulsPersonal", 1)]
+
+    def test_ignored_actions(self):
+        assert action_increments(action(1, "substitution", AD)) == []
+
+
+class TestGamePosition:
+    def test_later_clock_sorts_after(self):
+        assert game_position(1, "PT11M00.00S") < game_position(1, "PT02M00.00S") < game_position(2, "PT12M00.00S")
+
+    def test_unknown(self):
+        assert game_position(None, "PT11M00.00S") is None
+        assert game_position(1, "") is None
+
+
+class TestLiveBoxScore:
+    def test_apply_updates_players_and_score(self):
+        state = LiveBoxScore(make_boxscore())
+        changed = state.apply([
+            action(5, "2pt", LEBRON, shotResult="Made", assistPersonId=AD, scoreHome="2", scoreAway="0"),
+            action(6, "rebound", TATUM, subType="defensive"),
+        ])
+        assert changed == {LEBRON, AD, TATUM}
+        game = state.boxscore["game"]
+        assert game["homeTeam"]["players"][0]["statistics"]["points"] == 2
+        assert game["homeTeam"]["players"][1]["statistics"]["assists"] == 1
+        assert game["homeTeam"]["score"] == 2
+        assert state.last_action == 6
+
+    def test_old_actions_skipped(self):
+        state = LiveBoxScore(make_boxscore())
+        state.apply([action(5, "2pt", LEBRON, shotResult="Made")])
+        assert state.apply([action(5, "2pt", LEBRON, shotResult="Made")]) == set()
+        assert state.boxscore["game"]["homeTeam"]["players"][0]["statistics"]["points"] == 2
+
+    def test_source_not_mutated(self):
+        bs = make_boxscore()
+        LiveBoxScore(bs).apply([action(1, "2pt", LEBRON, shotResult="Made")])
+        assert bs["game"]["homeTeam"]["players"][0]["statistics"]["points"] == 0
+
+    def test_mismatches(self):
+        state = LiveBoxScore(make_boxscore())
+        state.apply([action(1, "2pt", LEBRON, shotResult="Made", assistPersonId=AD)])
+        assert state.mismatches(make_boxscore()) == [LEBRON, AD]
+
+
+class TestLiveGameEngine:
+    def _engine(self, boxscores, feeds, sync_interval=60):
+        calls = {"boxscore": 0, "actions": 0}
+
+        def fetch_boxscore(game_id):
+            calls["boxscore"] += 1
+            return boxscores[min(calls["boxscore"], len(boxscores)) - 1]
+
+        def fetch_actions(game_id):
+            calls["actions"] += 1
+            return feeds[min(calls["actions"], len(feeds)) - 1]
+
+        return LiveGameEngine(fetch_boxscore, fetch_actions, sync_interval), calls
+
+    def test_seed_does_not_replay_existing_actions(self):
+        feed = [action(1, "2pt", LEBRON, shotResult="Made")]
+        engine, calls = self._engine([make_boxscore(lebron_points=2)], [feed])
+        bs = engine.boxscore("0022400001")
+        assert bs["game"]["homeTeam"]["players"][0]["statistics"]["points"] == 2
+        assert calls == {"boxscore": 1, "actions": 1}
+
+    def test_refresh_applies_only_new_actions(self):
+        first = [action(1, "2pt", LEBRON, shotResult="Made")]
+        second = first + [action(2, "3pt", LEBRON, shotResult="Made")]
+        engine, calls = self._engine([make_boxscore(lebron_points=2)], [first, second])
+        engine.boxscore("0022400001")
+        bs = engine.boxscore("0022400001")
+        assert bs["game"]["homeTeam"]["players"][0]["statistics"]["points"] == 5
+        assert calls["boxscore"] == 1
+
+    def test_periodic_full_sync_replaces_state(self):
+        engine, calls = self._engine(
+            [make_boxscore(lebron_points=0), make_boxscore(lebron_points=4)],
+            [[], [action(1, "2pt", LEBRON, shotResult="Made")], [action(1, "2pt", LEBRON, shotResult="Made")]],
+            sync_interval=0,
+        )
+        engine.boxscore("0022400001")
+        with patch("helpers.pbp.logger") as logger:
+            bs = engine.boxscore("0022400001")
+        assert calls["boxscore"] == 2
+        assert bs["game"]["homeTeam"]["players"][0]["statistics"]["points"] == 4
+        logger.warning.assert_called_once()
+
+    def test_final_game_not_refreshed(self):
+        engine, calls = self._engine([make_boxscore(status=3)], [[]], sync_interval=0)
+        engine.boxscore("0022400001")
+        engine.boxscore("0022400001")
+        assert calls == {"boxscore": 1, "actions": 1}
+
+    def test_seed_replays_actions_after_the_boxscore_clock(self):
+        # The boxscore stands at Q1 10:00; the feed already has a basket at 9:40
+        feed = [
+            action(1, "2pt", LEBRON, shotResult="Made", period=1, clock="PT10M30.00S"),
+            action(2, "3pt", LEBRON, shotResult="Made", period=1, clock="PT09M40.00S"),
+        ]
+        engine, calls = self._engine([make_boxscore(lebron_points=2)], [feed])
+        engine.boxscore("0022400001")
+        bs = engine.boxscore("0022400001")
+        assert bs["game"]["homeTeam"]["players"][0]["statistics"]["points"] == 5
+
+    def test_seed_replays_same_second_free_throws_past_the_boxscore(self):
+        # Fouled on a made two at 9:40; the boxscore has the basket but not the and-one
+        feed = [
+            action(1, "2pt", LEBRON, shotResult="Made", period=1, clock="PT09M40.00S", scoreHome="2", scoreAway="0"),
+            action(2, "foul", TATUM, period=1, clock="PT09M40.00S", scoreHome="2", scoreAway="0"),
+            action(3, "freethrow", LEBRON, shotResult="Made", period=1, clock="PT09M40.00S",
+                   scoreHome="3", scoreAway="0"),
+        ]
+        bs = make_boxscore(lebron_points=2)
+        bs["game"]["gameClock"] = "PT09M40.00S"
+        engine, _ = self._engine([bs], [feed])
+        engine.boxscore("0022400001")
+        bs = engine.boxscore("0022400001")
+        assert bs["game"]["homeTeam"]["players"][0]["statistics"]["points"] == 3
+
+    def test_feed_read_before_boxscore(self):
+        order = []
+        engine = LiveGameEngine(
+            lambda gid: order.append("boxscore") or make_boxscore(),
+            lambda gid: order.append("actions") or [],
+        )
+        engine.boxscore("0022400001")
+        assert order == ["actions", "boxscore"]
+
+    def test_fetch_error_returns_none(self):
+        def boom(game_id):
+            raise ConnectionError("cdn down")
+
+        engine = LiveGameEngine(boom, boom)
+        with patch("helpers.pbp.log_exceptions"):
+            assert engine.boxscore("0022400001") is None
@@ -0,0 +1,119 @@
+"""Unit tests for helpers/playoffs.py (Monte Carlo playoff seeding)."""
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from helpers.common import cache
+from helpers.events import tracker
+from helpers.playoffs import (
+    get_remaining_games,
+    home_win_probabilities,
+    simulate_seeding,
+    team_strength,
+)
+from helpers.scheduler import SeasonSchedule
+from helpers.seeding import results
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    tracker.reset()
+    yield
+    cache.clear()
+    tracker.reset()
+
+
+def rng():
+    return np.random.default_rng(7)
+
+
+class TestWinProbabilities:
+    def test_strength_regressed_to_500(self):
+        assert team_strength(np.array([5.0]), np.array([0.0]))[0] == pytest.approx(10 / 15)
+        assert team_strength(np.array([0.0]), np.array([0.0]))[0] == 0.5
+
+    def test_equal_teams_home_edge(self):
+        p = home_win_probabilities(np.array([0.5, 0.5]), np.array([0]), np.array([1]))
+        assert 0.55 < p[0] < 0.57
+
+    def test_better_team_favoured_on_road(self):
+        p = home_win_probabilities(np.array([0.3, 0.7]), np.array([0]), np.array([1]))
+        assert p[0] < 0.25
+
+
+class TestSimulateSeeding:
+    def test_probabilities_sum_to_one(self):
+        results = simulate_seeding([30, 25, 20], [20, 25, 30], ["E", "E", "E"], [32, 32, 32],
+                                   n_simulations=2000, rng=rng())
+        for team in results:
+            assert sum(team["seedProbabilities"]) == pytest.approx(1, abs=1e-3)
+        for seed in range(3):
+            assert sum(t["seedProbabilities"][seed] for t in results) == pytest.approx(1, abs=1e-3)
+
+    def test_season_over_is_deterministic(self):
+        results = simulate_seeding([50, 40], [32, 42], ["E", "E"], [0, 0], n_simulations=500, rng=rng())
+        assert results[0]["seedProbabilities"] == [1.0, 0.0]
+        assert results[0]["projectedWins"] == 50
+
+    def test_conferences_seeded_separately(self):
+        results = simulate_seeding([50, 10], [32, 72], ["East", "West"], [0, 0], n_simulations=100, rng=rng())
+        assert results[0]["seedProbabilities"] == [1.0]
+        assert results[1]["seedProbabilities"] == [1.0]
+
+    def test_schedule_games_counted(self):
+        # Two teams, ten games left against each other
+        games = ([0] * 5 + [1] * 5, [1] * 5 + [0] * 5)
+        results = simulate_seeding([30, 30], [42, 42], ["E", "E"], [10, 10], games, n_simulations=2000, rng=rng())
+        assert results[0]["projectedWins"] + results[1]["projectedWins"] == pytest.approx(70, abs=0.2)
+
+    def test_play_in_and_elimination_buckets(self):
+        wins = list(range(60, 45, -1))
+        results = simulate_seeding(wins, [82 - w for w in wins], ["E"] * 15, [0] * 15,
+                                   n_simulations=100, rng=rng())
+        assert results[0]["top6"] == 1
+        assert results[7]["playIn"] == 1
+        assert results[14]["eliminated"] == 1
+
+    def test_ties_broken_randomly(self):
+        results = simulate_seeding([41, 41], [41, 41], ["E", "E"], [0, 0], n_simulations=4000, rng=rng())
+        assert results[0]["seedProbabilities"][0] == pytest.approx(0.5, abs=0.05)
+
+
+class TestRemainingGames:
+    NOW = datetime(2025, 1, 10, 12, tzinfo=timezone.utc)
+
+    def _schedule(self, games):
+        cache.set("season_schedule", SeasonSchedule(games), 60)
+
+    def _game(self, game_id, status=1, home=1, away=2, tip_off=datetime(2025, 1, 11, 0, tzinfo=timezone.utc)):
+        return {"gameId": game_id, "gameDate": "2025-01-10", "tipOff": tip_off, "gameStatus": status,
+                "homeTeamId": home, "awayTeamId": away}
+
+    def test_only_unplayed_regular_season_games(self):
+        self._schedule([
+            self._game("0022400001", status=3),
+            self._game("0022400002", home=2, away=1),
+            self._game("0012400003"),  # preseason
+        ])
+        with patch("helpers.scheduler.fetch_season_schedule") as mock:
+            assert get_remaining_games(self.NOW) == [(2, 1)]
+        mock.assert_not_called()
+
+    def test_games_played_since_the_schedule_loaded_are_skipped(self):
+        self._schedule([
+            self._game("0022400001"),  # final on the live scoreboard
+            self._game("0022400002"),  # result stored
+            self._game("0022400003", tip_off=datetime(2025, 1, 9, 0, tzinfo=timezone.utc)),  # window passed
+            self._game("0022400004", tip_off=None),  # time to be determined
+            self._game("0022400005"),  # live
+        ])
+        tracker.observe([{"gameId": "0022400001", "gameStatus": 3}, {"gameId": "0022400005", "gameStatus": 2}])
+        results.add_game("0022400002", 1, 2, 100, 90)
+        assert get_remaining_games(self.NOW) == [(1, 2), (1, 2)]
+
+    def test_unknown_schedule_returns_none(self):
+        self._schedule(None)
+        assert get_remaining_games(self.NOW) is None
@@ -0,0 +1,169 @@
+"""Unit tests for helpers/scheduler.py (schedule-aware polling cadence)."""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from helpers.common import CACHE_TTL, cache
+from helpers.events import tracker
+from helpers.scheduler import (
+    IDLE_POLL_INTERVAL,
+    SCHEDULE_RETRY,
+    SCHEDULE_RETRY_MAX,
+    PollingScheduler,
+    SeasonSchedule,
+    fetch_season_schedule,
+)
+
+
+def utc(day, hour, minute=0):
+    return datetime(2026, 1, day, hour, minute, tzinfo=timezone.utc)
+
+
+def game(game_id, game_date, tip_off, status=1, home=1, away=2):
+    return {"gameId": game_id, "gameDate": game_date, "tipOff": tip_off, "gameStatus": status,
+            "homeTeamId": home, "awayTeamId": away}
+
+
+# Two staggered games on Jan 10 (ET), one late game on Jan 11 and one without a time yet
+GAMES = [
+    game("g1", "2026-01-10", utc(11, 0)),
+    game("g2", "2026-01-10", utc(11, 2, 30)),
+    game("g3", "2026-01-11", utc(12, 3)),
+    game("g4", "2026-01-20", None),
+]
+
+
+def inline(fn, *args):
+    return fn(*args)
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    cache.clear()
+    tracker.reset()
+    yield
+    cache.clear()
+    tracker.reset()
+
+
+@pytest.fixture
+def scheduler():
+    cache.set("season_schedule", SeasonSchedule(GAMES), 60)
+    return PollingScheduler()
+
+
+class TestSeasonSchedule:
+    def test_slate_windows_merged(self):
+        schedule = SeasonSchedule(GAMES)
+        assert schedule.day_windows("2026-01-10") == [(utc(10, 23, 45), utc(11, 5, 30))]
+        assert schedule.days["2026-01-10"][0][2] == {"g1", "g2"}
+        assert schedule.day_windows("2026-01-12") == []
+
+    def test_window_at(self):
+        schedule = SeasonSchedule(GAMES)
+        assert schedule.window_at(utc(11, 4))[2] == {"g1", "g2"}
+        assert schedule.window_at(utc(11, 12)) is None
+        assert schedule.window_at(utc(1, 0)) is None
+
+    def test_next_start(self):
+        schedule = SeasonSchedule(GAMES)
+        assert schedule.next_start(utc(11, 12)) == utc(12, 2, 45)
+        assert schedule.next_start(utc(13, 0)) is None
+
+    def test_games_without_tip_off_have_no_window(self):
+        schedule = SeasonSchedule(GAMES)
+        assert len(schedule.games) == 4
+        assert schedule.day_windows("2026-01-20") == []
+
+    def test_unknown(self):
+        assert not SeasonSchedule(None).known
+        assert SeasonSchedule([]).known
+
+
+class TestFetchSeasonSchedule:
+    def test_parses_rows(self):
+        m = MagicMock()
+        m.return_value.season_games.get_dict.return_value = {
+            "headers": ["gameId", "gameDateEst", "gameDateTimeUTC", "gameStatus", "homeTeam_teamId", "awayTeam_teamId"],
+            "data": [
+                ["g1", "2026-01-10T00:00:00Z", "2026-01-11T00:00:00Z", 1, 1, 2],
+                ["g2", "2026-01-10T00:00:00Z", None, 1, 2, 1],  # time to be determined
+            ],
+        }
+        with patch("helpers.scheduler.scheduleleaguev2.ScheduleLeagueV2", m):
+            assert fetch_season_schedule() == [
+                game("g1", "2026-01-10", utc(11, 0)),
+                game("g2", "2026-01-10", None, home=2, away=1),
+            ]
+
+
+class TestPollingScheduler:
+    def test_schedule_loaded_once(self):
+        with patch("helpers.scheduler.fetch_season_schedule", return_value=GAMES) as mock:
+            s = PollingScheduler(submit=inline)
+            assert s.schedule().known
+            s.schedule()
+        mock.assert_called_once()
+
+    def test_reload_runs_in_background(self):
+        submitted = []
+        s = PollingScheduler(submit=lambda fn, *args: submitted.append((fn, args)))
+        assert not s.schedule().known  # nothing loaded yet: poll as if live
+        s.schedule()
+        assert len(submitted) == 1  # one refresh in flight at a time
+        refresh, _ = submitted[0]
+        refresh(lambda: GAMES)
+        assert s.schedule().known
+
+    def test_last_good_schedule_served_while_upstream_is_down(self):
+        s = PollingScheduler(submit=inline)
+        s.refresh(lambda: GAMES)
+        cache.clear()
+        with patch("helpers.scheduler.fetch_season_schedule", side_effect=ConnectionError), \
+             patch("helpers.scheduler.log_exceptions"):
+            schedule = s.schedule()
+        assert schedule.known and not s.is_live(utc(11, 12))
+
+    def test_retries_back_off(self):
+        s = PollingScheduler(submit=inline)
+        ttls = []
+        with patch("helpers.scheduler.log_exceptions"), patch.object(cache, "set") as cache_set:
+            for _ in range(9):
+                s.refresh(Mock(side_effect=ConnectionError))
+                ttls.append(cache_set.call_args.args[2])
+        assert ttls[:3] == [SCHEDULE_RETRY, SCHEDULE_RETRY * 2, SCHEDULE_RETRY * 4]
+        assert ttls[-1] == SCHEDULE_RETRY_MAX
+
+    def test_unavailable_schedule_polls_as_if_live(self):
+        with patch("helpers.scheduler.fetch_season_schedule", side_effect=ConnectionError), \
+             patch("helpers.scheduler.log_exceptions"):
+            s = PollingScheduler(submit=inline)
+            assert s.is_live(utc(11, 12))
+
+    def test_live_inside_window(self, scheduler):
+        assert scheduler.is_live(utc(11, 1))
+        assert scheduler.poll_interval(utc(11, 1), live_interval=2) == 2
+        assert scheduler.ttl("scoreboard", utc(11, 1)) == CACHE_TTL["scoreboard"]
+
+    def test_window_ends_early_once_all_games_final(self, scheduler):
+        tracker.observe([{"gameId": "g1", "gameStatus": 3}, {"gameId": "g2", "gameStatus": 3}])
+        assert not scheduler.is_live(utc(11, 4))
+
+    def test_live_game_outlasts_window(self, scheduler):
+        tracker.observe([{"gameId": "g2", "gameStatus": 2, "period": 5}])
+        assert scheduler.is_live(utc(11, 6))
+
+    def test_idle_waits_for_next_window(self, scheduler):
+        assert not scheduler.is_live(utc(12, 2, 40))
+        assert scheduler.poll_interval(utc(12, 2, 40)) == 300
+        assert scheduler.ttl("scoreboard", utc(12, 2, 40)) == 300
+
+    def test_idle_capped(self, scheduler):
+        assert scheduler.poll_interval(utc(11, 12)) == IDLE_POLL_INTERVAL
+        assert scheduler.ttl("scoreboard", utc(11, 12)) == IDLE_POLL_INTERVAL
+        assert scheduler.ttl("historical", utc(11, 12)) == CACHE_TTL["historical"]
+        assert scheduler.poll_interval(utc(20, 0)) == IDLE_POLL_INTERVAL
+
+    def test_never_faster_than_live(self, scheduler):
+        almost = utc(12, 2, 45) - timedelta(seconds=1)
+        assert scheduler.poll_interval(almost, live_interval=5) == 5
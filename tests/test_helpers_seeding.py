@@ -0,0 +1,116 @@
+"""Unit tests for helpers/seeding.py (tiebreak-aware conference seeding)."""
+import helpers.store as store
+from helpers.seeding import GameResults, SeedingEngine
+
+# Three teams in the Atlantic, one in the Central
+BOS, NYK, PHI, CHI = 1, 2, 3, 4
+INFO = {
+    BOS: ("East", "Atlantic"),
+    NYK: ("East", "Atlantic"),
+    PHI: ("East", "Atlantic"),
+    CHI: ("East", "Central"),
+}
+_game_ids = iter(range(1, 10000))
+
+
+def play(results, winner, loser, margin=5):
+    results.add_game(f"00225{next(_game_ids):05d}", winner, loser, 100 + margin, 100)
+
+
+class TestGameResults:
+    def test_head_to_head_and_point_diff(self):
+        results = GameResults()
+        play(results, BOS, NYK, margin=10)
+        play(results, NYK, BOS, margin=3)
+        play(results, BOS, NYK)
+        assert results.record_against(BOS, {NYK}) == (2, 1)
+        assert results.point_diff[BOS] == 12
+        assert results.point_diff[NYK] == -12
+
+    def test_duplicate_game_counted_once(self):
+        results = GameResults()
+        results.add_game("0022500001", BOS, NYK, 110, 100)
+        results.add_game("0022500001", BOS, NYK, 110, 100)
+        assert results.record_against(BOS, {NYK}) == (1, 0)
+
+    def test_refresh_is_incremental(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(store, "STATS_DB_FILE", str(tmp_path / "stats.db"))
+        conn = store.connect()
+
+        def insert(game_id, home, away, home_score, away_score):
+            conn.execute(
+                "INSERT OR REPLACE INTO games VALUES (?, '2025-11-01', ?, ?, ?, ?)",
+                (game_id, home, away, home_score, away_score),
+            )
+            conn.commit()
+
+        results = GameResults(season_prefix="00225")
+        insert("0022500001", BOS, NYK, 110, 100)
+        insert("0022400001", NYK, BOS, 110, 100)  # previous season
+        results.refresh(conn)
+        assert results.record_against(BOS, {NYK}) == (1, 0)
+
+        insert("0022500002", NYK, BOS, 110, 100)
+        insert("0022500001", BOS, NYK, 110, 100)  # re-ingested, new rowid
+        results.refresh(conn)
+        assert results.record_against(BOS, {NYK}) == (1, 1)
+        conn.close()
+
+
+class TestSeedingEngine:
+    def test_sorted_by_record(self):
+        records = {BOS: (50, 20), NYK: (40, 30), PHI: (30, 40), CHI: (45, 25)}
+        engine = SeedingEngine(GameResults(), records, INFO)
+        assert engine.seed_conference("East") == [BOS, CHI, NYK, PHI]
+
+    def test_two_team_tie_head_to_head(self):
+        results = GameResults()
+        play(results, NYK, BOS)
+        play(results, NYK, BOS)
+        play(results, BOS, NYK)
+        records = {BOS: (50, 20), NYK: (50, 20), PHI: (30, 40), CHI: (20, 50)}
+        assert SeedingEngine(results, records, INFO).seed_conference("East")[:2] == [NYK, BOS]
+
+    def test_two_team_tie_division_leader(self):
+        # NYK and CHI tied, split head-to-head; CHI leads its division, NYK trails BOS
+        results = GameResults()
+        play(results, NYK, CHI)
+        play(results, CHI, NYK)
+        records = {BOS: (55, 15), NYK: (45, 25), PHI: (30, 40), CHI: (45, 25)}
+        assert SeedingEngine(results, records, INFO).seed_conference("East") == [BOS, CHI, NYK, PHI]
+
+    def test_division_record_for_same_division(self):
+        results = GameResults()
+        play(results, BOS, NYK)
+        play(results, NYK, BOS)
+        play(results, NYK, PHI)
+        play(results, PHI, BOS)
+        records = {BOS: (40, 30), NYK: (40, 30), PHI: (50, 20), CHI: (20, 50)}
+        assert SeedingEngine(results, records, INFO).seed_conference("East")[1:3] == [NYK, BOS]
+
+    def test_three_team_tie_division_leader_first(self):
+        # PHI leads the Atlantic on a tiebreak-free record; three teams tied behind it
+        results = GameResults()
+        play(results, BOS, CHI)
+        play(results, BOS, NYK)
+        play(results, NYK, CHI)
+        records = {PHI: (60, 10), BOS: (40, 30), NYK: (40, 30), CHI: (40, 30)}
+        # CHI leads the Central, so it is separated first; BOS then beats NYK head-to-head
+        assert SeedingEngine(results, records, INFO).seed_conference("East") == [PHI, CHI, BOS, NYK]
+
+    def test_point_differential_last(self):
+        results = GameResults()
+        play(results, BOS, NYK, margin=20)
+        play(results, NYK, BOS, margin=2)
+        records = {BOS: (40, 30), NYK: (40, 30), PHI: (50, 20), CHI: (60, 10)}
+        engine = SeedingEngine(results, records, {**INFO, CHI: ("East", "Atlantic")})
+        # Same division record (1-1) and conference record: point differential decides
+        assert engine.seed_conference("East")[2:] == [BOS, NYK]
+
+    def test_hypothetical_records(self):
+        engine = SeedingEngine(GameResults(), {BOS: (0, 0), NYK: (1, 0), PHI: (0, 1), CHI: (0, 0)}, INFO)
+        assert engine.seed_conference("East")[0] == NYK
+
+    def test_other_conference_empty(self):
+        engine = SeedingEngine(GameResults(), {BOS: (1, 0)}, {BOS: INFO[BOS]})
+        assert engine.seed_conference("West") == []
@@ -0,0 +1,81 @@
+"""Unit tests for helpers/similarity.py (per-36 nearest-neighbour index)."""
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from helpers.common import cache
+from helpers.similarity import (
+    FEATURES,
+    SimilarityIndex,
+    get_similarity_index,
+    seconds_until_refresh,
+)
+
+
+def player(pid, name, minutes=30.0, gp=20, **stats):
+    row = {"id": pid, "name": name, "team": "LAL", "gp": gp, "minutes": minutes}
+    row.update({f: 0.0 for f in FEATURES})
+    row.update(stats)
+    return row
+
+
+SCORER = dict(points=25.0, fga=20.0, fta=6.0, assists=4.0, rebounds=5.0, fgPct=46.0)
+BIG = dict(points=12.0, rebounds=11.0, blocks=2.0, fga=9.0, fgPct=60.0)
+
+PLAYERS = [
+    player(1, "Scorer A", **SCORER),
+    # Same rates in fewer minutes: identical per-36 profile
+    player(2, "Scorer B", minutes=15.0, **{k: v / 2 if k != "fgPct" else v for k, v in SCORER.items()}),
+    player(3, "Big A", **BIG),
+    player(4, "Big B", **{**BIG, "rebounds": 10.0}),
+    player(5, "Bench", minutes=5.0, **SCORER),
+    player(6, "Rookie", gp=2, **SCORER),
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestSimilarityIndex:
+    def test_qualified_players_only(self):
+        index = SimilarityIndex(PLAYERS)
+        assert 1 in index and 4 in index
+        assert 5 not in index and 6 not in index
+
+    def test_per36_scaling(self):
+        index = SimilarityIndex(PLAYERS)
+        assert index.per36_stats(index.position[2])["points"] == 30.0
+        assert index.per36_stats(index.position[2])["fgPct"] == 46.0
+
+    def test_nearest_neighbours(self):
+        index = SimilarityIndex(PLAYERS)
+        similar = index.similar(1, k=3)
+        assert similar[0]["id"] == 2
+        assert similar[0]["similarity"] == pytest.approx(1.0)
+        assert similar[-1]["similarity"] < 0
+        assert index.similar(3, k=1)[0]["name"] == "Big B"
+
+    def test_k_is_capped_by_league_size(self):
+        assert len(SimilarityIndex(PLAYERS).similar(1, k=10)) == 3
+
+    def test_single_player(self):
+        index = SimilarityIndex(PLAYERS[:1])
+        assert index.similar(1) == []
+
+
+class TestRefresh:
+    def test_seconds_until_refresh(self):
+        assert seconds_until_refresh(datetime(2026, 10, 20, 8, 0, tzinfo=timezone.utc)) == 3600
+        assert seconds_until_refresh(datetime(2026, 10, 20, 9, 0, tzinfo=timezone.utc)) == 86400
+
+    def test_index_cached(self):
+        table = {p["id"]: p for p in PLAYERS}
+        with patch("helpers.similarity.get_league_season_table", return_value=table) as mock:
+            first = get_similarity_index()
+            assert get_similarity_index() is first
+        mock.assert_called_once()
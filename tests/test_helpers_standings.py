@@ -0,0 +1,126 @@
+"""Unit tests for helpers/standings.py (standings patched from live finals)."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import helpers.standings as standings
+from helpers.common import cache
+from helpers.seeding import GameResults
+
+BOS, NYK, OKC = 1610612738, 1610612752, 1610612760
+
+
+def row(team_id, city, name, conf, division, rank, wins, losses, streak="W 2", l10="7-3", gb=0.0):
+    r = [None] * 40
+    r[2], r[3], r[4], r[5], r[7], r[9] = team_id, city, name, conf, rank, division
+    r[12], r[13], r[14] = wins, losses, wins / (wins + losses)
+    r[17], r[18], r[19] = "20-10", "15-15", l10
+    r[36], r[37] = streak, gb
+    return r
+
+
+ROWS = [
+    row(BOS, "Boston", "Celtics", "East", "Atlantic", 1, 35, 25),
+    row(NYK, "New York", "Knicks", "East", "Atlantic", 2, 35, 26, streak="L 1", gb=0.5),
+    row(OKC, "Oklahoma City", "Thunder", "West", "Northwest", 1, 50, 10),
+]
+
+
+def final_game(home_id, away_id, home_score, away_score, home_record, away_record, game_id="0022500900"):
+    return {
+        "gameId": game_id, "gameStatus": 3,
+        "homeTeam": {"teamId": home_id, "score": home_score, "wins": home_record[0], "losses": home_record[1]},
+        "awayTeam": {"teamId": away_id, "score": away_score, "wins": away_record[0], "losses": away_record[1]},
+    }
+
+
+@pytest.fixture(autouse=True)
+def setup():
+    cache.clear()
+    mock = MagicMock()
+    mock.return_value.get_dict.return_value = {"resultSets": [{"rowSet": ROWS}]}
+    with patch("helpers.standings.leaguestandings.LeagueStandings", mock), \
+         patch("helpers.standings.seeding_results", GameResults()), \
+         patch("helpers.standings.get_team_results", return_value=[]):
+        yield mock
+    cache.clear()
+
+
+class TestHelpers:
+    def test_bump_streak(self):
+        assert standings._bump_streak("W 2", True) == "W 3"
+        assert standings._bump_streak("W3", False) == "L1"
+        assert standings._bump_streak("-", True) == "W1"
+
+    def test_bump_record(self):
+        assert standings._bump_record("20-10", False) == "20-11"
+
+
+class TestLiveStandings:
+    def test_snapshot_served_until_reconcile(self, setup):
+        first = standings.get_live_standings()
+        second = standings.get_live_standings()
+        assert first is second
+        assert [t["name"] for t in first["east"]] == ["Boston Celtics", "New York Knicks"]
+        assert first["east"][1]["gamesBack"] == 0.5
+        setup.assert_called_once()
+
+    def test_final_game_updates_records(self):
+        # Stored results cover every final game, so the conference is re-seeded
+        for i in range(121):
+            standings.seeding_results.add_game(f"00225{i:05d}", 0, -1, 100, 90)
+        standings.get_live_standings()
+        game = final_game(NYK, BOS, 110, 100, (36, 26), (35, 26))
+        assert standings.apply_final_games([game]) == ["0022500900"]
+
+        east = standings.get_live_standings()["east"]
+        knicks, celtics = east
+        assert knicks["name"] == "New York Knicks" and knicks["rank"] == 1
+        assert (knicks["wins"], knicks["losses"]) == (36, 26)
+        assert knicks["homeRecord"] == "21-10"
+        assert knicks["streak"] == "W 1"
+        assert knicks["gamesBack"] == "-"
+        assert celtics["awayRecord"] == "15-16"
+        assert celtics["streak"] == "L 1"
+        assert celtics["gamesBack"] == 0.5
+
+    def test_official_rank_kept_without_stored_results(self):
+        standings.get_live_standings()
+        standings.apply_final_games([final_game(NYK, BOS, 110, 100, (36, 26), (35, 26))])
+
+        celtics, knicks = standings.get_live_standings()["east"]
+        assert (celtics["rank"], knicks["rank"]) == (1, 2)
+        assert (knicks["wins"], knicks["losses"]) == (36, 26)
+        assert knicks["gamesBack"] == "-"
+        assert celtics["gamesBack"] == 0.5
+
+    def test_repeated_final_applied_once(self):
+        standings.get_live_standings()
+        game = final_game(NYK, BOS, 110, 100, (36, 26), (35, 26))
+        standings.apply_final_games([game])
+        assert standings.apply_final_games([game]) == []
+        assert standings.get_live_standings()["east"][1]["homeRecord"] == "21-10"
+
+    def test_snapshot_already_counting_game_is_noop(self):
+        standings.get_live_standings()
+        game = final_game(NYK, BOS, 110, 100, (35, 26), (35, 25))
+        assert standings.apply_final_games([game]) == []
+
+    def test_no_snapshot_no_update(self):
+        game = final_game(NYK, BOS, 110, 100, (36, 26), (35, 26))
+        assert standings.apply_final_games([game]) == []
+
+    def test_untouched_conference_keeps_official_values(self):
+        standings.get_live_standings()
+        standings.apply_final_games([final_game(NYK, BOS, 110, 100, (36, 26), (35, 26))])
+        west = standings.get_live_standings()["west"]
+        assert west[0]["gamesBack"] == 0.0
+
+    def test_last10_from_stored_results(self):
+        standings.get_live_standings()
+        stored = [(f"00225000{i:02d}", i % 2 == 0) for i in range(10)]
+        with patch("helpers.standings.get_team_results", return_value=stored):
+            standings.apply_final_games([final_game(NYK, BOS, 110, 100, (36, 26), (35, 26))])
+        knicks = standings.get_live_standings()["east"][1]
+        # 9 most recent stored (5 wins) plus this win
+        assert knicks["last10"] == "6-4"
@@ -0,0 +1,159 @@
+"""Unit tests for helpers/store.py (SQLite game-log store)."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import helpers.store as store
+from helpers.common import cache
+
+GAME_ID = "0022301234"
+TEAM_ID_LAL = 1610612747
+TEAM_ID_BOS = 1610612738
+
+
+def make_player(person_id, name, points, minutes="PT30M00.00S", status="ACTIVE"):
+    return {
+        "personId": person_id, "name": name, "status": status,
+        "statistics": {
+            "minutes": minutes, "points": points, "reboundsTotal": 8,
+            "reboundsOffensive": 1, "reboundsDefensive": 7, "assists": 6,
+            "steals": 1, "blocks": 0, "turnovers": 2, "foulsPersonal": 2,
+            "fieldGoalsMade": 11, "fieldGoalsAttempted": 20,
+            "threePointersMade": 2, "threePointersAttempted": 5,
+            "freeThrowsMade": 4, "freeThrowsAttempted": 4, "plusMinusPoints": 8,
+        },
+    }
+
+
+def make_team(team_id, city, name, tricode, score, players):
+    return {
+        "teamId": team_id, "teamCity": city, "teamName": name, "teamTricode": tricode,
+        "score": score, "players": players,
+        "statistics": {
+            "fieldGoalsMade": 40, "fieldGoalsAttempted": 80, "threePointersMade": 10,
+            "threePointersAttempted": 25, "freeThrowsMade": 15, "freeThrowsAttempted": 20,
+            "reboundsOffensive": 5, "reboundsTotal": 35, "assists": 20, "steals": 5,
+            "blocks": 3, "turnovers": 10, "foulsPersonal": 15,
+        },
+    }
+
+
+def make_boxscore(game_id=GAME_ID, game_date="2025-02-27", status=store.GAME_STATUS_FINAL, points=28):
+    return {"game": {
+        "gameId": game_id, "gameStatus": status, "gameEt": f"{game_date}T19:30:00Z",
+        "homeTeam": make_team(TEAM_ID_LAL, "Los Angeles", "Lakers", "LAL", 110, [
+            make_player(2544, "LeBron James", points),
+            make_player(1630559, "Austin Reaves", 0, minutes="PT00M00.00S"),
+            make_player(1629060, "Rui Hachimura", 0, status="INACTIVE"),
+        ]),
+        "awayTeam": make_team(TEAM_ID_BOS, "Boston", "Celtics", "BOS", 105, [
+            make_player(1628369, "Jayson Tatum", 32),
+        ]),
+    }}
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "STATS_DB_FILE", str(tmp_path / "stats.db"))
+    monkeypatch.setattr(store, "_ingested", set())
+    monkeypatch.setattr(store, "_pending", set())
+    cache.clear()
+    c = store.connect()
+    yield c
+    c.close()
+    cache.clear()
+
+
+class TestBoxscoreRows:
+    def test_game_row(self):
+        game_row, _, _ = store.boxscore_rows(make_boxscore())
+        assert game_row["game_date"] == "2025-02-27"
+        assert game_row["home_score"] == 110
+
+    def test_team_rows_have_opponents(self):
+        _, team_rows, _ = store.boxscore_rows(make_boxscore())
+        home, away = team_rows
+        assert home["opponent_id"] == TEAM_ID_BOS and home["is_home"] == 1
+        assert away["opponent_id"] == TEAM_ID_LAL and away["is_home"] == 0
+        assert home["fga"] == 80
+
+    def test_skips_inactive_and_zero_minute_players(self):
+        _, _, player_rows = store.boxscore_rows(make_boxscore())
+        assert sorted(r["player_id"] for r in player_rows) == [2544, 1628369]
+        assert player_rows[0]["seconds"] == 1800
+
+    def test_player_rows_carry_metrics(self):
+        cache.clear()
+        _, _, player_rows = store.boxscore_rows(make_boxscore())
+        row = player_rows[0]
+        assert row["efg_pct"] == 0.6
+        assert row["ast_tov"] == 3.0
+        assert set(store.METRIC_COLUMNS) <= set(row)
+        cache.clear()
+
+
+class TestIngest:
+    def test_non_final_game_not_stored(self, conn):
+        assert store.ingest_boxscore(make_boxscore(status=2), conn) is False
+        assert conn.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 0
+
+    def test_final_game_stored(self, conn):
+        assert store.ingest_boxscore(make_boxscore(), conn) is True
+        assert conn.execute("SELECT COUNT(*) FROM team_games").fetchone()[0] == 2
+        assert conn.execute("SELECT COUNT(*) FROM player_games").fetchone()[0] == 2
+        assert store.is_ingested(GAME_ID, conn)
+
+    def test_reingest_is_idempotent(self, conn):
+        store.ingest_boxscore(make_boxscore(), conn)
+        store.ingest_boxscore(make_boxscore(points=30), conn)
+        assert conn.execute("SELECT COUNT(*) FROM player_games").fetchone()[0] == 2
+        assert store.get_player_last_n_games(2544, 5, conn)[0]["pts"] == 30
+
+    def test_last_n_games_newest_first(self, conn):
+        store.ingest_boxscore(make_boxscore("0022300001", "2025-01-02", points=10), conn)
+        store.ingest_boxscore(make_boxscore("0022300003", "2025-01-06", points=30), conn)
+        store.ingest_boxscore(make_boxscore("0022300002", "2025-01-04", points=20), conn)
+        assert [g["pts"] for g in store.get_player_last_n_games(2544, 2, conn)] == [30, 20]
+
+    def test_player_seconds(self, conn):
+        store.ingest_boxscore(make_boxscore(), conn)
+        assert store.get_player_seconds(2544, [GAME_ID, "0022300001"], conn) == {GAME_ID: 1800}
+        assert store.get_player_seconds(2544, [], conn) == {}
+
+    def test_metrics_stored(self, conn):
+        store.ingest_boxscore(make_boxscore(), conn)
+        row = store.get_player_last_n_games(2544, 1, conn)[0]
+        assert row["ts_pct"] > 0 and row["game_score"] > 0
+
+    def test_old_database_gains_metric_columns(self, tmp_path):
+        import sqlite3
+        path = str(tmp_path / "old.db")
+        old = sqlite3.connect(path)
+        old.executescript(store.SCHEMA.replace(
+            "    ts_pct REAL, efg_pct REAL, game_score REAL, usg_pct REAL, ast_tov REAL,\n", ""
+        ))
+        old.close()
+        c = store.connect(path)
+        columns = {r["name"] for r in c.execute("PRAGMA table_info(player_games)")}
+        c.close()
+        assert set(store.METRIC_COLUMNS) <= columns
+
+    def test_player_lines_on_date(self, conn):
+        store.ingest_boxscore(make_boxscore(), conn)
+        lines = store.get_player_lines_on("2025-02-27", conn)
+        assert {line["name"] for line in lines} == {"LeBron James", "Jayson Tatum"}
+
+    def test_ingest_game_fetches_once(self, conn):
+        mock_bs = MagicMock()
+        mock_bs.get_dict.return_value = make_boxscore()
+        with patch("helpers.store.boxscore.BoxScore", return_value=mock_bs) as mock:
+            assert store.ingest_game(GAME_ID) is True
+            assert store.ingest_game(GAME_ID) is False
+        mock.assert_called_once()
+
+    def test_schedule_ingest_skips_known_and_pending(self, conn):
+        store._ingested.add("stored")
+        with patch("helpers.store.executor") as mock_executor:
+            assert store.schedule_ingest(["stored", "new", "new"]) == ["new"]
+            assert store.schedule_ingest(["new"]) == []
+        mock_executor.submit.assert_called_once_with(store.ingest_game, "new")
@@ -0,0 +1,125 @@
+"""Unit tests for helpers/streaks.py (incremental streak counters)."""
+import threading
+
+import pytest
+
+import helpers.store as store
+from helpers.common import cache
+from helpers.streaks import STREAKS, StreakTracker, qualifies
+from test_helpers_store import make_boxscore
+
+LEBRON = 2544
+
+
+def line(game_date, pts, player_id=LEBRON, seconds=1800, **stats):
+    row = {
+        "game_id": f"00226{game_date.replace('-', '')[3:]}", "game_date": game_date,
+        "player_id": player_id, "name": "LeBron James", "tricode": "LAL", "seconds": seconds,
+        "pts": pts, "reb": 0, "ast": 0, "stl": 0, "blk": 0, "fg3m": 0,
+    }
+    row.update(stats)
+    return row
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "STATS_DB_FILE", str(tmp_path / "stats.db"))
+    monkeypatch.setattr(store, "_ingested", set())
+    monkeypatch.setattr(store, "_pending", set())
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestQualifies:
+    def test_threshold(self):
+        assert qualifies(line("2026-10-21", 20), STREAKS["pts20"][1])
+        assert not qualifies(line("2026-10-21", 19), STREAKS["pts20"][1])
+
+    def test_combined_columns(self):
+        assert qualifies(line("2026-10-21", 0, stl=2, blk=1), STREAKS["stocks3"][1])
+
+    def test_double_digit_categories(self):
+        dd = line("2026-10-21", 12, reb=10, ast=9)
+        assert qualifies(dd, STREAKS["doubleDouble"][1])
+        assert not qualifies(dd, STREAKS["tripleDouble"][1])
+
+
+class TestStreakTracker:
+    def test_current_and_best(self):
+        t = StreakTracker()
+        for day, pts in [("2026-10-21", 25), ("2026-10-23", 22), ("2026-10-25", 30),
+                         ("2026-10-27", 10), ("2026-10-29", 21)]:
+            t.add_line(line(day, pts))
+        streak = t.player(LEBRON)["streaks"]["pts20"]
+        assert streak["current"] == 1 and streak["since"] == "2026-10-29"
+        assert (streak["best"], streak["bestFrom"], streak["bestTo"]) == (3, "2026-10-21", "2026-10-25")
+        assert streak["games"] == 4
+        assert t.player(LEBRON)["streaks"]["pts30"]["games"] == 1
+
+    def test_dnp_does_not_break_streak(self):
+        t = StreakTracker()
+        t.add_line(line("2026-10-21", 25))
+        t.add_line(line("2026-10-23", 0, seconds=0))
+        t.add_line(line("2026-10-25", 25))
+        assert t.player(LEBRON)["streaks"]["pts20"]["current"] == 2
+        assert t.player(LEBRON)["gamesPlayed"] == 2
+
+    def test_duplicate_and_out_of_order(self):
+        t = StreakTracker()
+        t.add_line(line("2026-10-23", 25))
+        assert t.add_line(line("2026-10-23", 25)) is True
+        assert t.add_line(line("2026-10-21", 25)) is False
+        assert t.player(LEBRON)["gamesPlayed"] == 1
+
+    def test_leaders(self):
+        t = StreakTracker()
+        for day in ("2026-10-21", "2026-10-23", "2026-10-25"):
+            t.add_line(line(day, 25))
+            t.add_line(line(day, 21, player_id=1, name="Other"))
+        t.add_line(line("2026-10-27", 5, player_id=1, name="Other"))
+        active = t.leaders("pts20")
+        assert [p["id"] for p in active] == [LEBRON]
+        assert active[0]["current"] == 3
+        assert [p["id"] for p in t.leaders("pts20", active=False)] == [LEBRON, 1]
+
+    def test_unknown_player(self):
+        assert StreakTracker().player(1) is None
+
+    def test_reads_wait_for_refresh(self):
+        t = StreakTracker()
+        t.add_line(line("2026-10-21", 25))
+        found = []
+        with t._lock:
+            reader = threading.Thread(target=lambda: found.append(t.leaders("pts20", min_length=1)))
+            reader.start()
+            reader.join(0.1)
+            assert reader.is_alive()
+        reader.join(1)
+        assert [p["id"] for p in found[0]] == [LEBRON]
+
+
+class TestRefresh:
+    def test_incremental_from_store(self, db):
+        t = StreakTracker(season_prefix="")
+        store.ingest_boxscore(make_boxscore(game_id="g1", game_date="2026-10-21", points=25))
+        t.refresh()
+        store.ingest_boxscore(make_boxscore(game_id="g2", game_date="2026-10-23", points=28))
+        t.refresh()
+        assert t.player(LEBRON)["streaks"]["pts20"]["current"] == 2
+        assert t.player(1628369)["streaks"]["pts30"]["current"] == 2
+
+    def test_backfilled_game_rebuilds_player(self, db):
+        t = StreakTracker(season_prefix="")
+        store.ingest_boxscore(make_boxscore(game_id="g3", game_date="2026-10-25", points=25))
+        t.refresh()
+        store.ingest_boxscore(make_boxscore(game_id="g1", game_date="2026-10-21", points=10))
+        t.refresh()
+        streak = t.player(LEBRON)["streaks"]["pts20"]
+        assert streak["current"] == 1 and streak["since"] == "2026-10-25"
+        assert t.player(LEBRON)["gamesPlayed"] == 2
+
+    def test_season_prefix_filter(self, db):
+        t = StreakTracker(season_prefix="00226")
+        store.ingest_boxscore(make_boxscore(game_id="0022500001", game_date="2026-04-10"))
+        assert t.refresh().players == {}
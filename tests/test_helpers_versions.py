@@ -0,0 +1,98 @@
+"""Unit tests for helpers/versions.py (versioned documents and JSON diffs)."""
+from unittest.mock import patch
+
+from helpers.versions import VersionStore, json_diff
+
+
+def apply_patch(doc, ops):
+    """Minimal JSON-patch applier for add/remove/replace used to verify diffs."""
+    import copy
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        if op["path"] == "":
+            doc = copy.deepcopy(op["value"])
+            continue
+        parts = [p.replace("~1", "/").replace("~0", "~") for p in op["path"].split("/")[1:]]
+        target = doc
+        for part in parts[:-1]:
+            target = target[int(part)] if isinstance(target, list) else target[part]
+        last = parts[-1]
+        if isinstance(target, list):
+            last = int(last)
+        if op["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = op["value"]
+    return doc
+
+
+class TestJsonDiff:
+    def test_equal_documents(self):
+        assert json_diff({"a": 1}, {"a": 1}) == []
+
+    def test_scalar_replace(self):
+        assert json_diff({"a": 1}, {"a": 2}) == [{"op": "replace", "path": "/a", "value": 2}]
+
+    def test_nested_list_item(self):
+        old = {"games": [{"score": 10}, {"score": 20}]}
+        new = {"games": [{"score": 10}, {"score": 22}]}
+        assert json_diff(old, new) == [{"op": "replace", "path": "/games/1/score", "value": 22}]
+
+    def test_add_and_remove_keys(self):
+        ops = json_diff({"a": 1, "b": 2}, {"a": 1, "c": 3})
+        assert {"op": "remove", "path": "/b"} in ops
+        assert {"op": "add", "path": "/c", "value": 3} in ops
+
+    def test_length_change_replaces_list(self):
+        assert json_diff({"l": [1]}, {"l": [1, 2]}) == [{"op": "replace", "path": "/l", "value": [1, 2]}]
+
+    def test_key_escaping(self):
+        assert json_diff({"a/b": 1}, {"a/b": 2})[0]["path"] == "/a~1b"
+
+    def test_patch_round_trip(self):
+        old = {"games": [{"id": 1, "home": {"score": 50}}, {"id": 2, "home": {"score": 40}}], "date": "x"}
+        new = {"games": [{"id": 1, "home": {"score": 52}}, {"id": 2, "home": {"score": 40}}], "date": "y"}
+        assert apply_patch(old, json_diff(old, new)) == new
+
+
+class TestVersionStore:
+    def test_unchanged_content_keeps_version(self):
+        store = VersionStore()
+        assert store.update("doc", {"a": 1}) == store.update("doc", {"a": 1})
+
+    def test_versions_strictly_increase(self):
+        store = VersionStore()
+        with patch("helpers.versions.time.time", return_value=1000.0):
+            v1 = store.update("doc", {"a": 1})
+            v2 = store.update("doc", {"a": 2})
+        assert v2 > v1
+
+    def test_full_document_without_since(self):
+        store = VersionStore()
+        body = store.respond("doc", {"a": 1})
+        assert body["a"] == 1 and "version" in body
+
+    def test_patch_against_retained_version(self):
+        store = VersionStore()
+        v1 = store.respond("doc", {"a": 1, "b": 1})["version"]
+        body = store.respond("doc", {"a": 2, "b": 1}, since=v1)
+        assert body["since"] == v1
+        assert body["patch"] == [{"op": "replace", "path": "/a", "value": 2}]
+
+    def test_current_version_gives_empty_patch(self):
+        store = VersionStore()
+        v1 = store.respond("doc", {"a": 1})["version"]
+        assert store.respond("doc", {"a": 1}, since=v1)["patch"] == []
+
+    def test_evicted_version_gives_full_document(self):
+        store = VersionStore(max_versions=2)
+        v1 = store.respond("doc", {"a": 1})["version"]
+        store.respond("doc", {"a": 2})
+        body = store.respond("doc", {"a": 3}, since=v1)
+        assert "patch" not in body and body["a"] == 3
+
+    def test_document_count_bounded(self):
+        store = VersionStore(max_documents=2)
+        for name in ("x", "y", "z"):
+            store.update(name, {"n": name})
+        assert list(store._documents) == ["y", "z"]
@@ -1,13 +1,16 @@
 """Integration tests for the NBA Stables FastAPI application."""
+import itertools
 import json
 import os
 import tempfile
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 from fastapi.testclient import TestClient
 from helpers.common import cache
+from helpers.events import tracker
 from main import app
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -36,7 +39,10 @@ def client():
 @pytest.fixture(autouse=True)
 def clear_cache():
     cache.clear()
-    yield
+    tracker.reset()
+    # No upstream schedule: the scheduler polls as if games were live
+    with patch("helpers.scheduler.fetch_season_schedule", return_value=None):
+        yield
     cache.clear()
 
 
@@ -104,9 +110,13 @@ def make_live_boxscore(game_id=GAME_ID, status="Q2 5:32"):
     }
 
 
-def make_standings_row(rank, city, name, conf, wins, losses):
+STANDINGS_TEAM_IDS = itertools.count(1610612700)
+
+
+def make_standings_row(rank, city, name, conf, wins, losses, team_id=None):
     """Build a row matching indices used by get_standings."""
     row = [None] * 40
+    row[2] = team_id if team_id is not None else next(STANDINGS_TEAM_IDS)
     row[3] = city
     row[4] = name
     row[5] = conf
@@ -149,24 +159,40 @@ def make_boxscore_team_row(team_id, city, name, score=100):
     return row
 
 
-def make_player_stats_row(person_id=PLAYER_ID, minutes="28:00"):
-    """Build a BoxScoreTraditionalV3 player_stats row."""
-    row = [None] * 33
-    row[6]  = person_id
-    row[14] = minutes    # non-empty → player played
-    row[15] = 11   # FGM
-    row[16] = 20   # FGA
-    row[18] = 2    # 3PM
-    row[19] = 5    # 3PA
-    row[21] = 4    # FTM
-    row[22] = 4    # FTA
-    row[26] = 8    # REB
-    row[27] = 6    # AST
-    row[28] = 0    # BLK
-    row[29] = 1    # STL
-    row[31] = 2    # PF
-    row[32] = 28   # PTS
-    return row
+LEAGUE_DASH_HEADERS = [
+    "PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "TEAM_ABBREVIATION", "AGE", "GP",
+    "MIN", "FGM", "FGA", "FG_PCT", "FG3M", "FG3A", "FG3_PCT", "FTM", "FTA",
+    "FT_PCT", "OREB", "DREB", "REB", "AST", "TOV", "STL", "BLK", "PF", "PTS",
+]
+
+def make_league_dash_row(person_id=PLAYER_ID, name="LeBron James", tricode="LAL", pts=1680.0):
+    """Build a LeagueDashPlayerStats (Totals) row for a 60-game season."""
+    values = {
+        "PLAYER_ID": person_id, "PLAYER_NAME": name, "TEAM_ABBREVIATION": tricode,
+        "GP": 60, "MIN": 1800.0, "PTS": pts, "REB": 480.0, "AST": 360.0,
+        "STL": 60.0, "BLK": 36.0, "TOV": 120.0, "PF": 90.0,
+        "FGM": 660.0, "FGA": 1200.0, "FG_PCT": 0.55, "FG3M": 120.0, "FG3A": 300.0,
+        "FG3_PCT": 0.40, "FTM": 240.0, "FTA": 300.0, "FT_PCT": 0.80,
+    }
+    return [values.get(h) for h in LEAGUE_DASH_HEADERS]
+
+
+GAME_LOG_HEADERS = [
+    "SEASON_ID", "Player_ID", "Game_ID", "GAME_DATE", "MATCHUP", "WL", "MIN",
+    "FGM", "FGA", "FG_PCT", "FG3M", "FG3A", "FG3_PCT", "FTM", "FTA", "FT_PCT",
+    "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV", "PF", "PTS",
+    "PLUS_MINUS", "VIDEO_AVAILABLE",
+]
+
+def make_game_log_row(game_id=GAME_ID, game_date="FEB 27, 2025", matchup="LAL vs. BOS", pts=28):
+    """Build a PlayerGameLog row."""
+    values = {
+        "SEASON_ID": "22024", "Player_ID": PLAYER_ID, "Game_ID": game_id,
+        "GAME_DATE": game_date, "MATCHUP": matchup, "WL": "W", "MIN": 34,
+        "FGM": 11, "FGA": 20, "FG3M": 2, "FG3A": 5, "FTM": 4, "FTA": 4,
+        "REB": 8, "AST": 6, "STL": 1, "BLK": 0, "TOV": 2, "PF": 2, "PTS": pts,
+    }
+    return [values.get(h) for h in GAME_LOG_HEADERS]
 
 
 CAREER_HEADERS = [
@@ -273,6 +299,21 @@ class TestInjuries:
         finally:
             os.unlink(tmp)
 
+    def test_rewritten_file_served_fresh(self, client):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            json.dump(INJURY_PAYLOAD, f)
+            tmp = f.name
+        try:
+            with patch("main.CBS_INJURIES_FILE", tmp):
+                client.get("/api/injuries")
+                with open(tmp, "w") as f:
+                    json.dump({**INJURY_PAYLOAD, "lastUpdated": "2025-03-01"}, f)
+                os.utime(tmp, (time.time() + 60, time.time() + 60))
+                r = client.get("/api/injuries")
+            assert r.json()["lastUpdated"] == "2025-03-01"
+        finally:
+            os.unlink(tmp)
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # /api/scoreboard
@@ -316,6 +357,73 @@ class TestScoreboard:
         assert home["leader"]["points"] == 28
         assert home["leader"]["rebounds"] == 8
 
+    def test_final_games_scheduled_for_ingest(self, client):
+        games = [make_live_game(gameStatus=3), make_live_game(gameId="0022301235", gameStatus=2)]
+        with patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb(games)), \
+             patch("helpers.live.schedule_ingest") as mock:
+            client.get("/api/scoreboard")
+        mock.assert_called_once_with([GAME_ID])
+
+    def test_final_games_retried_on_every_build(self, client):
+        # A boxscore still behind the scoreboard leaves the first ingestion attempt unstored
+        with patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb([make_live_game(gameStatus=3)])), \
+             patch("helpers.live.apply_final_games") as standings, \
+             patch("helpers.live.schedule_ingest") as ingest:
+            client.get("/api/scoreboard")
+            cache.delete("scoreboard")
+            client.get("/api/scoreboard")
+        assert ingest.call_count == 2 and standings.call_count == 2
+
+    def test_final_game_updates_standings(self, client):
+        rows = [
+            make_standings_row(1, "Boston", "Celtics", "East", 50, 20, team_id=TEAM_ID_BOS),
+            make_standings_row(1, "Los Angeles", "Lakers", "West", 45, 25, team_id=TEAM_ID_LAL),
+        ]
+        standings = MagicMock()
+        standings.return_value.get_dict.return_value = {"resultSets": [{"rowSet": rows}]}
+        game = make_live_game(gameStatus=3)
+        game["homeTeam"].update(score=110, wins=46, losses=25)
+        game["awayTeam"].update(score=104, wins=50, losses=21)
+        with patch("routes.scores.leaguestandings.LeagueStandings", standings), \
+             patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb([game])), \
+             patch("helpers.live.schedule_ingest"), \
+             patch("helpers.standings.get_team_results", return_value=[]):
+            client.get("/api/standings")
+            client.get("/api/scoreboard")
+            body = client.get("/api/standings").json()
+        standings.assert_called_once()
+        assert (body["west"][0]["wins"], body["west"][0]["losses"]) == (46, 25)
+        assert (body["east"][0]["wins"], body["east"][0]["losses"]) == (50, 21)
+
+    def test_final_game_invalidates_today_caches(self, client):
+        for key in ("daily_0", "daily_table_0", "fantasy_0_abc", "daily_1", "playoffs"):
+            cache.set(key, {"stale": True}, 3600)
+        with patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb([make_live_game(gameStatus=3)])), \
+             patch("helpers.live.apply_final_games"), \
+             patch("helpers.live.schedule_ingest"):
+            client.get("/api/scoreboard")
+        assert cache.get("daily_0") is None
+        assert cache.get("daily_table_0") is None
+        assert cache.get("fantasy_0_abc") is None
+        assert cache.get("playoffs") is None
+        assert cache.get("daily_1") == {"stale": True}
+
+    def test_since_returns_patch(self, client):
+        game = make_live_game(gameStatusText="Q2 5:32")
+        with patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb([game])):
+            version = client.get("/api/scoreboard").json()["version"]
+        cache.clear()
+        game["homeTeam"]["score"] = 2
+        with patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb([game])):
+            body = client.get(f"/api/scoreboard?since={version}").json()
+        assert body["since"] == version
+        assert body["patch"] == [{"op": "replace", "path": "/games/0/homeTeam/score", "value": 2}]
+
+    def test_unknown_since_returns_full_document(self, client):
+        with patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb([])):
+            body = client.get("/api/scoreboard?since=1").json()
+        assert "games" in body and "patch" not in body
+
     def test_cached_on_second_call(self, client):
         with patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb([])) as mock:
             client.get("/api/scoreboard")
@@ -327,52 +435,83 @@ class TestScoreboard:
 # /api/boxscores
 # ─────────────────────────────────────────────────────────────────────────────
 
-_BOXSCORE_RESULT = {
-    "gameId": GAME_ID,
-    "teams": [
-        {"name": "Los Angeles Lakers", "score": 110, "stats": {
-            "fg": "40/80", "fgPct": 0.5, "threePt": "10/25", "threePtPct": 0.4,
-            "ft": "15/20", "ftPct": 0.75, "rebounds": 35, "offRebounds": 5,
-            "assists": 20, "steals": 5, "blocks": 3, "turnovers": 10, "fouls": 15,
-        }, "leader": {"name": "LeBron James", "points": 28, "rebounds": 8, "assists": 6}},
-        {"name": "Boston Celtics", "score": 105, "stats": {
-            "fg": "40/80", "fgPct": 0.5, "threePt": "10/25", "threePtPct": 0.4,
-            "ft": "15/20", "ftPct": 0.75, "rebounds": 35, "offRebounds": 5,
-            "assists": 20, "steals": 5, "blocks": 3, "turnovers": 10, "fouls": 15,
-        }, "leader": {"name": "Jayson Tatum", "points": 32, "rebounds": 9, "assists": 4}},
-    ],
+_TEAM_TOTALS = {
+    "fieldGoalsMade": 40, "fieldGoalsAttempted": 80, "threePointersMade": 10,
+    "threePointersAttempted": 25, "freeThrowsMade": 15, "freeThrowsAttempted": 20,
+    "reboundsOffensive": 5, "reboundsTotal": 35, "assists": 20, "steals": 5,
+    "blocks": 3, "turnovers": 10, "foulsPersonal": 15,
+}
+
+_TEAM_BOX_STATS = {
+    "fg": "40/80", "fgPct": 0.5, "threePt": "10/25", "threePtPct": 0.4,
+    "ft": "15/20", "ftPct": 0.75, "rebounds": 35, "offRebounds": 5,
+    "assists": 20, "steals": 5, "blocks": 3, "turnovers": 10, "fouls": 15,
 }
 
+
+def make_final_boxscore(game_id=GAME_ID):
+    """A live BoxScore dict with team totals, a double-double and a triple-double"""
+    bs = make_live_boxscore(game_id, status="Final")
+    bs["game"]["gameId"] = game_id
+    home, away = bs["game"]["homeTeam"], bs["game"]["awayTeam"]
+    home.update(score=110, statistics=dict(_TEAM_TOTALS))
+    away.update(score=105, statistics=dict(_TEAM_TOTALS))
+    home["players"].append(make_live_player(1630559, "Austin Reaves", points=12, reboundsTotal=10,
+                                            assists=10))
+    away["players"][0]["statistics"].update(points=32, reboundsTotal=11, assists=4)
+    return bs
+
+
 class TestBoxscores:
+    def _bs(self, game_id=GAME_ID):
+        m = MagicMock()
+        m.get_dict.return_value = make_final_boxscore(game_id)
+        return m
+
     def test_no_games(self, client):
-        with patch("routes.scores.get_games_leaders_list", return_value={}):
+        with patch("routes.scores.get_games_list", return_value=[]):
             r = client.get("/api/boxscores?days_offset=1")
         assert r.status_code == 200
         assert r.json()["boxscores"] == []
 
     def test_returns_team_data(self, client):
-        leaders = {GAME_ID: [["LeBron James", 28, 8, 6, TEAM_ID_LAL]]}
-        with patch("routes.scores.get_games_leaders_list", return_value=leaders), \
-             patch("routes.scores.fetch_single_boxscore", return_value=_BOXSCORE_RESULT):
+        with patch("routes.scores.get_games_list", return_value=[GAME_ID]), \
+             patch("routes.scores.boxscore.BoxScore", return_value=self._bs()):
             r = client.get("/api/boxscores?days_offset=1")
         assert r.status_code == 200
-        teams = r.json()["boxscores"][0]["teams"]
-        assert teams[0]["name"] == "Los Angeles Lakers"
-        assert teams[0]["score"] == 110
+        assert r.json()["boxscores"] == [{"gameId": GAME_ID, "teams": [
+            {"name": "Los Angeles Lakers", "score": 110, "stats": _TEAM_BOX_STATS,
+             "leader": {"name": "LeBron James", "points": 28, "rebounds": 8, "assists": 6}},
+            {"name": "Boston Celtics", "score": 105, "stats": _TEAM_BOX_STATS,
+             "leader": {"name": "Jayson Tatum", "points": 32, "rebounds": 11, "assists": 4}},
+        ]}]
 
     def test_offset_too_large_rejected(self, client):
         assert client.get("/api/boxscores?days_offset=99").status_code == 422
 
     def test_has_date_field(self, client):
-        with patch("routes.scores.get_games_leaders_list", return_value={}):
+        with patch("routes.scores.get_games_list", return_value=[]):
             r = client.get("/api/boxscores?days_offset=1")
         assert "date" in r.json()
 
     def test_default_offset(self, client):
-        with patch("routes.scores.get_games_leaders_list", return_value={}) as mock:
+        with patch("routes.scores.get_games_list", return_value=[]) as mock:
             client.get("/api/boxscores")
         mock.assert_called_once_with(1)
 
+    def test_one_pipeline_run_serves_all_day_endpoints(self, client):
+        with patch("routes.scores.get_games_list", return_value=[GAME_ID]) as games, \
+             patch("routes.scores.boxscore.BoxScore", return_value=self._bs()) as mock:
+            boxscores = client.get("/api/boxscores?days_offset=1").json()
+            leaders = client.get("/api/leaders?days_offset=1").json()["leaders"]
+            dd = client.get("/api/doubledoubles?days_offset=1").json()
+        games.assert_called_once_with(1)
+        mock.assert_called_once()
+        assert len(boxscores["boxscores"]) == 1
+        assert leaders["points"]["players"] == [{"name": "Jayson Tatum", "team": "BOS"}]
+        assert [p["name"] for p in dd["tripleDoubles"]] == ["Austin Reaves"]
+        assert [(p["name"], p["categories"]) for p in dd["doubleDoubles"]] == [("Jayson Tatum", ["pts", "reb"])]
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # /api/leaders
@@ -383,12 +522,12 @@ class TestLeaders:
         m = MagicMock()
         m.get_dict.return_value = {"game": {
             "homeTeam": {"teamTricode": "LAL", "players": [{
-                "status": "ACTIVE", "name": "LeBron James",
+                "status": "ACTIVE", "name": "LeBron James", "personId": 2544,
                 "statistics": {"points": 35, "reboundsTotal": 10, "assists": 8,
                                "blocks": 2, "steals": 3, "threePointersMade": 4},
             }]},
             "awayTeam": {"teamTricode": "BOS", "players": [{
-                "status": "ACTIVE", "name": "Jayson Tatum",
+                "status": "ACTIVE", "name": "Jayson Tatum", "personId": 1628369,
                 "statistics": {"points": 30, "reboundsTotal": 8, "assists": 5,
                                "blocks": 1, "steals": 2, "threePointersMade": 3},
             }]},
@@ -419,12 +558,56 @@ class TestLeaders:
     def test_offset_too_large_rejected(self, client):
         assert client.get("/api/leaders?days_offset=10").status_code == 422
 
+    def test_top_n_and_team_filter(self, client):
+        with patch("routes.scores.get_games_list", return_value=[GAME_ID]), \
+             patch("routes.scores.boxscore.BoxScore", return_value=self._bs()) as mock:
+            top = client.get("/api/leaders?days_offset=1&top=2").json()["leaders"]
+            bos = client.get("/api/leaders?days_offset=1&team=bos").json()["leaders"]
+        assert [p["name"] for p in top["points"]["ranking"]] == ["LeBron James", "Jayson Tatum"]
+        assert bos["points"]["players"] == [{"name": "Jayson Tatum", "team": "BOS"}]
+        assert mock.call_count == 1
+
+    def test_by_team_and_combined_categories(self, client):
+        with patch("routes.scores.get_games_list", return_value=[GAME_ID]), \
+             patch("routes.scores.boxscore.BoxScore", return_value=self._bs()):
+            r = client.get("/api/leaders?days_offset=1&by_team=true")
+        data = r.json()
+        assert data["leaders"]["pra"]["value"] == 53
+        assert data["leaders"]["stocks"]["value"] == 5
+        assert data["teams"]["BOS"]["points"]["value"] == 30
+
     def test_has_date_field(self, client):
         with patch("routes.scores.get_games_list", return_value=[]):
             r = client.get("/api/leaders?days_offset=1")
         assert "date" in r.json()
 
 
+class TestFantasy:
+    def test_profile_scores_and_caches(self, client):
+        with patch("routes.scores.get_games_list", return_value=[GAME_ID]), \
+             patch("routes.scores.boxscore.BoxScore", return_value=TestLeaders()._bs()) as mock:
+            fd = client.get("/api/fantasy?profile=fanduel&days_offset=1").json()
+            again = client.get("/api/fantasy?profile=fanduel&days_offset=1&top=1").json()
+        assert fd["profile"] == "fanduel"
+        # 35 + 12 + 12 + 9 + 6
+        assert fd["players"][0] == {"rank": 1, "id": 2544, "name": "LeBron James", "team": "LAL",
+                                    "games": 1, "points": 74.0, "average": 74.0}
+        assert again["players"] == fd["players"][:1]
+        assert mock.call_count == 1
+
+    def test_custom_weights_and_team(self, client):
+        with patch("routes.scores.get_games_list", return_value=[GAME_ID]), \
+             patch("routes.scores.boxscore.BoxScore", return_value=TestLeaders()._bs()):
+            r = client.get("/api/fantasy?weights=pts:2&team=bos")
+        data = r.json()
+        assert data["profile"] == "custom"
+        assert data["players"] == [{"rank": 2, "id": 1628369, "name": "Jayson Tatum", "team": "BOS",
+                                    "games": 1, "points": 60.0, "average": 60.0}]
+
+    def test_invalid_profile_400(self, client):
+        assert client.get("/api/fantasy?profile=bogus").status_code == 400
+        assert client.get("/api/fantasy?weights=bogus:1").status_code == 400
+
 # ─────────────────────────────────────────────────────────────────────────────
 # /api/standings
 # ─────────────────────────────────────────────────────────────────────────────
@@ -569,6 +752,19 @@ class TestGamePlayers:
         for key in ("name", "minutes", "points", "rebounds", "assists", "fg", "threePt", "ft"):
             assert key in p
 
+    def test_since_returns_patch(self, client):
+        mock_bs, mock_adv = self._setup()
+        with patch("routes.players.boxscore.BoxScore", return_value=mock_bs), \
+             patch("routes.players.boxscoreadvancedv3.BoxScoreAdvancedV3", return_value=mock_adv):
+            version = client.get(f"/api/games/{GAME_ID}/players").json()["version"]
+        cache.clear()
+        updated = make_live_boxscore(status="Q2 4:10")
+        mock_bs, mock_adv = self._setup(updated)
+        with patch("routes.players.boxscore.BoxScore", return_value=mock_bs), \
+             patch("routes.players.boxscoreadvancedv3.BoxScoreAdvancedV3", return_value=mock_adv):
+            body = client.get(f"/api/games/{GAME_ID}/players?since={version}").json()
+        assert body["patch"] == [{"op": "replace", "path": "/status", "value": "Q2 4:10"}]
+
     def test_advanced_stats_fallback_when_unavailable(self, client):
         mock_bs = MagicMock()
         mock_bs.get_dict.return_value = make_live_boxscore()
@@ -587,30 +783,31 @@ class TestGamePlayers:
 # ─────────────────────────────────────────────────────────────────────────────
 
 class TestLastNGames:
-    def _cumestats(self):
-        m = MagicMock()
-        m.cume_stats_team_games.get_dict.return_value = {
-            "data": [["2025-02-27 vs BOS", GAME_ID]]
-        }
-        return m
-
-    def _trad_boxscore(self, person_id=PLAYER_ID):
+    def _game_log(self, rows=None):
         m = MagicMock()
-        m.player_stats.get_dict.return_value = {
-            "data": [make_player_stats_row(person_id)]
+        m.player_game_log.get_dict.return_value = {
+            "headers": GAME_LOG_HEADERS,
+            "data": rows if rows is not None else [make_game_log_row()],
         }
         return m
 
     def test_returns_game_log(self, client):
         with patch("routes.players.load_players_dict", return_value={p[0]: p for p in FAKE_PLAYERS}), \
-             patch("routes.players.cumestatsteamgames.CumeStatsTeamGames", return_value=self._cumestats()), \
-             patch("routes.players.boxscoretraditionalv3.BoxScoreTraditionalV3", return_value=self._trad_boxscore()):
+             patch("helpers.gamelog.playergamelog.PlayerGameLog", return_value=self._game_log()):
             r = client.get(f"/api/players/{PLAYER_ID}/last-n-games?n=5")
         assert r.status_code == 200
         body = r.json()
         assert body["playerId"] == PLAYER_ID
         assert body["games"][0]["points"] == 28
-        assert body["games"][0]["dnp"] is False
+        assert body["games"][0]["steals"] == 1
+        assert body["games"][0]["minutes"] == "34:00"
+
+    def test_minutes_from_stored_lines(self, client):
+        with patch("routes.players.load_players_dict", return_value={p[0]: p for p in FAKE_PLAYERS}), \
+             patch("helpers.gamelog.playergamelog.PlayerGameLog", return_value=self._game_log()), \
+             patch("routes.players.get_player_seconds", return_value={GAME_ID: 34 * 60 + 12}):
+            r = client.get(f"/api/players/{PLAYER_ID}/last-n-games?n=5")
+        assert r.json()["games"][0]["minutes"] == "34:12"
 
     def test_unknown_player_404(self, client):
         with patch("routes.players.load_players_dict", return_value={}):
@@ -620,14 +817,49 @@ class TestLastNGames:
     def test_n_out_of_range_rejected(self, client):
         assert client.get(f"/api/players/{PLAYER_ID}/last-n-games?n=99").status_code == 422
 
-    def test_dnp_game_flagged(self, client):
-        empty_bs = MagicMock()
-        empty_bs.player_stats.get_dict.return_value = {"data": []}
+    def test_sliced_newest_first(self, client):
+        rows = [
+            make_game_log_row("0022300001", "JAN 02, 2025", "LAL vs. BOS", pts=10),
+            make_game_log_row("0022300003", "JAN 06, 2025", "LAL @ DEN", pts=30),
+            make_game_log_row("0022300002", "JAN 04, 2025", "LAL vs. MIA", pts=20),
+        ]
+        with patch("routes.players.load_players_dict", return_value={p[0]: p for p in FAKE_PLAYERS}), \
+             patch("helpers.gamelog.playergamelog.PlayerGameLog", return_value=self._game_log(rows)):
+            r = client.get(f"/api/players/{PLAYER_ID}/last-n-games?n=2")
+        assert [g["points"] for g in r.json()["games"]] == [30, 20]
+
+    def test_includes_games_for_previous_team(self, client):
+        rows = [
+            make_game_log_row("0022300002", "FEB 10, 2025", "LAL vs. BOS"),
+            make_game_log_row("0022300001", "FEB 01, 2025", "DAL @ PHX"),
+        ]
+        with patch("routes.players.load_players_dict", return_value={p[0]: p for p in FAKE_PLAYERS}), \
+             patch("helpers.gamelog.playergamelog.PlayerGameLog", return_value=self._game_log(rows)):
+            r = client.get(f"/api/players/{PLAYER_ID}/last-n-games?n=5")
+        assert [g["matchup"] for g in r.json()["games"]] == ["LAL vs. BOS", "DAL @ PHX"]
+
+    def test_different_n_single_upstream_call(self, client):
+        with patch("routes.players.load_players_dict", return_value={p[0]: p for p in FAKE_PLAYERS}), \
+             patch("helpers.gamelog.playergamelog.PlayerGameLog", return_value=self._game_log()) as mock:
+            client.get(f"/api/players/{PLAYER_ID}/last-n-games?n=5")
+            client.get(f"/api/players/{PLAYER_ID}/last-n-games?n=10")
+        mock.assert_called_once()
+
+    def test_stale_log_extended_incrementally(self, client):
+        first = self._game_log([make_game_log_row("0022300001", "JAN 02, 2025")])
+        second = self._game_log([
+            make_game_log_row("0022300002", "JAN 04, 2025", pts=40),
+            make_game_log_row("0022300001", "JAN 02, 2025"),
+        ])
         with patch("routes.players.load_players_dict", return_value={p[0]: p for p in FAKE_PLAYERS}), \
-             patch("routes.players.cumestatsteamgames.CumeStatsTeamGames", return_value=self._cumestats()), \
-             patch("routes.players.boxscoretraditionalv3.BoxScoreTraditionalV3", return_value=empty_bs):
+             patch("helpers.gamelog.playergamelog.PlayerGameLog", side_effect=[first, second]) as mock, \
+             patch("helpers.gamelog.time") as mock_time:
+            mock_time.time.side_effect = [1000.0, 1000.0 + 3600]
+            client.get(f"/api/players/{PLAYER_ID}/last-n-games?n=5")
             r = client.get(f"/api/players/{PLAYER_ID}/last-n-games?n=5")
-        assert r.json()["games"][0]["dnp"] is True
+        assert mock.call_args_list[0].kwargs["date_from_nullable"] == ""
+        assert mock.call_args_list[1].kwargs["date_from_nullable"] == "01/02/2025"
+        assert [g["points"] for g in r.json()["games"]] == [40, 28]
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -643,8 +875,17 @@ class TestSeasonAvg:
         }
         return m
 
+    def _mock_league(self, rows=None):
+        m = MagicMock()
+        m.league_dash_player_stats.get_dict.return_value = {
+            "headers": LEAGUE_DASH_HEADERS,
+            "data": rows if rows is not None else [make_league_dash_row()],
+        }
+        return m
+
     def test_returns_averages(self, client):
-        with patch("routes.players.playercareerstats.PlayerCareerStats", return_value=self._mock_career()):
+        with patch("routes.players.get_league_season_table", return_value={}), \
+             patch("routes.players.playercareerstats.PlayerCareerStats", return_value=self._mock_career()):
             r = client.get(f"/api/players/{PLAYER_ID}/season-avg")
         assert r.status_code == 200
         body = r.json()
@@ -653,16 +894,75 @@ class TestSeasonAvg:
         assert body["gp"] == 60
 
     def test_response_shape(self, client):
-        with patch("routes.players.playercareerstats.PlayerCareerStats", return_value=self._mock_career()):
+        with patch("routes.players.get_league_season_table", return_value={}), \
+             patch("routes.players.playercareerstats.PlayerCareerStats", return_value=self._mock_career()):
             r = client.get(f"/api/players/{PLAYER_ID}/season-avg")
         for key in ("season", "gp", "points", "rebounds", "assists", "fgPct", "fg3Pct", "ftPct"):
             assert key in r.json()
 
     def test_no_data_returns_404(self, client):
-        with patch("routes.players.playercareerstats.PlayerCareerStats", return_value=self._mock_career(rows=[])):
+        with patch("routes.players.get_league_season_table", return_value={}), \
+             patch("routes.players.playercareerstats.PlayerCareerStats", return_value=self._mock_career(rows=[])):
             r = client.get(f"/api/players/{PLAYER_ID}/season-avg")
         assert r.status_code == 404
 
+    def test_served_from_league_table(self, client):
+        with patch("helpers.league.leaguedashplayerstats.LeagueDashPlayerStats", return_value=self._mock_league()), \
+             patch("routes.players.playercareerstats.PlayerCareerStats") as career:
+            r = client.get(f"/api/players/{PLAYER_ID}/season-avg")
+        career.assert_not_called()
+        assert r.json()["points"] == 28.0
+        assert r.json()["fgPct"] == 55.0
+        # The only qualified player tops every distribution
+        assert r.json()["percentiles"]["points"] == 100.0
+
+    def test_batch_returns_requested_players(self, client):
+        rows = [make_league_dash_row(), make_league_dash_row(1629029, "Jayson Tatum", "BOS", pts=1500.0)]
+        with patch("helpers.league.leaguedashplayerstats.LeagueDashPlayerStats", return_value=self._mock_league(rows)):
+            r = client.get("/api/players/season-avg?ids=1629029,2544,99")
+        players = r.json()["players"]
+        assert [p["id"] for p in players] == [1629029, PLAYER_ID]
+        assert players[0]["points"] == 25.0
+        assert players[0]["team"] == "BOS"
+        assert players[0]["percentiles"]["points"] == 50.0
+        assert players[1]["percentiles"]["points"] == 100.0
+
+    def test_batch_single_league_pull(self, client):
+        with patch("helpers.league.leaguedashplayerstats.LeagueDashPlayerStats", return_value=self._mock_league()) as mock:
+            client.get(f"/api/players/season-avg?ids={PLAYER_ID}")
+            client.get("/api/players/season-avg?ids=1629029")
+            client.get(f"/api/players/{PLAYER_ID}/season-avg")
+        mock.assert_called_once()
+
+    def test_batch_invalid_ids_returns_empty(self, client):
+        r = client.get("/api/players/season-avg?ids=abc")
+        assert r.json()["players"] == []
+
+
+class TestSimilarPlayers:
+    def _league(self):
+        rows = [
+            make_league_dash_row(),
+            make_league_dash_row(1629029, "Jayson Tatum", "BOS", pts=1600.0),
+            make_league_dash_row(203999, "Nikola Jokic", "DEN", pts=900.0),
+        ]
+        return TestSeasonAvg()._mock_league(rows)
+
+    def test_most_similar_first(self, client):
+        with patch("helpers.league.leaguedashplayerstats.LeagueDashPlayerStats", return_value=self._league()) as mock:
+            r = client.get(f"/api/players/{PLAYER_ID}/similar?k=2")
+            client.get("/api/players/1629029/similar")
+        assert r.status_code == 200
+        data = r.json()
+        assert data["playerName"] == "LeBron James"
+        assert data["per36"]["points"] == 33.6
+        assert [p["name"] for p in data["players"]] == ["Jayson Tatum", "Nikola Jokic"]
+        mock.assert_called_once()
+
+    def test_unqualified_player_404(self, client):
+        with patch("helpers.league.leaguedashplayerstats.LeagueDashPlayerStats", return_value=self._league()):
+            r = client.get("/api/players/99/similar")
+        assert r.status_code == 404
 
 # ─────────────────────────────────────────────────────────────────────────────
 # /api/trades
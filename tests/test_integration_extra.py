@@ -1,14 +1,18 @@
 """Additional integration tests to increase coverage of scores.py and players.py."""
+import itertools
 import os
 import sys
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
 
+from datetime import date, timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 from helpers.common import cache
+from helpers.events import tracker
+from helpers.seeding import GameResults
 from main import app
 
 # ── shared constants ──────────────────────────────────────────────────────────
@@ -32,7 +36,10 @@ def client():
 @pytest.fixture(autouse=True)
 def clear_cache():
     cache.clear()
-    yield
+    tracker.reset()
+    # No upstream schedule: the scheduler polls as if games were live
+    with patch("helpers.scheduler.fetch_season_schedule", return_value=None):
+        yield
     cache.clear()
 
 
@@ -98,8 +105,12 @@ def make_live_boxscore(game_id=GAME_ID, status="Final"):
     }
 
 
-def make_standings_row(rank, city, name, conf, wins, losses):
+STANDINGS_TEAM_IDS = itertools.count(1610612700)
+
+
+def make_standings_row(rank, city, name, conf, wins, losses, team_id=None):
     row = [None] * 40
+    row[2] = team_id if team_id is not None else next(STANDINGS_TEAM_IDS)
     row[3] = city
     row[4] = name
     row[5] = conf
@@ -128,7 +139,7 @@ def make_adv_player_row(person_id, plus_minus=5):
 
 class TestCacheHits:
     def test_boxscores_served_from_cache(self, client):
-        with patch("routes.scores.get_games_leaders_list", return_value={}) as mock:
+        with patch("routes.scores.get_games_list", return_value=[]) as mock:
             client.get("/api/boxscores?days_offset=1")
             client.get("/api/boxscores?days_offset=1")
         mock.assert_called_once()
@@ -149,10 +160,10 @@ class TestCacheHits:
         standings_mock.assert_called_once()
 
     def test_last_n_games_served_from_cache(self, client):
-        cumestats = MagicMock()
-        cumestats.cume_stats_team_games.get_dict.return_value = {"data": []}
+        game_log = MagicMock()
+        game_log.player_game_log.get_dict.return_value = {"headers": [], "data": []}
         with patch("routes.players.load_players_dict", return_value={p[0]: p for p in FAKE_PLAYERS}), \
-             patch("routes.players.cumestatsteamgames.CumeStatsTeamGames", return_value=cumestats) as mock:
+             patch("helpers.gamelog.playergamelog.PlayerGameLog", return_value=game_log) as mock:
             client.get(f"/api/players/{PLAYER_ID}/last-n-games?n=5")
             client.get(f"/api/players/{PLAYER_ID}/last-n-games?n=5")
         mock.assert_called_once()
@@ -177,7 +188,8 @@ class TestCacheHits:
         career.season_totals_regular_season.get_dict.return_value = {
             "headers": CAREER_HEADERS, "data": [row],
         }
-        with patch("routes.players.playercareerstats.PlayerCareerStats", return_value=career) as mock:
+        with patch("routes.players.get_league_season_table", return_value={}), \
+             patch("routes.players.playercareerstats.PlayerCareerStats", return_value=career) as mock:
             client.get(f"/api/players/{PLAYER_ID}/season-avg")
             client.get(f"/api/players/{PLAYER_ID}/season-avg")
         mock.assert_called_once()
@@ -310,6 +322,12 @@ class TestPlayerAdvancedStats:
 # ─────────────────────────────────────────────────────────────────────────────
 
 class TestPlayoffs:
+    @pytest.fixture(autouse=True)
+    def no_schedule(self):
+        with patch("routes.scores.get_remaining_games", return_value=None), \
+             patch("routes.scores.seeding_results", GameResults()):
+            yield
+
     def _mock(self, rows):
         m = MagicMock()
         m.return_value.get_dict.return_value = {"resultSets": [{"rowSet": rows}]}
@@ -375,6 +393,37 @@ class TestPlayoffs:
         ranks = [t["rank"] for t in r.json()["east"]]
         assert ranks == sorted(ranks)
 
+    def test_seed_odds_from_schedule(self, client):
+        rows = [
+            make_standings_row(1, "Boston", "Celtics", "East", 60, 20),
+            make_standings_row(2, "Milwaukee", "Bucks", "East", 59, 21),
+        ]
+        rows[0][2], rows[1][2] = 1, 2
+        schedule = [(1, 2), (2, 1)]
+        with patch("routes.scores.leaguestandings.LeagueStandings", self._mock(rows)), \
+             patch("routes.scores.get_remaining_games", return_value=schedule):
+            r = client.get("/api/playoffs")
+        boston, milwaukee = r.json()["east"]
+        assert boston["odds"]["seedProbabilities"][0] + milwaukee["odds"]["seedProbabilities"][0] == pytest.approx(1)
+        assert boston["odds"]["seedProbabilities"][0] > 0.5
+        assert boston["odds"]["top6"] == 1
+        assert 60 <= boston["projectedWins"] <= 62
+
+    def test_local_seed_applies_head_to_head(self, client):
+        rows = [
+            make_standings_row(1, "Boston", "Celtics", "East", 50, 30, team_id=1),
+            make_standings_row(2, "Milwaukee", "Bucks", "East", 50, 30, team_id=2),
+            make_standings_row(3, "Chicago", "Bulls", "East", 40, 40, team_id=3),
+        ]
+        results = GameResults()
+        results.add_game("0022500001", 1, 2, 100, 110)
+        results.add_game("0022500002", 2, 1, 120, 101)
+        with patch("routes.scores.leaguestandings.LeagueStandings", self._mock(rows)), \
+             patch("routes.scores.seeding_results", results):
+            r = client.get("/api/playoffs")
+        seeds = {t["name"]: t["seed"] for t in r.json()["east"]}
+        assert seeds == {"Milwaukee Bucks": 1, "Boston Celtics": 2, "Chicago Bulls": 3}
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # /api/doubledoubles
@@ -392,9 +441,9 @@ class TestDoubleDoubles:
             "awayTeam": {"teamTricode": "BOS", "players": players_away},
         }}
 
-    def _player(self, name, pts, reb, ast, stl=0, blk=0):
+    def _player(self, name, pts, reb, ast, stl=0, blk=0, person_id=2544):
         return {
-            "status": "ACTIVE", "name": name,
+            "personId": person_id, "status": "ACTIVE", "name": name,
             "statistics": {
                 "points": pts, "reboundsTotal": reb, "assists": ast,
                 "steals": stl, "blocks": blk,
@@ -402,18 +451,18 @@ class TestDoubleDoubles:
         }
 
     def test_returns_200(self, client):
-        with patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb([])):
+        with patch("routes.scores.get_games_list", return_value=[]):
             r = client.get("/api/doubledoubles")
         assert r.status_code == 200
 
     def test_response_shape(self, client):
-        with patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb([])):
+        with patch("routes.scores.get_games_list", return_value=[]):
             r = client.get("/api/doubledoubles")
         for key in ("doubleDoubles", "tripleDoubles", "date"):
             assert key in r.json()
 
     def test_no_games_returns_empty(self, client):
-        with patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb([])):
+        with patch("routes.scores.get_games_list", return_value=[]):
             r = client.get("/api/doubledoubles")
         assert r.json()["doubleDoubles"] == []
         assert r.json()["tripleDoubles"] == []
@@ -423,7 +472,7 @@ class TestDoubleDoubles:
         mock_bs.get_dict.return_value = self._bs(
             [self._player("LeBron James", pts=20, reb=10, ast=5)], [],
         )
-        with patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb([make_live_game()])), \
+        with patch("routes.scores.get_games_list", return_value=[GAME_ID]), \
              patch("routes.scores.boxscore.BoxScore", return_value=mock_bs):
             r = client.get("/api/doubledoubles?days_offset=0")
         assert len(r.json()["doubleDoubles"]) == 1
@@ -434,7 +483,7 @@ class TestDoubleDoubles:
         mock_bs.get_dict.return_value = self._bs(
             [self._player("LeBron James", pts=10, reb=10, ast=10)], [],
         )
-        with patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb([make_live_game()])), \
+        with patch("routes.scores.get_games_list", return_value=[GAME_ID]), \
              patch("routes.scores.boxscore.BoxScore", return_value=mock_bs):
             r = client.get("/api/doubledoubles?days_offset=0")
         assert len(r.json()["tripleDoubles"]) == 1
@@ -447,12 +496,14 @@ class TestDoubleDoubles:
         assert r.status_code == 200
         mock.assert_called_once_with(1)
 
-    def test_live_offset_uses_scoreboard(self, client):
-        sb = self._sb([])
-        with patch("routes.scores.scoreboard.ScoreBoard", return_value=sb) as mock:
+    def test_today_uses_games_list(self, client):
+        # Today is the CET date like every other offset, not the live scoreboard's ET game day
+        with patch("routes.scores.get_games_list", return_value=[]) as mock, \
+             patch("routes.scores.scoreboard.ScoreBoard") as sb:
             r = client.get("/api/doubledoubles?days_offset=0")
         assert r.status_code == 200
-        mock.assert_called_once()
+        mock.assert_called_once_with(0)
+        sb.assert_not_called()
 
     def test_offset_too_large_rejected(self, client):
         assert client.get("/api/doubledoubles?days_offset=99").status_code == 422
@@ -462,13 +513,83 @@ class TestDoubleDoubles:
         mock_bs.get_dict.return_value = self._bs(
             [self._player("Bench Guy", pts=5, reb=4, ast=3)], [],
         )
-        with patch("routes.scores.scoreboard.ScoreBoard", return_value=self._sb([make_live_game()])), \
+        with patch("routes.scores.get_games_list", return_value=[GAME_ID]), \
              patch("routes.scores.boxscore.BoxScore", return_value=mock_bs):
             r = client.get("/api/doubledoubles?days_offset=0")
         assert r.json()["doubleDoubles"] == []
         assert r.json()["tripleDoubles"] == []
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# ?date= archive queries
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestArchivedDates:
+    DAY = date.today() - timedelta(days=2)
+
+    @pytest.fixture(autouse=True)
+    def season(self):
+        with patch("helpers.archive.SEASON_START", date.today() - timedelta(days=60)):
+            yield
+
+    def test_bad_date_returns_400(self, client):
+        r = client.get("/api/boxscores?date=last-week")
+        assert r.status_code == 400
+
+    def test_unarchived_returns_404(self, client):
+        with patch("routes.scores.get_coverage", return_value=([], [self.DAY.isoformat()])):
+            r = client.get(f"/api/leaders?date={self.DAY}")
+        assert r.status_code == 404
+
+    def test_boxscores_served_from_archive(self, client):
+        start = self.DAY - timedelta(days=1)
+        with patch("routes.scores.get_coverage", return_value=([self.DAY.isoformat()], [start.isoformat()])), \
+             patch("routes.scores.get_archived_boxscores", return_value=[{"gameId": GAME_ID}]) as mock, \
+             patch("routes.scores.boxscore.BoxScore") as upstream:
+            r = client.get(f"/api/boxscores?date={start}..{self.DAY}")
+        assert r.status_code == 200
+        data = r.json()
+        assert data["boxscores"] == [{"gameId": GAME_ID}]
+        assert data["dates"] == [self.DAY.isoformat()] and data["missing"] == [start.isoformat()]
+        mock.assert_called_once_with(start, self.DAY)
+        upstream.assert_not_called()
+
+    def test_double_doubles_served_from_archive(self, client):
+        with patch("routes.scores.get_coverage", return_value=([self.DAY.isoformat()], [])), \
+             patch("routes.scores.get_archived_double_doubles", return_value=([], [{"name": "A"}])):
+            r = client.get(f"/api/doubledoubles?date={self.DAY}")
+        assert r.status_code == 200
+        assert r.json()["doubleDoubles"] == [{"name": "A"}]
+
+
+    def test_range_leaders_not_archived(self, client):
+        with patch("routes.scores.partition_dates", return_value=[]):
+            r = client.get("/api/leaders/range?last=14")
+        assert r.status_code == 404
+
+    def test_range_leaders_invalid_stat(self, client):
+        with patch("routes.scores.partition_dates", return_value=[self.DAY.isoformat()]), \
+             patch("routes.scores.query_leaders", side_effect=ValueError("Unknown stat x")):
+            r = client.get("/api/leaders/range?stat=x")
+        assert r.status_code == 400
+
+    def test_range_leaders_500_on_archive_error(self, client):
+        with patch("routes.scores.partition_dates", return_value=[self.DAY.isoformat()]), \
+             patch("routes.scores.query_leaders", side_effect=OSError("corrupt partition")), \
+             patch("routes.scores.log_exceptions"):
+            r = client.get("/api/leaders/range?last=14")
+        assert r.status_code == 500
+
+    def test_range_leaders(self, client):
+        start = self.DAY - timedelta(days=13)
+        with patch("routes.scores.partition_dates", return_value=[self.DAY.isoformat()]) as dates, \
+             patch("routes.scores.query_leaders", return_value=[{"rank": 1, "value": 3}]) as query:
+            r = client.get(f"/api/leaders/range?stat=pts&agg=count&min=30&date={start}..{self.DAY}")
+        assert r.status_code == 200
+        assert r.json()["ranking"] == [{"rank": 1, "value": 3}] and r.json()["days"] == 1
+        dates.assert_called_once_with(start, self.DAY)
+        assert query.call_args.args[:4] == ([self.DAY.isoformat()], "pts", "count", 30)
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Error handler branches – players.py
 # ─────────────────────────────────────────────────────────────────────────────
@@ -493,7 +614,72 @@ class TestPlayerErrorHandlers:
         assert r.status_code == 500
 
     def test_season_avg_500_on_unexpected_error(self, client):
-        with patch("routes.players.playercareerstats.PlayerCareerStats", side_effect=Exception("boom")), \
+        with patch("routes.players.get_league_season_table", return_value={}), \
+             patch("routes.players.playercareerstats.PlayerCareerStats", side_effect=Exception("boom")), \
              patch("routes.players.log_exceptions"):
             r = client.get(f"/api/players/{PLAYER_ID}/season-avg")
         assert r.status_code == 500
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# /api/ws/players
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestPlayersSocket:
+    def test_subscribe_receives_stat_line(self, client):
+        mock_sb = MagicMock()
+        mock_sb.games.data = [make_live_game()]
+        mock_bs = MagicMock()
+        mock_bs.get_dict.return_value = make_live_boxscore()
+        mock_pbp = MagicMock()
+        mock_pbp.get_dict.return_value = {"game": {"actions": []}}
+        with patch("helpers.live.load_players_dict", return_value={p[0]: p for p in FAKE_PLAYERS}), \
+             patch("helpers.live.scoreboard.ScoreBoard", return_value=mock_sb), \
+             patch("helpers.pbp.boxscore.BoxScore", return_value=mock_bs), \
+             patch("helpers.pbp.playbyplay.PlayByPlay", return_value=mock_pbp):
+            with client.websocket_connect("/api/ws/players") as ws:
+                ws.send_json({"subscribe": [PLAYER_ID]})
+                message = ws.receive_json()
+        assert message["type"] == "player"
+        assert message["data"]["id"] == PLAYER_ID
+        assert message["data"]["points"] == 28
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# /api/streaks
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestStreaks:
+    @pytest.fixture
+    def tracker(self):
+        from helpers.streaks import StreakTracker
+
+        t = StreakTracker()
+        for day in ("2026-10-21", "2026-10-23"):
+            t.add_line({
+                "game_id": day, "game_date": day, "player_id": PLAYER_ID, "name": "LeBron James",
+                "tricode": "LAL", "seconds": 1800, "pts": 24, "reb": 10, "ast": 11, "stl": 0,
+                "blk": 0, "fg3m": 1,
+            })
+        with patch("routes.players.streaks", t), patch.object(t, "refresh"):
+            yield t
+
+    def test_active_streaks(self, client, tracker):
+        r = client.get("/api/streaks?streak=tripleDouble")
+        assert r.status_code == 200
+        data = r.json()
+        assert data["label"] == "Triple-doubles"
+        assert data["players"][0]["name"] == "LeBron James"
+        assert data["players"][0]["current"] == 2
+        tracker.refresh.assert_called_once()
+
+    def test_player_streaks(self, client, tracker):
+        r = client.get(f"/api/streaks?player_id={PLAYER_ID}")
+        assert r.status_code == 200
+        assert r.json()["streaks"]["pts20"]["best"] == 2
+
+    def test_unknown_player_404(self, client, tracker):
+        assert client.get("/api/streaks?player_id=1").status_code == 404
+
+    def test_unknown_streak_400(self, client, tracker):
+        assert client.get("/api/streaks?streak=bogus").status_code == 400
@@ -0,0 +1,110 @@
+"""Unit tests for static/update_static.py (daily player team id refresh)."""
+import json
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from static import update_static
+
+LAL, BOS = 1610612747, 1610612738
+LEBRON, ROOKIE = 2544, 1642000
+
+
+def player_row(game_id, team_id, player_id, first, last, comment=""):
+    row = [None] * 13
+    row[0], row[1], row[6], row[7], row[8], row[12] = game_id, team_id, player_id, first, last, comment
+    return row
+
+
+@pytest.fixture
+def files(tmp_path, monkeypatch):
+    players = tmp_path / "players_with_teamid.json"
+    players.write_text(json.dumps([[LEBRON, "LeBron James", LAL]]))
+    monkeypatch.setattr(update_static, "PLAYERS_FILE", str(players))
+    monkeypatch.setattr(update_static, "CHANGES_LOG_FILE", str(tmp_path / "player_changes.jsonl"))
+    monkeypatch.setattr(update_static, "STATE_FILE", str(tmp_path / ".update_state.json"))
+    return tmp_path
+
+
+def run(games, rows, start=None, end=None):
+    """Run update_players against {date: [game ids]} and {game id: rows}"""
+    def games_list(game_date):
+        return games.get(game_date, [])
+
+    def player_rows(game_id):
+        if isinstance(rows[game_id], Exception):
+            raise rows[game_id]
+        return rows[game_id]
+
+    with patch("static.update_static.get_games_list", side_effect=games_list) as mock, \
+         patch("static.update_static.fetch_player_rows", side_effect=player_rows):
+        changes = update_static.update_players(start, end)
+    return changes, [call.args[0] for call in mock.call_args_list]
+
+
+def log_lines(files):
+    path = files / "player_changes.jsonl"
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+class TestApplyPlayerRows:
+    def test_new_player_and_team_change(self):
+        players = [[LEBRON, "LeBron James", LAL]]
+        by_id = {p[0]: p for p in players}
+        rows = [player_row("g1", BOS, LEBRON, "LeBron", "James"), player_row("g1", BOS, ROOKIE, "New", "Guy")]
+        changes = update_static.apply_player_rows(by_id, players, rows, date(2026, 1, 10))
+        assert [c["type"] for c in changes] == ["team_change", "new_player"]
+        assert changes[0]["fromTeamId"] == LAL and changes[0]["toTeamId"] == BOS
+        assert players == [[LEBRON, "LeBron James", BOS], [ROOKIE, "New Guy", BOS]]
+
+    def test_dnp_rows_skipped(self):
+        players = [[LEBRON, "LeBron James", LAL]]
+        rows = [player_row("g1", BOS, LEBRON, "LeBron", "James", comment="DNP - Coach's Decision")]
+        assert update_static.apply_player_rows({LEBRON: players[0]}, players, rows, date(2026, 1, 10)) == []
+        assert players[0][2] == LAL
+
+
+class TestUpdatePlayers:
+    DAY = date(2026, 1, 10)
+
+    def test_quiet_day_writes_no_log(self, files):
+        games = {self.DAY: ["g1"]}
+        changes, _ = run(games, {"g1": [player_row("g1", LAL, LEBRON, "LeBron", "James")]}, self.DAY, self.DAY)
+        assert changes == []
+        assert log_lines(files) == []
+        assert update_static.last_processed_date() == self.DAY
+
+    def test_changes_logged_and_saved(self, files):
+        games = {self.DAY: ["g1"]}
+        run(games, {"g1": [player_row("g1", BOS, ROOKIE, "New", "Guy")]}, self.DAY, self.DAY)
+        assert [e["type"] for e in log_lines(files)] == ["new_player"]
+        assert json.loads((files / "players_with_teamid.json").read_text())[-1] == [ROOKIE, "New Guy", BOS]
+
+    def test_resumes_after_last_processed_date(self, files):
+        update_static.save_processed_date(self.DAY - timedelta(days=3))
+        _, fetched = run({}, {}, end=self.DAY)
+        assert fetched == [self.DAY - timedelta(days=2), self.DAY - timedelta(days=1), self.DAY]
+
+    def test_backfill_capped(self, files):
+        update_static.save_processed_date(self.DAY - timedelta(days=100))
+        _, fetched = run({}, {}, end=self.DAY)
+        assert len(fetched) == update_static.MAX_BACKFILL_DAYS and fetched[-1] == self.DAY
+
+    def test_first_run_processes_only_the_end_date(self, files):
+        _, fetched = run({}, {}, end=self.DAY)
+        assert fetched == [self.DAY]
+
+    def test_failed_date_keeps_earlier_dates_and_propagates(self, files):
+        before = self.DAY - timedelta(days=1)
+        games = {before: ["g1"], self.DAY: ["g2", "g3"]}
+        rows = {
+            "g1": [player_row("g1", BOS, ROOKIE, "New", "Guy")],
+            "g2": [player_row("g2", BOS, LEBRON, "LeBron", "James")],
+            "g3": ConnectionError("stats.nba.com timeout"),
+        }
+        with pytest.raises(ConnectionError):
+            run(games, rows, before, self.DAY)
+        # The failed date left no trace: LeBron's move is retried on the next run
+        assert [e["playerId"] for e in log_lines(files)] == [ROOKIE]
+        assert update_static.last_processed_date() == before